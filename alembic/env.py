@@ -5,6 +5,9 @@ from sqlalchemy import pool
 
 from alembic import context
 from app.models.user_model import Base  # adjust "myapp.models" to the actual location of your Base
+import app.models.token_model  # noqa: F401 - registers the token tables on Base.metadata
+import app.models.system_model  # noqa: F401 - registers the bookkeeping tables on Base.metadata
+import app.models.import_model  # noqa: F401 - registers the bulk import tables on Base.metadata
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,32 @@
+"""add users archive dormant email index
+
+Revision ID: 2b9d7e4c1f36
+Revises: d8b3f6a1c529
+Create Date: 2026-10-17 18:47:25.901344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b9d7e4c1f36'
+down_revision: Union[str, None] = 'd8b3f6a1c529'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so the archival job can keep writing while the index is created
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_archive_dormant_email', 'users_archive', ['email'], unique=False,
+                        postgresql_where=sa.text('deleted_at IS NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_archive_dormant_email', table_name='users_archive',
+                      postgresql_concurrently=True, if_exists=True)
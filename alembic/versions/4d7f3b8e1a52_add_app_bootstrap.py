@@ -0,0 +1,40 @@
+"""add app bootstrap
+
+Revision ID: 4d7f3b8e1a52
+Revises: e91b04f7d2a6
+Create Date: 2026-10-17 12:48:03.561284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d7f3b8e1a52'
+down_revision: Union[str, None] = 'e91b04f7d2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('app_bootstrap',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('admin_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.CheckConstraint('id = 1', name='ck_app_bootstrap_singleton'),
+    sa.ForeignKeyConstraint(['admin_user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Existing installations are already bootstrapped: record their oldest admin, if any
+    op.execute(
+        "INSERT INTO app_bootstrap (id, admin_user_id) "
+        "SELECT 1, (SELECT id FROM users WHERE role = 'ADMIN' ORDER BY created_at LIMIT 1) "
+        "WHERE EXISTS (SELECT 1 FROM users)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('app_bootstrap')
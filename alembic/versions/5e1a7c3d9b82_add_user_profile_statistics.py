@@ -0,0 +1,31 @@
+"""add user profile statistics
+
+Revision ID: 5e1a7c3d9b82
+Revises: 2b9d7e4c1f36
+Create Date: 2026-10-17 21:12:06.472913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1a7c3d9b82'
+down_revision: Union[str, None] = '2b9d7e4c1f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so existing rows are not rewritten
+    for table in ('users', 'users_archive'):
+        op.add_column(table, sa.Column('profile_updates_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+        op.add_column(table, sa.Column('last_profile_update', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('users_archive', 'users'):
+        op.drop_column(table, 'last_profile_update')
+        op.drop_column(table, 'profile_updates_count')
@@ -0,0 +1,39 @@
+"""add user list indexes
+
+Revision ID: 7c5e9a2b4d18
+Revises: f3a8c1d56e27
+Create Date: 2026-10-17 15:02:11.684530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c5e9a2b4d18'
+down_revision: Union[str, None] = 'f3a8c1d56e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors USER_LIST_FILTERS and USER_LIST_SORTS in app/models/user_model.py at this revision
+FILTERS = ('role', 'email_verified', 'is_locked', 'is_professional')
+SORTS = ('created_at', 'nickname', 'email')
+
+
+def upgrade() -> None:
+    # Built concurrently so the users table stays writable while the indexes are created
+    with op.get_context().autocommit_block():
+        for column in FILTERS:
+            for sort in SORTS:
+                op.create_index(f'ix_users_{column}_{sort}', 'users', [column, sort, 'id'], unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in reversed(FILTERS):
+            for sort in reversed(SORTS):
+                op.drop_index(f'ix_users_{column}_{sort}', table_name='users',
+                              postgresql_concurrently=True, if_exists=True)
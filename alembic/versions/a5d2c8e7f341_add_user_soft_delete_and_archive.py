@@ -0,0 +1,64 @@
+"""add user soft delete and archive
+
+Revision ID: a5d2c8e7f341
+Revises: 7c5e9a2b4d18
+Create Date: 2026-10-17 16:21:37.205914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d2c8e7f341'
+down_revision: Union[str, None] = '7c5e9a2b4d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A nullable column without a default is a catalog-only change, even on a large table
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_table('users_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('nickname', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=True),
+    sa.Column('last_name', sa.String(length=100), nullable=True),
+    sa.Column('bio', sa.String(length=500), nullable=True),
+    sa.Column('profile_picture_url', sa.String(length=255), nullable=True),
+    sa.Column('linkedin_profile_url', sa.String(length=255), nullable=True),
+    sa.Column('github_profile_url', sa.String(length=255), nullable=True),
+    sa.Column('role', postgresql.ENUM('ANONYMOUS', 'AUTHENTICATED', 'MANAGER', 'ADMIN', name='UserRole', create_type=False), nullable=False),
+    sa.Column('is_professional', sa.Boolean(), nullable=True),
+    sa.Column('professional_status_updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('failed_login_attempts', sa.Integer(), nullable=True),
+    sa.Column('is_locked', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('verification_token', sa.String(), nullable=True),
+    sa.Column('email_verified', sa.Boolean(), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Built concurrently so the users table stays writable while the index is created. last_login_at
+    # is left unindexed: every login writes it, and an index would rule out HOT updates.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_deleted_at', 'users', ['deleted_at'], unique=False,
+                        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_deleted_at', table_name='users', postgresql_concurrently=True, if_exists=True)
+    op.drop_table('users_archive')
+    # Soft-deleted rows would come back to life without the column; remove them for good
+    op.execute("DELETE FROM users WHERE deleted_at IS NOT NULL")
+    op.drop_column('users', 'deleted_at')
@@ -0,0 +1,51 @@
+"""add user imports
+
+Revision ID: b6e2a9c4f813
+Revises: 4d7f3b8e1a52
+Create Date: 2026-10-17 13:32:27.905118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2a9c4f813'
+down_revision: Union[str, None] = '4d7f3b8e1a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_imports',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('source', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.Enum('RUNNING', 'COMPLETED', 'FAILED', name='ImportStatus', create_constraint=True), nullable=False),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('imported_count', sa.Integer(), nullable=False),
+    sa.Column('failed_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_import_errors',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('import_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('row_number', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('error', sa.String(length=1000), nullable=False),
+    sa.ForeignKeyConstraint(['import_id'], ['user_imports.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_import_errors_import_id'), 'user_import_errors', ['import_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_import_errors_import_id'), table_name='user_import_errors')
+    op.drop_table('user_import_errors')
+    op.drop_table('user_imports')
+    sa.Enum(name='ImportStatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,31 @@
+"""add users created_at id index
+
+Revision ID: c27d5e9f4a18
+Revises: 8a4e2d61c5b3
+Create Date: 2026-10-17 11:20:14.730551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27d5e9f4a18'
+down_revision: Union[str, None] = '8a4e2d61c5b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so the users table stays writable while the index is created
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_created_at_id', table_name='users',
+                      postgresql_concurrently=True, if_exists=True)
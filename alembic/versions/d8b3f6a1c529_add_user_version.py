@@ -0,0 +1,29 @@
+"""add user version
+
+Revision ID: d8b3f6a1c529
+Revises: a5d2c8e7f341
+Create Date: 2026-10-17 17:40:52.318064
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b3f6a1c529'
+down_revision: Union[str, None] = 'a5d2c8e7f341'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so existing rows are not rewritten
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.add_column('users_archive', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users_archive', 'version')
+    op.drop_column('users', 'version')
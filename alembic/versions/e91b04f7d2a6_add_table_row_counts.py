@@ -0,0 +1,32 @@
+"""add table row counts
+
+Revision ID: e91b04f7d2a6
+Revises: c27d5e9f4a18
+Create Date: 2026-10-17 12:05:41.218907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b04f7d2a6'
+down_revision: Union[str, None] = 'c27d5e9f4a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('table_row_counts',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.execute("INSERT INTO table_row_counts (table_name, row_count) SELECT 'users', count(*) FROM users")
+
+
+def downgrade() -> None:
+    op.drop_table('table_row_counts')
@@ -0,0 +1,37 @@
+"""add user search indexes
+
+Revision ID: f3a8c1d56e27
+Revises: b6e2a9c4f813
+Create Date: 2026-10-17 14:21:52.340187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c1d56e27'
+down_revision: Union[str, None] = 'b6e2a9c4f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ('nickname', 'email', 'first_name', 'last_name')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Built concurrently so the users table stays writable while the indexes are created
+    with op.get_context().autocommit_block():
+        # Trigram GIN indexes serve both ILIKE 'text%' and the similarity operator used by /users/search
+        for column in SEARCH_COLUMNS:
+            op.create_index(f'ix_users_{column}_trgm', 'users', [column], unique=False,
+                            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in reversed(SEARCH_COLUMNS):
+            op.drop_index(f'ix_users_{column}_trgm', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,108 @@
+"""
+Command line tools for operators.
+
+    python -m app.cli import-users tenant-users.csv --report rejected.csv
+    python -m app.cli archive-users --inactive-days 365
+    python -m app.cli seed-user-count
+"""
+
+from builtins import bool, int, open, str
+import asyncio
+import csv
+import uuid
+from typing import Optional
+import click
+from app.database import Database
+from app.dependencies import get_settings
+from app.models.import_model import ImportStatus
+from app.services.archive_service import UserArchiveService
+from app.services.import_service import UserImportService
+from app.services.user_service import UserService
+from app.utils.security import import_password_hasher
+
+
+@click.group()
+def cli():
+    """User management administration commands."""
+
+
+async def _import_users(path: str, format: str, resume: Optional[str], batch_size: Optional[int], report: Optional[str]):
+    settings = get_settings()
+    Database.initialize(settings.database_url, settings.debug)
+    try:
+        async with Database.get_session_factory()() as session:
+            if resume:
+                job = await UserImportService.get(session, uuid.UUID(resume))
+                if job is None:
+                    raise click.ClickException(f"No import with id {resume}")
+            else:
+                job = await UserImportService.start(session, path)
+            click.echo(f"Import {job.id} (resume with --resume {job.id})")
+            if job.status != ImportStatus.COMPLETED:
+                with open(path, encoding="utf-8-sig", newline="") as lines:
+                    await UserImportService.run(session, job, lines, batch_size, format)
+            click.echo(f"{job.status.value}: {job.rows_processed} rows processed, {job.imported_count} imported, {job.failed_count} rejected")
+            if report:
+                with open(report, "w", newline="", encoding="utf-8") as out:
+                    writer = csv.writer(out)
+                    writer.writerow(["row_number", "email", "error"])
+                    for error in await UserImportService.errors(session, job.id):
+                        writer.writerow([error.row_number, error.email, error.error])
+                click.echo(f"Rejected rows written to {report}")
+    finally:
+        import_password_hasher.shutdown()
+        await Database.dispose()
+
+
+@cli.command("import-users")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "format", type=click.Choice(["csv", "ndjson"]), default="csv", show_default=True, help="csv, or ndjson (one JSON object per line).")
+@click.option("--resume", help="Id of an interrupted import to continue.")
+@click.option("--batch-size", type=int, help="Rows per batch; defaults to the import_batch_size setting.")
+@click.option("--report", type=click.Path(dir_okay=False, writable=True), help="Write rejected rows to this CSV file.")
+def import_users(path: str, format: str, resume: Optional[str], batch_size: Optional[int], report: Optional[str]):
+    """Import users from the CSV or NDJSON file at PATH."""
+    asyncio.run(_import_users(path, format, resume, batch_size, report))
+
+
+async def _archive_users(deleted_days: Optional[int], inactive_days: Optional[int], keep_inactive: bool, batch_size: Optional[int]):
+    settings = get_settings()
+    Database.initialize(settings.database_url, settings.debug)
+    deleted_before, inactive_before = UserArchiveService.cutoffs(deleted_days, inactive_days)
+    try:
+        async with Database.get_session_factory()() as session:
+            archived = await UserArchiveService.run(session, deleted_before, None if keep_inactive else inactive_before, batch_size)
+        click.echo(f"Archived {archived} users")
+    finally:
+        await Database.dispose()
+
+
+@cli.command("archive-users")
+@click.option("--deleted-days", type=int, help="Archive users soft-deleted this many days ago; defaults to archive_deleted_after_days.")
+@click.option("--inactive-days", type=int, help="Archive users inactive for this many days; defaults to archive_inactive_after_days, which is unset (off) by default.")
+@click.option("--keep-inactive", is_flag=True, help="Only archive soft-deleted users.")
+@click.option("--batch-size", type=int, help="Users per batch; defaults to the archive_batch_size setting.")
+def archive_users(deleted_days: Optional[int], inactive_days: Optional[int], keep_inactive: bool, batch_size: Optional[int]):
+    """Move soft-deleted and long-inactive users to the users_archive table."""
+    asyncio.run(_archive_users(deleted_days, inactive_days, keep_inactive, batch_size))
+
+
+async def _seed_user_count():
+    settings = get_settings()
+    Database.initialize(settings.database_url, settings.debug)
+    try:
+        async with Database.get_session_factory()() as session:
+            seeded = await UserService.seed_cached_count(session)
+        click.echo(f"Cached user count set to {seeded}")
+    finally:
+        await Database.dispose()
+
+
+@cli.command("seed-user-count")
+def seed_user_count():
+    """Recount live users into the cached counter. Blocks writes to users while it counts."""
+    asyncio.run(_seed_user_count())
+
+
+if __name__ == "__main__":
+    cli()
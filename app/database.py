@@ -1,21 +1,213 @@
+import asyncio
+import bisect
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 Base = declarative_base()
+logger = logging.getLogger(__name__)
+
+class PoolMetrics:
+    """
+    Live metrics of a connection pool: checkout wait times and the age of open connections.
+
+    Wait times are bucketed into a cumulative histogram with upper bounds in seconds,
+    following the Prometheus convention.
+    """
+    WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wait_counts = [0] * (len(self.WAIT_BUCKETS) + 1)
+        self._wait_sum = 0.0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._connections_opened = 0
+        self._connected_at: Dict[int, float] = {}
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self._wait_counts[bisect.bisect_left(self.WAIT_BUCKETS, seconds)] += 1
+            self._wait_sum += seconds
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+
+    def connection_opened(self, dbapi_connection):
+        with self._lock:
+            self._connections_opened += 1
+            self._connected_at[id(dbapi_connection)] = time.monotonic()
+
+    def connection_closed(self, dbapi_connection):
+        with self._lock:
+            self._connected_at.pop(id(dbapi_connection), None)
+
+    def attach(self, engine):
+        """Track connection lifetimes of the engine's pool."""
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "connect", lambda dbapi_connection, record: self.connection_opened(dbapi_connection))
+        event.listen(sync_engine.pool, "close", lambda dbapi_connection, record: self.connection_closed(dbapi_connection))
+        event.listen(sync_engine.pool, "close_detached", lambda dbapi_connection: self.connection_closed(dbapi_connection))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            ages = [now - connected_at for connected_at in self._connected_at.values()]
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.WAIT_BUCKETS, self._wait_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = cumulative + self._wait_counts[-1]
+            observed = self._checkouts + self._timeouts
+            return {
+                "checkouts": self._checkouts,
+                "checkout_timeouts": self._timeouts,
+                "connections_opened": self._connections_opened,
+                "wait_seconds": {
+                    "buckets": buckets,
+                    "sum": self._wait_sum,
+                    "count": observed,
+                    "avg": self._wait_sum / observed if observed else 0.0,
+                },
+                "connection_age_seconds": {
+                    "open": len(ages),
+                    "min": min(ages) if ages else 0.0,
+                    "max": max(ages) if ages else 0.0,
+                    "avg": sum(ages) / len(ages) if ages else 0.0,
+                },
+            }
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long each checkout waited for a connection."""
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class Replica:
+    """A read replica: its engine, autocommit and transactional session factories, and its last known health."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.session_factory = sessionmaker(
+            bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+            class_=AsyncSession, expire_on_commit=False, future=True
+        )
+        # Server-side cursors only live inside a transaction, so streams cannot use autocommit
+        self.stream_session_factory = sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False, future=True
+        )
+        self.healthy = True
+        self.last_error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    async def check(self, timeout: float) -> bool:
+        """Run `SELECT 1` on the replica and record whether it answered within `timeout` seconds."""
+        try:
+            async with self.engine.connect() as connection:
+                await asyncio.wait_for(connection.execute(text("SELECT 1")), timeout)
+        except Exception as e:  # any failure, including timeouts, takes the replica out of rotation
+            if self.healthy:
+                logger.warning(f"Read replica {self.name} is unhealthy: {e}")
+            self.healthy, self.last_error = False, str(e) or type(e).__name__
+        else:
+            if not self.healthy:
+                logger.info(f"Read replica {self.name} is healthy again.")
+            self.healthy, self.last_error = True, None
+        return self.healthy
 
 class Database:
-    """Handles database connections and sessions."""
+    """Handles database connections and sessions.
+
+    Writes always go to the primary engine. Reads can be spread over optional replicas,
+    which are health-checked periodically; while none is healthy, reads fall back to the primary.
+    """
     _engine = None
     _session_factory = None
+    _read_session_factory = None
+    _pool_metrics: Optional[PoolMetrics] = None
+    _replicas: List[Replica] = []
+    _replica_rotation = itertools.count()
 
     @classmethod
-    def initialize(cls, database_url: str, echo: bool = False):
-        """Initialize the async engine and sessionmaker."""
+    def initialize(
+        cls,
+        database_url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_pre_ping: bool = False,
+        pool_recycle: int = -1,
+        statement_cache_size: int = 100,
+        prepared_statement_cache_size: int = 100,
+        replica_urls: Sequence[str] = (),
+    ):
+        """Initialize the async engine and sessionmaker.
+
+        The pool options map onto SQLAlchemy's queue pool; the two cache sizes configure
+        asyncpg's own statement cache and SQLAlchemy's per-connection prepared statement cache.
+        They only apply to server databases; SQLite URLs keep SQLAlchemy's default pool.
+        Each of `replica_urls` gets its own engine with the same options.
+        """
         if cls._engine is None:  # Ensure engine is created once
-            cls._engine = create_async_engine(database_url, echo=echo, future=True)
+            def create_engine(url: str, poolclass):
+                engine_options = {}
+                if not url.startswith("sqlite"):
+                    engine_options.update(
+                        poolclass=poolclass,
+                        pool_size=pool_size,
+                        max_overflow=max_overflow,
+                        pool_timeout=pool_timeout,
+                        pool_pre_ping=pool_pre_ping,
+                        pool_recycle=pool_recycle,
+                    )
+                if "+asyncpg" in url:
+                    engine_options["connect_args"] = {
+                        "statement_cache_size": statement_cache_size,
+                        "prepared_statement_cache_size": prepared_statement_cache_size,
+                    }
+                return create_async_engine(url, echo=echo, future=True, **engine_options)
+
+            cls._engine = create_engine(database_url, InstrumentedQueuePool)
+            cls._replicas = [Replica(create_engine(url, AsyncAdaptedQueuePool)) for url in replica_urls]
+            cls._pool_metrics = PoolMetrics()
+            cls._pool_metrics.attach(cls._engine)
+            if isinstance(cls._engine.sync_engine.pool, InstrumentedQueuePool):
+                cls._engine.sync_engine.pool.metrics = cls._pool_metrics
             cls._session_factory = sessionmaker(
                 bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
             )
+            # Shares the pool, but runs every statement in autocommit: no BEGIN/COMMIT round trips
+            cls._read_session_factory = sessionmaker(
+                bind=cls._engine.execution_options(isolation_level="AUTOCOMMIT"),
+                class_=AsyncSession, expire_on_commit=False, future=True
+            )
 
     @classmethod
     def get_session_factory(cls):
@@ -23,3 +215,75 @@ class Database:
         if cls._session_factory is None:
             raise ValueError("Database not initialized. Call `initialize()` first.")
         return cls._session_factory
+
+    @classmethod
+    def get_read_session_factory(cls, use_primary: bool = False):
+        """Returns the factory for read-only sessions, which run without a transaction.
+
+        Sessions go to the healthy replicas in turn, or to the primary when `use_primary`
+        is set or no replica is healthy.
+        """
+        if cls._read_session_factory is None:
+            raise ValueError("Database not initialized. Call `initialize()` first.")
+        replica = None if use_primary else cls._next_healthy_replica()
+        return replica.session_factory if replica else cls._read_session_factory
+
+    @classmethod
+    def get_stream_session_factory(cls):
+        """Returns the factory for long read-only streams over a server-side cursor.
+
+        Like `get_read_session_factory`, sessions go to the healthy replicas in turn and to the
+        primary when none is healthy, but they run in a transaction, which the cursor needs.
+        """
+        if cls._session_factory is None:
+            raise ValueError("Database not initialized. Call `initialize()` first.")
+        replica = cls._next_healthy_replica()
+        return replica.stream_session_factory if replica else cls._session_factory
+
+    @classmethod
+    def _next_healthy_replica(cls) -> Optional[Replica]:
+        healthy = [replica for replica in cls._replicas if replica.healthy]
+        return healthy[next(cls._replica_rotation) % len(healthy)] if healthy else None
+
+    @classmethod
+    async def check_replicas(cls, timeout: float = 2.0) -> Dict[str, bool]:
+        """Health-check every replica concurrently; returns each replica's health by name."""
+        results = await asyncio.gather(*(replica.check(timeout) for replica in cls._replicas))
+        return {replica.name: healthy for replica, healthy in zip(cls._replicas, results)}
+
+    @classmethod
+    async def run_replica_health_checks(cls, interval_seconds: float, timeout: float = 2.0):
+        """Background task: re-check the replicas every `interval_seconds` until cancelled."""
+        while True:
+            await cls.check_replicas(timeout)
+            await asyncio.sleep(interval_seconds)
+
+    @classmethod
+    async def dispose(cls):
+        """Close the pooled connections of the primary and replica engines; new ones open on demand."""
+        if cls._engine is not None:
+            await cls._engine.dispose()
+        for replica in cls._replicas:
+            await replica.engine.dispose()
+
+    @classmethod
+    def pool_status(cls) -> dict:
+        """Return the pool's current occupancy together with the collected metrics."""
+        if cls._engine is None:
+            raise ValueError("Database not initialized. Call `initialize()` first.")
+        pool = cls._engine.sync_engine.pool
+        status = {"pool_class": type(pool).__name__}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            status.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(0, pool.overflow()),
+                timeout=pool.timeout(),
+            )
+        status.update(cls._pool_metrics.snapshot())
+        status["replicas"] = [
+            {"name": replica.name, "healthy": replica.healthy, "last_error": replica.last_error}
+            for replica in cls._replicas
+        ]
+        return status
@@ -1,11 +1,18 @@
-from builtins import Exception, dict, str
-from fastapi import Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
+from builtins import Exception, ValueError, dict, len, min, str
+import hashlib
+from uuid import UUID
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import Database
+from app.models.user_model import User
+from app.utils.rate_limiter import login_email_limiter, login_ip_limiter
+from app.utils.read_routing import recent_writers
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
 from app.services.jwt_service import decode_token
+from app.services.revocation_service import revocation_list
 from settings.config import Settings
 from fastapi import Depends
 
@@ -17,15 +24,45 @@ def get_email_service() -> EmailService:
     template_manager = TemplateManager()
     return EmailService(template_manager=template_manager)
 
-async def get_db() -> AsyncSession:
-    """Dependency that provides a database session for each request."""
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+def get_client_key(request: Request) -> str:
+    """Identify the client for read-your-writes routing: its bearer token if any, else its IP."""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return "auth:" + hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+    return "ip:" + get_client_ip(request)
+
+async def get_db(request: Request) -> AsyncSession:
+    """Dependency that provides a database session for each request.
+
+    Unsafe requests (anything but GET/HEAD/OPTIONS) count as writes: the client's reads are
+    pinned to the primary for a short while afterwards, so it sees its own changes.
+    """
     async_session_factory = Database.get_session_factory()
     async with async_session_factory() as session:
         try:
             yield session
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
-        
+        finally:
+            if request.method not in SAFE_METHODS:
+                recent_writers.mark(get_client_key(request))
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """Dependency that provides a session for read-only endpoints.
+
+    Statements run in autocommit mode, so reads never open a transaction or pay for a COMMIT.
+    They go to a read replica when one is healthy, unless this client wrote recently.
+    Do not use it for endpoints that write.
+    """
+    use_primary = recent_writers.wrote_recently(get_client_key(request))
+    async_session_factory = Database.get_read_session_factory(use_primary=use_primary)
+    async with async_session_factory() as session:
+        try:
+            yield session
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
@@ -36,7 +73,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
     payload = decode_token(token)
-    if payload is None:
+    if payload is None or revocation_list.is_revoked(payload.get("jti")):
         raise credentials_exception
     user_id: str = payload.get("sub")
     user_role: str = payload.get("role")
@@ -44,9 +81,59 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         raise credentials_exception
     return {"user_id": user_id, "role": user_role}
 
+async def get_current_user_record(request: Request, current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_db)) -> User:
+    """
+    Load the caller's own row, at most once per request.
+
+    The row is kept on `request.state` and FastAPI caches the dependency result, so every
+    route dependency and service call in the same request shares one object and one query.
+    Tokens issued before `sub` carried the user id hold the email instead and still resolve.
+    """
+    record = getattr(request.state, "current_user_record", None)
+    if record is not None:
+        return record
+    subject = current_user["user_id"]
+    try:
+        query = select(User).where(User.id == UUID(subject))
+    except ValueError:
+        query = select(User).where(User.email == subject)
+    record = (await db.execute(query.where(User.deleted_at.is_(None)))).scalars().first()
+    if record is None:
+        raise HTTPException(status_code=401, detail="Could not validate credentials", headers={"WWW-Authenticate": "Bearer"})
+    request.state.current_user_record = record
+    return record
+
 def require_role(role: str):
     def role_checker(current_user: dict = Depends(get_current_user)):
         if current_user["role"] not in role:
             raise HTTPException(status_code=403, detail="Operation not permitted")
         return current_user
     return role_checker
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Return the address of the client that reached the outermost trusted proxy.
+
+    Each trusted proxy appends the address it saw to X-Forwarded-For, so the entry
+    `trusted_proxy_count` places from the end is the first one a client cannot forge.
+    """
+    forwarded_for = request.headers.get("x-forwarded-for")
+    proxies = get_settings().trusted_proxy_count
+    if forwarded_for and proxies > 0:
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        if hops:
+            return hops[-min(proxies, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+def throttle_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    """Reject login attempts over the per-IP or per-account rate with 429, before any hashing or DB work."""
+    retry_after = login_ip_limiter.hit(get_client_ip(request))
+    if retry_after is None:
+        retry_after = login_email_limiter.hit(form_data.username.strip().lower())
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts. Please try again later.",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,11 +1,15 @@
 from builtins import Exception
+import asyncio
 from fastapi import FastAPI
 from starlette.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware  # Import the CORSMiddleware
 from app.database import Database
 from app.dependencies import get_settings
-from app.routers import user_routes
+from app.routers import admin_routes, user_routes
+from app.services.revocation_service import revocation_list
 from app.utils.api_description import getDescription
+from app.utils.etag import VersionMismatch, make_etag
+from app.utils.security import PasswordHashQueueFull, import_password_hasher, password_hasher
 app = FastAPI(
     title="User Management",
     description=getDescription(),
@@ -26,17 +30,59 @@ app.add_middleware(
     allow_credentials=True,  # Support credentials (cookies, authorization headers, etc.)
     allow_methods=["*"],  # Allowed HTTP methods
     allow_headers=["*"],  # Allowed HTTP headers
+    expose_headers=["ETag"],  # Lets browser clients read user versions for If-Match
 )
 
 @app.on_event("startup")
 async def startup_event():
     settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
+    Database.initialize(
+        settings.database_url,
+        settings.debug,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        statement_cache_size=settings.db_statement_cache_size,
+        prepared_statement_cache_size=settings.db_prepared_statement_cache_size,
+        replica_urls=settings.database_replica_urls,
+    )
+    app.state.replica_health_task = None
+    if settings.database_replica_urls:
+        app.state.replica_health_task = asyncio.create_task(
+            Database.run_replica_health_checks(settings.db_replica_health_check_interval, settings.db_replica_health_check_timeout)
+        )
+    app.state.revocation_task = asyncio.create_task(
+        revocation_list.run_maintenance(Database.get_session_factory(), settings.revocation_sync_interval_seconds)
+    )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.revocation_task.cancel()
+    if app.state.replica_health_task is not None:
+        app.state.replica_health_task.cancel()
+    password_hasher.shutdown()
+    import_password_hasher.shutdown()
+    await Database.dispose()
+
+@app.exception_handler(PasswordHashQueueFull)
+async def password_hash_queue_full_handler(request, exc):
+    return JSONResponse(status_code=503, content={"message": "Server is busy, please retry shortly."}, headers={"Retry-After": "1"})
+
+@app.exception_handler(VersionMismatch)
+async def version_mismatch_handler(request, exc):
+    return JSONResponse(
+        status_code=412,
+        content={"message": "The user was modified by someone else; fetch it again and retry."},
+        headers={"ETag": make_etag(exc.current_version)},
+    )
 
 @app.exception_handler(Exception)
 async def exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"message": "An unexpected error occurred."})
 
 app.include_router(user_routes.router)
+app.include_router(admin_routes.router)
 
 
@@ -0,0 +1,63 @@
+from builtins import int, str
+from datetime import datetime
+from enum import Enum
+import uuid
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, func, Enum as SQLAlchemyEnum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class ImportStatus(Enum):
+    """Lifecycle of a bulk user import."""
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+class UserImport(Base):
+    """
+    Progress of a bulk user import.
+
+    Rows are loaded in batches; each batch commits together with the updated `rows_processed`,
+    so an interrupted import resumes after the last committed batch.
+
+    Attributes:
+        id (UUID): Identifier used to resume the import.
+        source (str): Name of the imported file.
+        status (ImportStatus): Whether the import is running, completed or failed.
+        rows_processed (int): Number of data rows handled so far, imported or rejected.
+        imported_count (int): Number of users created.
+        failed_count (int): Number of rows rejected; see `UserImportError`.
+        created_at (datetime): Time the import started.
+        updated_at (datetime): Time of the last committed batch.
+        finished_at (datetime): Time the import completed or failed.
+    """
+    __tablename__ = "user_imports"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    source: Mapped[str] = Column(String(255), nullable=True)
+    status: Mapped[ImportStatus] = Column(SQLAlchemyEnum(ImportStatus, name='ImportStatus', create_constraint=True), nullable=False, default=ImportStatus.RUNNING)
+    rows_processed: Mapped[int] = Column(Integer, nullable=False, default=0)
+    imported_count: Mapped[int] = Column(Integer, nullable=False, default=0)
+    failed_count: Mapped[int] = Column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+
+class UserImportError(Base):
+    """
+    A row rejected by a bulk user import.
+
+    Attributes:
+        id (int): Surrogate key.
+        import_id (UUID): The import the row belongs to.
+        row_number (int): 1-based number of the data row in the file, not counting the header.
+        email (str): The row's email, if it had one.
+        error (str): Why the row was rejected.
+    """
+    __tablename__ = "user_import_errors"
+
+    id: Mapped[int] = Column(BigInteger, primary_key=True, autoincrement=True)
+    import_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("user_imports.id", ondelete="CASCADE"), nullable=False, index=True)
+    row_number: Mapped[int] = Column(Integer, nullable=False)
+    email: Mapped[str] = Column(String(255), nullable=True)
+    error: Mapped[str] = Column(String(1000), nullable=False)
@@ -0,0 +1,45 @@
+from builtins import str
+from datetime import datetime
+import uuid
+from sqlalchemy import BigInteger, CheckConstraint, Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class TableRowCount(Base):
+    """
+    A maintained row count for a table, so that listing endpoints don't have to run
+    `SELECT count(*)` on every request.
+
+    The counter is adjusted in the same transaction as the inserts and deletes it tracks.
+    When no row exists for a table, the first reader seeds it from an exact count.
+
+    Attributes:
+        table_name (str): Name of the counted table.
+        row_count (int): Number of rows in the table.
+        updated_at (datetime): Time the counter last changed.
+    """
+    __tablename__ = "table_row_counts"
+
+    table_name: Mapped[str] = Column(String(63), primary_key=True)
+    row_count: Mapped[int] = Column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class AppBootstrap(Base):
+    """
+    Singleton row recording that the application has been bootstrapped with its first admin.
+
+    The first registration claims the row with `INSERT ... ON CONFLICT DO NOTHING`; the primary
+    key admits only one row, so concurrent signups on an empty database cannot both become ADMIN.
+
+    Attributes:
+        id (int): Always 1.
+        admin_user_id (UUID): The user made ADMIN by the claim; None if the database already had users.
+        claimed_at (datetime): Time the row was claimed.
+    """
+    __tablename__ = "app_bootstrap"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_app_bootstrap_singleton"),)
+
+    id: Mapped[int] = Column(Integer, primary_key=True, default=1)
+    admin_user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    claimed_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,60 @@
+from builtins import str
+from datetime import datetime
+import uuid
+from sqlalchemy import Column, String, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class RefreshToken(Base):
+    """
+    A single-use refresh token, stored as the SHA-256 digest of the value handed to the client.
+
+    Every rotation marks the presented token as used and issues a successor in the same
+    `family_id`. Presenting a token that was already used means it leaked, so the whole
+    family is revoked.
+
+    Attributes:
+        id (UUID): Unique identifier of the token record.
+        user_id (UUID): Owner of the token.
+        family_id (UUID): Identifier shared by a token and all of its rotated successors.
+        token_hash (str): Hex SHA-256 digest of the raw token.
+        expires_at (datetime): Time after which the token can no longer be used.
+        used_at (datetime): Time the token was exchanged, if it was.
+        revoked_at (datetime): Time the token was revoked, if it was.
+        created_at (datetime): Timestamp when the token was issued, set by the server.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    token_hash: Mapped[str] = Column(String(64), unique=True, nullable=False, index=True)
+    expires_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False)
+    used_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<RefreshToken {self.id}, User: {self.user_id}>"
+
+
+class RevokedToken(Base):
+    """
+    An access token revoked before its expiry, identified by its `jti` claim.
+
+    Rows are only needed until the token would have expired anyway, after which they are purged.
+
+    Attributes:
+        jti (str): The revoked token's unique identifier.
+        expires_at (datetime): Expiry of the revoked token.
+        revoked_at (datetime): Timestamp of the revocation, set by the server.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = Column(String(64), primary_key=True)
+    expires_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<RevokedToken {self.jti}>"
@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 import uuid
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum
+    Column, String, Integer, DateTime, Boolean, Index, Table, func, text, Enum as SQLAlchemyEnum
 )
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import Mapped, mapped_column
@@ -16,6 +16,17 @@ class UserRole(Enum):
     MANAGER = "MANAGER"
     ADMIN = "ADMIN"
 
+# Columns GET /users/ may filter on (equality) and sort by; each pair has a composite index
+USER_LIST_FILTERS = ("role", "email_verified", "is_locked", "is_professional")
+USER_LIST_SORTS = ("created_at", "nickname", "email")
+
+def _user_list_indexes():
+    """(filter, sort, id) indexes: an equality filter followed by the sort key reads a page in index order."""
+    return tuple(
+        Index(f"ix_users_{column}_{sort}", column, sort, "id")
+        for column in USER_LIST_FILTERS for sort in USER_LIST_SORTS
+    )
+
 class User(Base):
     """
     Represents a user within the application, corresponding to the 'users' table in the database.
@@ -37,11 +48,16 @@ class User(Base):
         role (UserRole): Role of the user within the application.
         is_professional (bool): Flag indicating professional status.
         professional_status_updated_at (datetime): Timestamp of last professional status update.
+        profile_updates_count (int): Number of profile updates made through `update_profile`.
+        last_profile_update (datetime): Timestamp of the last profile update.
         last_login_at (datetime): Timestamp of the last login.
         failed_login_attempts (int): Count of failed login attempts.
         is_locked (bool): Flag indicating if the account is locked.
         created_at (datetime): Timestamp when the user was created, set by the server.
         updated_at (datetime): Timestamp of the last update, set by the server.
+        deleted_at (datetime): When the user was soft-deleted; None for live users.
+        version (int): Row version, bumped by every update, deletion and restore, but not by login
+            bookkeeping; the source of the user's ETag.
 
     Methods:
         lock_account(): Locks the user account.
@@ -51,7 +67,15 @@ class User(Base):
         update_professional_status(status): Updates the professional status and logs the update time.
     """
     __tablename__ = "users"
-    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Serves keyset pagination ordered by (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Let the archival job find deleted users without scanning live rows. last_login_at is
+        # deliberately not indexed: every login writes it, and an index would rule out HOT updates.
+        Index("ix_users_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+        # The pg_trgm GIN indexes used by search exist only in the migrations, as the
+        # extension may be missing where the schema is created from metadata.
+    ) + _user_list_indexes()
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nickname: Mapped[str] = Column(String(50), unique=True, nullable=False, index=True)
@@ -65,6 +89,8 @@ class User(Base):
     role: Mapped[UserRole] = Column(SQLAlchemyEnum(UserRole, name='UserRole', create_constraint=True), nullable=False)
     is_professional: Mapped[bool] = Column(Boolean, default=False)
     professional_status_updated_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    profile_updates_count: Mapped[int] = Column(Integer, nullable=False, server_default=text("0"))
+    last_profile_update: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
     last_login_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
     failed_login_attempts: Mapped[int] = Column(Integer, default=0)
     is_locked: Mapped[bool] = Column(Boolean, default=False)
@@ -73,6 +99,12 @@ class User(Base):
     verification_token = Column(String, nullable=True)
     email_verified: Mapped[bool] = Column(Boolean, default=False, nullable=False)
     hashed_password: Mapped[str] = Column(String(255), nullable=False)
+    deleted_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    version: Mapped[int] = Column(Integer, nullable=False, server_default=text("1"))
+
+    # ORM flushes update `WHERE version = <loaded version>` and bump it, failing with
+    # StaleDataError if another writer got there first. Core UPDATEs bump it themselves.
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
 
 
     def __repr__(self) -> str:
@@ -95,3 +127,24 @@ class User(Base):
         """Updates the professional status and logs the update time."""
         self.is_professional = status
         self.professional_status_updated_at = func.now()
+
+class ArchivedUser(Base):
+    """
+    A user moved out of the hot `users` table by the archival job, corresponding to 'users_archive'.
+
+    Holds the same columns as `User` plus `archived_at`. Nicknames, and the emails of deleted users,
+    are free to be taken again in `users` once archived, which a restore then has to respect. The
+    email of a dormant user, archived for inactivity, stays reserved: its next login restores it.
+    """
+    __table__ = Table(
+        "users_archive",
+        Base.metadata,
+        *(Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+          for column in User.__table__.columns),
+        Column("archived_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        # Logins and signups look up the dormant (archived but never deleted) account of an email
+        Index("ix_users_archive_dormant_email", "email", postgresql_where=text("deleted_at IS NULL")),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ArchivedUser {self.nickname}, archived at {self.archived_at}>"
@@ -0,0 +1,130 @@
+"""
+Operational endpoints for administrators.
+
+These routes expose runtime metrics of the worker process that serves the request, so
+operators can size pools and queues without attaching a profiler to production.
+"""
+
+from builtins import Exception, dict, int, open
+import asyncio
+import logging
+import os
+import tempfile
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Response, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Database
+from app.dependencies import get_db, require_role
+from app.models.import_model import ImportStatus, UserImport
+from app.schemas.import_schema import ImportRowError, UserImportReport
+from app.services.import_service import UserImportService
+from app.services.jwt_service import token_cache
+from app.utils.security import password_hasher
+
+router = APIRouter(prefix="/admin", tags=["Administration (Admin Role)"])
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@router.get("/metrics/password-hashing", name="password_hashing_metrics")
+async def password_hashing_metrics(current_user: dict = Depends(require_role(["ADMIN"]))):
+    """Return in-flight, completed, failed and rejected counters of the password hashing pool."""
+    return password_hasher.metrics()
+
+
+@router.get("/metrics/token-cache", name="token_cache_metrics")
+async def token_cache_metrics(current_user: dict = Depends(require_role(["ADMIN"]))):
+    """Return size and hit/miss counters of the verified-JWT claims cache."""
+    return token_cache.stats()
+
+
+@router.get("/metrics/db-pool", name="db_pool_metrics")
+async def db_pool_metrics(current_user: dict = Depends(require_role(["ADMIN"]))):
+    """Return connection pool occupancy, checkout wait histogram and open connection ages."""
+    return Database.pool_status()
+
+
+async def _import_report(db: AsyncSession, job: UserImport, errors_limit: int) -> UserImportReport:
+    errors = await UserImportService.errors(db, job.id, errors_limit)
+    report = UserImportReport.model_validate(job)
+    report.errors = [ImportRowError.model_validate(error) for error in errors]
+    return report
+
+
+async def _save_upload(file: UploadFile) -> str:
+    """Copy an upload to a temporary file that outlives the request, without blocking the event loop."""
+    fd, path = tempfile.mkstemp(prefix="user-import-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(out.write, chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+async def _run_import(import_id: UUID, path: str, format: str):
+    """Run an import started over HTTP to completion, on a session of its own."""
+    try:
+        async with Database.get_session_factory()() as session:
+            job = await UserImportService.get(session, import_id)
+            with open(path, encoding="utf-8-sig", newline="") as lines:
+                await UserImportService.run(session, job, lines, format=format)
+    except Exception as e:
+        # run() has already marked the job FAILED; clients see that when they poll
+        logger.error(f"Background user import {import_id} failed: {e}")
+    finally:
+        os.remove(path)
+
+
+@router.post("/users/import", response_model=UserImportReport, status_code=status.HTTP_202_ACCEPTED, name="import_users")
+async def import_users(
+    background_tasks: BackgroundTasks,
+    response: Response,
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON; fields as in UserCreate, `password` in plain text"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv, or ndjson (one JSON object per line)"),
+    import_id: Optional[UUID] = Query(None, description="Resume this failed import, skipping the rows it already processed"),
+    errors_limit: int = Query(1000, ge=0, description="Maximum rejected rows listed in the report"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """
+    Start a bulk import of users from a CSV or NDJSON file and return at once with its `id`.
+
+    The import runs in the background; poll `GET /admin/users/import/{id}` for its progress and
+    error report. Rows that fail validation or collide with existing users are listed in the report
+    instead of failing the import. For very large files prefer the CLI:
+    `python -m app.cli import-users FILE`.
+    """
+    if import_id is not None:
+        job = await UserImportService.get(db, import_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+        if job.status == ImportStatus.COMPLETED:
+            response.status_code = status.HTTP_200_OK
+            return await _import_report(db, job, errors_limit)
+    path = await _save_upload(file)
+    if import_id is None:
+        job = await UserImportService.start(db, file.filename)
+    elif not await UserImportService.resume(db, job):
+        os.remove(path)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import is already running")
+    background_tasks.add_task(_run_import, job.id, path, format)
+    return await _import_report(db, job, errors_limit)
+
+
+@router.get("/users/import/{import_id}", response_model=UserImportReport, name="get_user_import")
+async def get_user_import(
+    import_id: UUID,
+    errors_limit: int = Query(1000, ge=0, description="Maximum rejected rows listed in the report"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """Return the progress and error report of a bulk import."""
+    job = await UserImportService.get(db, import_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+    return await _import_report(db, job, errors_limit)
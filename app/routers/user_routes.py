@@ -18,28 +18,111 @@ Key Highlights:
 - Utilizes OAuth2PasswordBearer for securing API endpoints, requiring valid access tokens for operations.
 """
 
-from builtins import dict, int, len, str
-from datetime import timedelta
+from builtins import dict, int, len, str, tuple
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_current_user, get_db, get_email_service, require_role
+from app.database import Database
+from app.dependencies import get_current_user, get_current_user_record, get_db, get_email_service, get_read_db, require_role, throttle_login
 from app.schemas.pagination_schema import EnhancedPagination
-from app.schemas.token_schema import TokenResponse
-from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserResponse, UserUpdate
-from app.services.user_service import UserService
-from app.services.jwt_service import create_access_token
-from app.utils.link_generation import create_user_links, generate_pagination_links
+from app.schemas.token_schema import RefreshTokenRequest, TokenResponse
+from app.schemas.user_schemas import LoginRequest, UserBase, UserBatchGetItem, UserBatchGetRequest, UserBatchGetResponse, UserBulkUpdateRequest, UserBulkUpdateResponse, UserCreate, UserListResponse, UserResponse, UserUpdate
+from app.services.archive_service import RestoreOutcome, UserArchiveService
+from app.services.user_service import EXPORT_COLUMNS, CountStrategy, LoginOutcome, SearchMode, UserService
+from app.services.jwt_service import create_access_token, decode_token, key_ring, token_cache
+from app.services.revocation_service import revocation_list
+from app.services.token_service import TokenService
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.etag import if_match_versions, if_none_match_hit, make_etag
+from app.utils.export import encode_csv, encode_ndjson
+from app.utils.link_generation import create_user_links, generate_cursor_pagination_links, generate_pagination_links
 from app.dependencies import get_settings
 from app.services.email_service import EmailService
+from app.models.user_model import USER_LIST_SORTS, User, UserRole
 import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 settings = get_settings()
+# Registered before /users/{user_id}, which would otherwise capture the path
+@router.get("/users/search", response_model=UserListResponse, name="search_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100, description="Text matched against nickname, email, first and last name"),
+    mode: SearchMode = Query(SearchMode.PREFIX, description="prefix, or fuzzy for typo-tolerant matching"),
+    role: Optional[UserRole] = None,
+    is_professional: Optional[bool] = None,
+    is_locked: Optional[bool] = None,
+    email_verified: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
+):
+    """Search users by name, nickname or email; fuzzy results are ranked by similarity. No total is computed."""
+    conditions = UserService.filter_conditions(role, email_verified, is_locked, is_professional, created_after, created_before)
+    users = await UserService.search_users(db, q, mode, conditions, skip, limit)
+    return UserListResponse(
+        items=[UserResponse.model_validate(user) for user in users],
+        page=skip // limit + 1,
+        size=len(users),
+    )
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Also registered before /users/{user_id}
+@router.get("/users/export", name="export_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson (one JSON object per line) or csv"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to export; defaults to all exportable columns", example="id,email,role"),
+    role: Optional[UserRole] = None,
+    email_verified: Optional[bool] = None,
+    is_locked: Optional[bool] = None,
+    is_professional: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
+):
+    """
+    Stream every matching user as NDJSON or CSV with chunked transfer encoding.
+
+    Rows are read from a server-side cursor and written out chunk by chunk, without building
+    response models or links, so memory use does not grow with the number of users. The cursor
+    runs on a read replica when one is healthy, otherwise on the primary.
+    """
+    selected = [column.strip() for column in columns.split(",") if column.strip()] if columns else list(EXPORT_COLUMNS)
+    unknown = [column for column in selected if column not in EXPORT_COLUMNS]
+    if unknown or not selected:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown export columns: {', '.join(unknown)}. Allowed: {', '.join(EXPORT_COLUMNS)}")
+    conditions = UserService.filter_conditions(role, email_verified, is_locked, is_professional, created_after, created_before)
+
+    async def body():
+        # The request's dependencies are torn down before the body is sent, so the stream opens its own
+        # session, on a replica when one is healthy
+        async with Database.get_stream_session_factory()() as session:
+            header = format == "csv"
+            async for rows in UserService.export_rows(session, selected, conditions, settings.export_chunk_size):
+                if format == "csv":
+                    yield encode_csv(rows, selected, header)
+                    header = False
+                else:
+                    yield encode_ndjson(rows, selected)
+            if header:
+                yield encode_csv([], selected, header=True)
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
 @router.get("/users/{user_id}", response_model=UserResponse, name="get_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def get_user(user_id: UUID, request: Request, response: Response, db: AsyncSession = Depends(get_read_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Endpoint to fetch a user by their unique identifier (UUID).
 
@@ -51,11 +134,17 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
         request: The request object, used to generate full URLs in the response.
         db: Dependency that provides an AsyncSession for database access.
         token: The OAuth2 access token obtained through OAuth2PasswordBearer dependency.
+
+    The response carries the user's ETag; a matching `If-None-Match` gets 304 Not Modified.
     """
     user = await UserService.get_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    etag = make_etag(user.version)
+    if if_none_match_hit(request.headers.get("If-None-Match"), user.version):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
+    response.headers["ETag"] = etag
     return UserResponse.model_construct(
         id=user.id,
         nickname=user.nickname,
@@ -70,6 +159,7 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
         last_login_at=user.last_login_at,
         created_at=user.created_at,
         updated_at=user.updated_at,
+        version=user.version,
         links=create_user_links(user.id, request)  
     )
 
@@ -80,19 +170,84 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
 # This approach not only ensures that the API is secure and efficient but also promotes a better client
 # experience by adhering to REST principles and providing self-discoverable operations.
 
+@router.post("/users/batch-get", response_model=UserBatchGetResponse, name="batch_get_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def batch_get_users(body: UserBatchGetRequest, db: AsyncSession = Depends(get_read_db), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Resolve many user ids in one request and one query.
+
+    Results follow the order of `ids`, duplicates included; ids without a user come back with
+    `found: false`. Responses carry no HATEOAS links. At most `batch_get_max_ids` ids per call.
+    """
+    if len(body.ids) > settings.batch_get_max_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {settings.batch_get_max_ids} ids per request")
+    users = await UserService.get_many(db, body.ids)
+    return UserBatchGetResponse(items=[
+        UserBatchGetItem(id=user_id, found=user_id in users, user=UserResponse.model_validate(users[user_id]) if user_id in users else None)
+        for user_id in body.ids
+    ])
+
+def _bulk_notification(changes: dict) -> tuple:
+    """The email type and template context announcing a bulk change to the affected users."""
+    if "is_locked" in changes:
+        return ("account_locked" if changes["is_locked"] else "account_unlocked"), {}
+    if "role" in changes:
+        return "role_changed", {"role": changes["role"].name}
+    return "professional_status", {"status": "upgraded" if changes["is_professional"] else "downgraded"}
+
+@router.patch("/users/bulk", response_model=UserBulkUpdateResponse, name="bulk_update_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def bulk_update_users(
+    body: UserBulkUpdateRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    email_service: EmailService = Depends(get_email_service),
+    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"])),
+    current_user_record: User = Depends(get_current_user_record),
+):
+    """
+    Lock, unlock, change the role of, or change the professional status of many users at once.
+
+    Targets either `ids` (at most `bulk_update_max_ids`) or the users matching `filter`. The change
+    runs as one UPDATE in one transaction; users that already had the new value are not counted.
+    The caller is never changed, admins are never locked, and only admins may change roles, to
+    anything but ADMIN. Affected users are notified by email after the response, in batches of
+    `bulk_email_batch_size`.
+    """
+    if body.ids is not None and len(body.ids) > settings.bulk_update_max_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {settings.bulk_update_max_ids} ids per request")
+    changes = body.changes.model_dump(exclude_none=True)
+    if "role" in changes:
+        if current_user["role"] != UserRole.ADMIN.name:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can change roles")
+        if changes["role"] == UserRole.ADMIN:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The ADMIN role cannot be granted in bulk")
+    conditions = UserService.filter_conditions(**body.filter.model_dump()) if body.filter else ()
+    updated = await UserService.bulk_update(db, changes, user_ids=body.ids, conditions=conditions, actor_id=current_user_record.id)
+    if updated is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Bulk update failed")
+
+    if updated:
+        email_type, context = _bulk_notification(changes)
+        recipients = [{"name": row.first_name or row.email, "email": row.email, **context} for row in updated]
+        background_tasks.add_task(email_service.send_user_emails, recipients, email_type, settings.bulk_email_batch_size)
+    return UserBulkUpdateResponse(affected=len(updated))
+
 @router.put("/users/{user_id}", response_model=UserResponse, name="update_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, response: Response, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Update user information.
 
     - **user_id**: UUID of the user to update.
     - **user_update**: UserUpdate model with updated user information.
+
+    Send the user's ETag in `If-Match` to update only if nobody changed the user since it was
+    read; otherwise the update fails with 412 Precondition Failed and the current ETag.
     """
     user_data = user_update.model_dump(exclude_unset=True)
-    updated_user = await UserService.update(db, user_id, user_data)
+    updated_user = await UserService.update(db, user_id, user_data, if_match_versions(request.headers.get("If-Match")))
     if not updated_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
+    response.headers["ETag"] = make_etag(updated_user.version)
     return UserResponse.model_construct(
         id=updated_user.id,
         bio=updated_user.bio,
@@ -107,6 +262,7 @@ async def update_user(user_id: UUID, user_update: UserUpdate, request: Request,
         linkedin_profile_url=updated_user.linkedin_profile_url,
         created_at=updated_user.created_at,
         updated_at=updated_user.updated_at,
+        version=updated_user.version,
         links=create_user_links(updated_user.id, request)
     )
 
@@ -125,6 +281,40 @@ async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), token:
 
 
 
+@router.post("/users/{user_id}/restore", response_model=UserResponse, name="restore_user", tags=["User Management Requires (Admin or Manager Roles)"])
+async def restore_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Restore a deleted user, whether it is still soft-deleted or has already been archived.
+
+    - **user_id**: UUID of the user to restore.
+
+    Answers 409 when an archived user's email or nickname has since been taken by another user.
+    """
+    outcome = await UserArchiveService.restore(db, user_id)
+    if outcome == RestoreOutcome.NOT_FOUND:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No deleted user with this id")
+    if outcome == RestoreOutcome.CONFLICT:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="The user's email or nickname is now taken by another user")
+    user = await UserService.get_by_id(db, user_id)
+    return UserResponse.model_construct(
+        id=user.id,
+        bio=user.bio,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        nickname=user.nickname,
+        email=user.email,
+        role=user.role,
+        is_professional=user.is_professional,
+        last_login_at=user.last_login_at,
+        profile_picture_url=user.profile_picture_url,
+        github_profile_url=user.github_profile_url,
+        linkedin_profile_url=user.linkedin_profile_url,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+        version=user.version,
+        links=create_user_links(user.id, request)
+    )
+
 @router.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED, tags=["User Management Requires (Admin or Manager Roles)"], name="create_user")
 async def create_user(user: UserCreate, request: Request, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
@@ -163,26 +353,56 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
         last_login_at=created_user.last_login_at,
         created_at=created_user.created_at,
         updated_at=created_user.updated_at,
+        version=created_user.version,
         links=create_user_links(created_user.id, request)
     )
 
 
+LIST_SORT_PATTERN = f"^-?({'|'.join(USER_LIST_SORTS)})$"
+
 @router.get("/users/", response_model=UserListResponse, tags=["User Management Requires (Admin or Manager Roles)"])
 async def list_users(
     request: Request,
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Use `cursor` for constant-cost paging through large result sets."),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next/prev link; implies cursor pagination."),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="How to compute `total`: exact, estimated (planner statistics), cached (maintained counter) or none."),
+    sort: str = Query("created_at", pattern=LIST_SORT_PATTERN, description=f"One of {', '.join(USER_LIST_SORTS)}; prefix with - for descending"),
+    role: Optional[UserRole] = None,
+    email_verified: Optional[bool] = None,
+    is_locked: Optional[bool] = None,
+    is_professional: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    total_users = await UserService.count(db)
-    users = await UserService.list_users(db, skip, limit)
+    conditions = UserService.filter_conditions(role, email_verified, is_locked, is_professional)
+    total_users = await UserService.count(db, count, conditions)
+
+    if cursor is not None or pagination == "cursor":
+        if sort != "created_at":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor pagination is ordered by created_at only")
+        try:
+            page_cursor = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        page = await UserService.list_users_keyset(db, limit, page_cursor, conditions)
+        return UserListResponse(
+            items=[UserResponse.model_validate(user) for user in page.items],
+            total=total_users,
+            size=len(page.items),
+            links=generate_cursor_pagination_links(request, limit, page.next_cursor, page.prev_cursor),
+            next_cursor=encode_cursor(page.next_cursor) if page.next_cursor else None,
+            prev_cursor=encode_cursor(page.prev_cursor) if page.prev_cursor else None,
+        )
+
+    users = await UserService.list_users(db, skip, limit, sort, conditions)
 
     user_responses = [
         UserResponse.model_validate(user) for user in users
     ]
     
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
+    pagination_links = generate_pagination_links(request, skip, limit, total_users, len(user_responses))
     
     # Construct the final response with pagination details
     return UserListResponse(
@@ -201,39 +421,61 @@ async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db
         return user
     raise HTTPException(status_code=400, detail="Email already exists")
 
-@router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"])
+@router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"], dependencies=[Depends(throttle_login)])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
+    outcome, user = await UserService.attempt_login(session, form_data.username, form_data.password)
+    if outcome is LoginOutcome.ARCHIVED and await UserArchiveService.restore_dormant(session, form_data.username) is RestoreOutcome.RESTORED:
+        outcome, user = await UserService.attempt_login(session, form_data.username, form_data.password)
+    if outcome is LoginOutcome.LOCKED:
         raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
 
-    user = await UserService.login_user(session, form_data.username, form_data.password)
     if user:
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-
-        access_token = create_access_token(
-            data={"sub": user.email, "role": str(user.role.name)},
-            expires_delta=access_token_expires
-        )
-
-        return {"access_token": access_token, "token_type": "bearer"}
+        refresh_token = await TokenService.issue_refresh_token(session, user.id)
+        await session.commit()
+        return _token_response(user, refresh_token)
     raise HTTPException(status_code=401, detail="Incorrect email or password.")
 
-@router.post("/login/", include_in_schema=False, response_model=TokenResponse, tags=["Login and Registration"])
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
-        raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
+@router.post("/token/refresh", response_model=TokenResponse, name="refresh_token", tags=["Login and Registration"])
+async def refresh_token(body: RefreshTokenRequest, session: AsyncSession = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
 
-    user = await UserService.login_user(session, form_data.username, form_data.password)
-    if user:
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    Refresh tokens are single use: the presented token is consumed, and presenting it again
+    revokes every token descended from the same login.
+    """
+    rotated = await TokenService.rotate_refresh_token(session, body.refresh_token)
+    if not rotated:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token.", headers={"WWW-Authenticate": "Bearer"})
+    user, new_refresh_token = rotated
+    return _token_response(user, new_refresh_token)
+
+@router.post("/logout/", status_code=status.HTTP_204_NO_CONTENT, name="logout", tags=["Login and Registration"])
+async def logout(token: str = Depends(oauth2_scheme), current_user: dict = Depends(get_current_user), session: AsyncSession = Depends(get_db)):
+    """Revoke the access token used for this request so it is rejected until it expires."""
+    claims = decode_token(token, use_cache=False)
+    if claims and claims.get("jti"):
+        expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+        await revocation_list.revoke(session, claims["jti"], expires_at)
+    token_cache.invalidate(token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-        access_token = create_access_token(
-            data={"sub": user.email, "role": str(user.role.name)},
-            expires_delta=access_token_expires
-        )
+@router.get("/.well-known/jwks.json", name="jwks", tags=["Login and Registration"])
+async def jwks(response: Response):
+    """
+    Publish the public keys that verify access tokens, as a JSON Web Key Set.
 
-        return {"access_token": access_token, "token_type": "bearer"}
-    raise HTTPException(status_code=401, detail="Incorrect email or password.")
+    Downstream services pick the key matching a token's `kid` header and verify tokens
+    locally. The set is empty when tokens are signed with a shared HMAC secret.
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return key_ring.jwks()
+
+def _token_response(user, refresh_token: str) -> dict:
+    access_token = create_access_token(
+        data={"sub": str(user.id), "email": user.email, "role": str(user.role.name)},
+        expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
+    )
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
 
 
 @router.get("/verify-email/{user_id}/{token}", status_code=status.HTTP_200_OK, name="verify_email", tags=["Login and Registration"])
@@ -255,21 +497,25 @@ async def update_profile(
     user_id: UUID,
     profile_update: UserUpdate,
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    current_user_record: User = Depends(get_current_user_record),
     email_service: EmailService = Depends(get_email_service)
 ):
-    """Update user's own profile information."""
-    if current_user.get("role") not in ["ADMIN", "MANAGER"] and str(user_id) != str(current_user.get("id")):
+    """Update user's own profile information. Honours `If-Match` like PUT /users/{user_id}."""
+    if current_user.get("role") not in ["ADMIN", "MANAGER"] and user_id != current_user_record.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Can only update your own profile"
         )
     
     user_data = profile_update.model_dump(exclude_unset=True)
-    updated_user = await UserService.update_profile(db, user_id, user_data)
+    updated_user = await UserService.update_profile(db, user_id, user_data, user=current_user_record,
+                                                    expected_versions=if_match_versions(request.headers.get("If-Match")))
     if not updated_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    response.headers["ETag"] = make_etag(updated_user.version)
     
     # Enhanced email notification with field changes
     try:
@@ -301,6 +547,7 @@ async def update_profile(
         linkedin_profile_url=updated_user.linkedin_profile_url,
         role=updated_user.role,
         is_professional=updated_user.is_professional,
+        version=updated_user.version,
         links=create_user_links(updated_user.id, request)
     )
 
@@ -313,6 +560,7 @@ async def update_professional_status(
     user_id: UUID,
     status: bool,
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"])),
     email_service: EmailService = Depends(get_email_service)
@@ -323,10 +571,13 @@ async def update_professional_status(
     Parameters:
     - user_id: UUID of the user to update
     - status: Boolean indicating professional status (true/false)
+
+    Honours `If-Match` like PUT /users/{user_id}.
     """
-    user = await UserService.update_professional_status(db, user_id, status)
+    user = await UserService.update_professional_status(db, user_id, status, if_match_versions(request.headers.get("If-Match")))
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    response.headers["ETag"] = make_etag(user.version)
     
     # Send notification email
     await email_service.send_user_email(
@@ -347,6 +598,7 @@ async def update_professional_status(
         linkedin_profile_url=user.linkedin_profile_url,
         role=user.role,
         is_professional=user.is_professional,
+        version=user.version,
         links=create_user_links(user.id, request)
     )
 
@@ -356,7 +608,7 @@ async def update_professional_status(
     description="Get user profile activity statistics")
 async def get_user_statistics(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
     """Get user profile statistics. Only available to admins and managers."""
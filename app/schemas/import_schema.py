@@ -0,0 +1,28 @@
+from builtins import int, str
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+from app.models.import_model import ImportStatus
+
+class ImportRowError(BaseModel):
+    row_number: int = Field(..., example=42, description="1-based data row number, not counting the header")
+    email: Optional[str] = Field(None, example="john.doe@example.com")
+    error: str = Field(..., example="email: value is not a valid email address")
+
+    class Config:
+        from_attributes = True
+
+class UserImportReport(BaseModel):
+    id: UUID = Field(..., description="Pass as `import_id` to resume an interrupted import")
+    source: Optional[str] = Field(None, example="tenant-users.csv")
+    status: ImportStatus
+    rows_processed: int = Field(..., example=250000)
+    imported_count: int = Field(..., example=249812)
+    failed_count: int = Field(..., example=188)
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    errors: List[ImportRowError] = Field(default_factory=list)
+
+    class Config:
+        from_attributes = True
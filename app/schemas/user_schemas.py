@@ -1,4 +1,4 @@
-from builtins import ValueError, any, bool, str
+from builtins import ValueError, all, any, bool, str, sum
 from pydantic import BaseModel, EmailStr, Field, validator, root_validator
 from typing import Optional, List
 from datetime import datetime
@@ -6,6 +6,7 @@ from enum import Enum
 import uuid
 import re
 from app.models.user_model import UserRole
+from app.schemas.pagination_schema import PaginationLink
 from app.utils.nickname_gen import generate_nickname
 
 
@@ -60,6 +61,55 @@ class UserResponse(UserBase):
     nickname: Optional[str] = Field(None, min_length=3, pattern=r'^[\w-]+$', example=generate_nickname())    
     is_professional: Optional[bool] = Field(default=False, example=True)
     role: UserRole
+    version: Optional[int] = Field(None, example=3, description="Row version; the user's ETag is this number in double quotes.")
+
+class UserBatchGetRequest(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, example=[uuid.uuid4(), uuid.uuid4()])
+
+class UserBatchGetItem(BaseModel):
+    id: uuid.UUID = Field(..., example=uuid.uuid4())
+    found: bool = Field(..., example=True)
+    user: Optional[UserResponse] = Field(None, description="The user, or null when no user has this id.")
+
+class UserBatchGetResponse(BaseModel):
+    items: List[UserBatchGetItem] = Field(..., description="One entry per requested id, in request order.")
+
+class UserBulkFilter(BaseModel):
+    role: Optional[UserRole] = Field(None, example="AUTHENTICATED")
+    email_verified: Optional[bool] = Field(None, example=True)
+    is_locked: Optional[bool] = Field(None, example=True)
+    is_professional: Optional[bool] = Field(None, example=False)
+
+    @root_validator(pre=True)
+    def check_at_least_one_criterion(cls, values):
+        if all(values.get(field) is None for field in cls.model_fields):
+            raise ValueError("At least one filter criterion must be provided")
+        return values
+
+class UserBulkChanges(BaseModel):
+    is_locked: Optional[bool] = Field(None, example=False)
+    role: Optional[UserRole] = Field(None, example="MANAGER")
+    is_professional: Optional[bool] = Field(None, example=True)
+
+    @root_validator(pre=True)
+    def check_exactly_one_change(cls, values):
+        if sum(values.get(field) is not None for field in cls.model_fields) != 1:
+            raise ValueError("Exactly one of is_locked, role or is_professional must be provided")
+        return values
+
+class UserBulkUpdateRequest(BaseModel):
+    ids: Optional[List[uuid.UUID]] = Field(None, min_length=1, example=[uuid.uuid4(), uuid.uuid4()])
+    filter: Optional[UserBulkFilter] = Field(None, description="Select the users by criteria instead of by id.")
+    changes: UserBulkChanges = Field(..., description="The one mutation applied to every selected user.")
+
+    @root_validator(pre=True)
+    def check_one_target(cls, values):
+        if (values.get("ids") is None) == (values.get("filter") is None):
+            raise ValueError("Provide either ids or filter, not both")
+        return values
+
+class UserBulkUpdateResponse(BaseModel):
+    affected: int = Field(..., example=12, description="Number of users whose data actually changed.")
 
 class LoginRequest(BaseModel):
     email: str = Field(..., example="john.doe@example.com")
@@ -78,6 +128,9 @@ class UserListResponse(BaseModel):
         "linkedin_profile_url": "https://linkedin.com/in/johndoe", 
         "github_profile_url": "https://github.com/johndoe"
     }])
-    total: int = Field(..., example=100)
-    page: int = Field(..., example=1)
+    total: Optional[int] = Field(None, example=100, description="Total number of users; omitted when the client asked for count=none.")
+    page: Optional[int] = Field(None, example=1, description="Page number; not set for cursor pagination.")
     size: int = Field(..., example=10)
+    links: List[PaginationLink] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="Cursor of the following page, for cursor pagination.")
+    prev_cursor: Optional[str] = Field(None, description="Cursor of the preceding page, for cursor pagination.")
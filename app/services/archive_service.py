@@ -0,0 +1,156 @@
+from builtins import classmethod, int, len, list, max
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import List, Optional
+from sqlalchemy import and_, delete, func, null, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_settings
+from app.models.system_model import TableRowCount
+from app.models.user_model import ArchivedUser, User, UserRole
+from app.services.user_service import UserService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+USER_COLUMNS = [column.name for column in User.__table__.columns]
+
+class RestoreOutcome(Enum):
+    RESTORED = "restored"
+    NOT_FOUND = "not_found"
+    CONFLICT = "conflict"  # an archived user's email or nickname was taken in the meantime
+
+class UserArchiveService:
+    """
+    Keeps the hot `users` table small by moving dormant rows to `users_archive`.
+
+    A batch takes users soft-deleted before one cutoff and, only if an inactivity cutoff is given,
+    live non-admin users who have not logged in (or, if they never did, registered) before it.
+    Such dormant users are restored by their next login, and their emails cannot sign up again. Each batch is a single
+    DELETE ... RETURNING feeding an INSERT into the archive, committed on its own, so the job
+    can be stopped and rerun at any point. Rows being changed concurrently are skipped and
+    picked up by the next run. Archiving a user drops its refresh tokens with the row.
+    """
+
+    @staticmethod
+    def cutoffs(deleted_after_days: Optional[int] = None, inactive_after_days: Optional[int] = None):
+        """The (deleted_before, inactive_before) cutoffs for the given ages, defaulting to the settings."""
+        now = datetime.now(timezone.utc)
+        deleted_days = settings.archive_deleted_after_days if deleted_after_days is None else deleted_after_days
+        inactive_days = settings.archive_inactive_after_days if inactive_after_days is None else inactive_after_days
+        return now - timedelta(days=deleted_days), (now - timedelta(days=inactive_days) if inactive_days is not None else None)
+
+    @classmethod
+    async def archive_batch(
+        cls,
+        session: AsyncSession,
+        deleted_before: datetime,
+        inactive_before: Optional[datetime] = None,
+        batch_size: int = 1000,
+        after: Optional[uuid.UUID] = None,
+    ) -> List[uuid.UUID]:
+        """
+        Move up to `batch_size` archivable users with ids above `after` to `users_archive` and
+        commit; returns the ids moved.
+
+        Candidates are taken in id order, so a run that passes on the largest id moved scans the
+        table once in all, without an index on `last_login_at`.
+        """
+        archivable = and_(User.deleted_at.is_not(None), User.deleted_at < deleted_before)
+        if inactive_before is not None:
+            inactive = and_(
+                User.deleted_at.is_(None),
+                User.role != UserRole.ADMIN,
+                or_(User.last_login_at < inactive_before, and_(User.last_login_at.is_(None), User.created_at < inactive_before)),
+            )
+            archivable = or_(archivable, inactive)
+        if after is not None:
+            archivable = and_(User.id > after, archivable)
+        batch = select(User.id).where(archivable).order_by(User.id).limit(batch_size).with_for_update(skip_locked=True)
+        moved = delete(User).where(User.id.in_(batch.scalar_subquery())).returning(*User.__table__.columns).cte("moved")
+        # Inactive users were still live, so they leave the cached count too
+        moved_live = select(func.count()).select_from(moved).where(moved.c.deleted_at.is_(None)).scalar_subquery()
+        counted = (
+            update(TableRowCount)
+            .where(TableRowCount.table_name == User.__tablename__)
+            .values(row_count=TableRowCount.row_count - moved_live)
+            .cte("counted")
+        )
+        archive = (
+            insert(ArchivedUser)
+            .from_select(USER_COLUMNS, select(*(moved.c[name] for name in USER_COLUMNS)))
+            .returning(ArchivedUser.id)
+            .add_cte(counted)
+        )
+        try:
+            result = await session.execute(archive)
+            archived = list(result.scalars().all())
+            await session.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while archiving users: {e}")
+            await session.rollback()
+            raise
+        return archived
+
+    @classmethod
+    async def run(cls, session: AsyncSession, deleted_before: datetime, inactive_before: Optional[datetime] = None, batch_size: Optional[int] = None) -> int:
+        """Archive batches until one comes back short; returns the total number of users moved."""
+        batch_size = batch_size or settings.archive_batch_size
+        total, after = 0, None
+        while True:
+            archived = await cls.archive_batch(session, deleted_before, inactive_before, batch_size, after)
+            total += len(archived)
+            if len(archived) < batch_size:
+                break
+            after = max(archived)
+        logger.info(f"Archived {total} users.")
+        return total
+
+    @classmethod
+    async def restore_dormant(cls, session: AsyncSession, email: str) -> RestoreOutcome:
+        """Restore the user archived for inactivity under `email`, as its next login does."""
+        result = await session.execute(
+            select(ArchivedUser.id).where(ArchivedUser.email == email, ArchivedUser.deleted_at.is_(None))
+            .order_by(ArchivedUser.archived_at.desc()).limit(1)
+        )
+        archived_id = result.scalar()
+        if archived_id is None:
+            return RestoreOutcome.NOT_FOUND
+        return await cls.restore(session, archived_id)
+
+    @classmethod
+    async def restore(cls, session: AsyncSession, user_id: uuid.UUID) -> RestoreOutcome:
+        """
+        Bring a soft-deleted or archived user back to life.
+
+        A soft-deleted user is restored in place. An archived user is moved back into `users` with
+        one DELETE ... RETURNING feeding an INSERT, which fails as a whole, leaving the archive
+        untouched, if its email or nickname now belongs to someone else.
+        """
+        undeleted = await session.execute(
+            update(User).where(User.id == user_id, User.deleted_at.is_not(None))
+            .values(deleted_at=None, version=User.version + 1).returning(User.id)
+        )
+        if undeleted.first() is None:
+            restored = delete(ArchivedUser).where(ArchivedUser.id == user_id).returning(*ArchivedUser.__table__.columns).cte("restored")
+            changed = {"deleted_at": null(), "version": restored.c.version + 1}
+            values = [changed[name].label(name) if name in changed else restored.c[name] for name in USER_COLUMNS]
+            try:
+                async with session.begin_nested():
+                    result = await session.execute(
+                        insert(User).from_select(USER_COLUMNS, select(*values)).returning(User.id)
+                    )
+                    found = result.first() is not None
+            except IntegrityError as e:
+                logger.info(f"Cannot restore user {user_id}: {e.orig}")
+                await session.rollback()
+                return RestoreOutcome.CONFLICT
+            if not found:
+                await session.rollback()
+                return RestoreOutcome.NOT_FOUND
+        await UserService.adjust_cached_count(session, 1)
+        await session.commit()
+        return RestoreOutcome.RESTORED
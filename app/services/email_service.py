@@ -1,11 +1,25 @@
 # email_service.py
-from builtins import ValueError, dict, str
+from builtins import Exception, ValueError, dict, len, range, str
+import asyncio
+import logging
+from typing import List
 from settings.config import settings
 from app.utils.smtp_connection import SMTPClient
 from app.utils.template_manager import TemplateManager
 from app.models.user_model import User
 
+logger = logging.getLogger(__name__)
+
 class EmailService:
+    SUBJECTS = {
+        'email_verification': "Verify Your Account",
+        'password_reset': "Password Reset Instructions",
+        'account_locked': "Account Locked Notification",
+        'account_unlocked': "Account Unlocked Notification",
+        'role_changed': "Your Role Has Changed",
+        'professional_status': "Professional Status Update",
+    }
+
     def __init__(self, template_manager: TemplateManager):
         self.smtp_client = SMTPClient(
             server=settings.smtp_server,
@@ -16,17 +30,33 @@ class EmailService:
         self.template_manager = template_manager
 
     async def send_user_email(self, user_data: dict, email_type: str):
-        subject_map = {
-            'email_verification': "Verify Your Account",
-            'password_reset': "Password Reset Instructions",
-            'account_locked': "Account Locked Notification"
-        }
-
-        if email_type not in subject_map:
+        if email_type not in self.SUBJECTS:
             raise ValueError("Invalid email type")
 
         html_content = self.template_manager.render_template(email_type, **user_data)
-        self.smtp_client.send_email(subject_map[email_type], html_content, user_data['email'])
+        await asyncio.to_thread(self.smtp_client.send_email, self.SUBJECTS[email_type], html_content, user_data['email'])
+
+    async def send_user_emails(self, users_data: List[dict], email_type: str, batch_size: int = 50) -> int:
+        """Send one email of `email_type` to each user, `batch_size` emails per SMTP connection.
+
+        Each batch is sent in a worker thread so the event loop is not blocked; a failed batch is
+        logged and the remaining batches are still sent. Returns how many emails were sent.
+        """
+        if email_type not in self.SUBJECTS:
+            raise ValueError("Invalid email type")
+
+        subject = self.SUBJECTS[email_type]
+        sent = 0
+        for start in range(0, len(users_data), batch_size):
+            batch = [
+                (subject, self.template_manager.render_template(email_type, **user_data), user_data['email'])
+                for user_data in users_data[start:start + batch_size]
+            ]
+            try:
+                sent += await asyncio.to_thread(self.smtp_client.send_emails, batch)
+            except Exception as e:
+                logger.error(f"Failed to send a batch of {len(batch)} {email_type} emails: {e}")
+        return sent
 
     async def send_verification_email(self, user: User):
         verification_url = f"{settings.server_base_url}verify-email/{user.id}/{user.verification_token}"
@@ -34,4 +64,4 @@ class EmailService:
             "name": user.first_name,
             "verification_url": verification_url,
             "email": user.email
-        }, 'email_verification')
\ No newline at end of file
+        }, 'email_verification')
@@ -0,0 +1,235 @@
+from builtins import Exception, ValueError, dict, enumerate, int, isinstance, iter, len, list, next, range, set, str, sum, zip
+import csv
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_settings
+from app.models.import_model import ImportStatus, UserImport, UserImportError
+from app.models.user_model import User, UserRole
+from app.schemas.user_schemas import UserCreate
+from app.services.user_service import UserService
+from app.utils.security import generate_verification_token, import_password_hasher
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# asyncpg sends at most 32767 bind parameters with one statement
+MAX_BIND_PARAMS = 32767
+
+class UserImportService:
+    """
+    Loads users in bulk from CSV or NDJSON, for onboarding tenants with many existing accounts.
+
+    The file is read row by row and handled in batches of `import_batch_size` rows. Each batch is
+    validated with `UserCreate`, hashed on the import's own password pool, given nicknames with a few
+    availability queries, and written with a single multi-row INSERT. The batch commits together
+    with the import's progress, so a failed import resumes after its last committed batch.
+    Rows that cannot be imported are recorded as `UserImportError`s rather than failing the import.
+    Imported users start unverified; no verification emails are sent.
+    """
+
+    @classmethod
+    async def start(cls, session: AsyncSession, source: Optional[str] = None) -> UserImport:
+        job = UserImport(source=source, status=ImportStatus.RUNNING)
+        session.add(job)
+        await session.commit()
+        return job
+
+    @classmethod
+    async def resume(cls, session: AsyncSession, job: UserImport) -> bool:
+        """Mark a failed import RUNNING again; False if it is already running or has completed."""
+        result = await session.execute(
+            update(UserImport)
+            .where(UserImport.id == job.id, UserImport.status == ImportStatus.FAILED)
+            .values(status=ImportStatus.RUNNING, finished_at=None)
+            .returning(UserImport.id)
+        )
+        resumed = result.first() is not None
+        await session.commit()
+        if resumed:
+            await session.refresh(job)
+        return resumed
+
+    @classmethod
+    async def get(cls, session: AsyncSession, import_id: uuid.UUID) -> Optional[UserImport]:
+        return await session.get(UserImport, import_id)
+
+    @classmethod
+    async def errors(cls, session: AsyncSession, import_id: uuid.UUID, limit: Optional[int] = None) -> List[UserImportError]:
+        query = select(UserImportError).where(UserImportError.import_id == import_id).order_by(UserImportError.row_number).limit(limit)
+        result = await session.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    def read_rows(lines: Iterable[str], format: str = "csv") -> Iterator[Union[Dict[str, Optional[str]], ValueError]]:
+        """
+        Parse `lines` lazily into one dict per data row.
+
+        `csv` expects a header row. `ndjson` expects one JSON object per line and skips blank
+        lines; a line that is not an object yields a ValueError in its place, so it is reported
+        as a rejected row without stopping the import.
+        """
+        if format == "csv":
+            yield from csv.DictReader(lines)
+            return
+        if format != "ndjson":
+            raise ValueError(f"Unsupported import format: {format}")
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"invalid JSON: {e}")
+                continue
+            if not isinstance(row, dict):
+                yield ValueError("line is not a JSON object")
+                continue
+            yield {key: None if value is None else str(value) for key, value in row.items()}
+
+    @classmethod
+    async def run(cls, session: AsyncSession, job: UserImport, lines: Iterable[str], batch_size: Optional[int] = None, format: str = "csv") -> UserImport:
+        """
+        Import the rows in `lines`, CSV with a header or NDJSON (see `read_rows`), skipping the
+        rows `job` already processed.
+
+        Raises whatever stopped the import after marking the job FAILED; committed batches stay.
+        """
+        batch_size = batch_size or settings.import_batch_size
+        job.status = ImportStatus.RUNNING
+        batch: List[Tuple[int, Dict[str, Optional[str]]]] = []
+        try:
+            for row_number, row in enumerate(cls.read_rows(lines, format), start=1):
+                if row_number <= job.rows_processed:
+                    continue
+                batch.append((row_number, row))
+                if len(batch) >= batch_size:
+                    await cls._import_batch(session, job, batch)
+                    batch = []
+            if batch:
+                await cls._import_batch(session, job, batch)
+            job.status = ImportStatus.COMPLETED
+            job.finished_at = datetime.now(timezone.utc)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            await session.refresh(job)
+            job.status = ImportStatus.FAILED
+            job.finished_at = datetime.now(timezone.utc)
+            await session.commit()
+            logger.exception(f"User import {job.id} failed after {job.rows_processed} rows.")
+            raise
+        return job
+
+    @staticmethod
+    def _validate(row: Union[Dict[str, Optional[str]], ValueError]) -> UserCreate:
+        if isinstance(row, ValueError):
+            raise row
+        if None in row:
+            raise ValueError("row has more columns than the header")
+        data = {key.strip(): value.strip() for key, value in row.items() if value is not None and value.strip()}
+        data.setdefault("role", UserRole.ANONYMOUS.name)
+        user = UserCreate(**data)
+        if user.role == UserRole.ADMIN:
+            raise ValueError("ADMIN accounts cannot be imported")
+        return user
+
+    @staticmethod
+    def _describe(error: Exception) -> str:
+        if isinstance(error, ValidationError):
+            return "; ".join(f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors())
+        return str(error)
+
+    @classmethod
+    async def _import_batch(cls, session: AsyncSession, job: UserImport, batch: List[Tuple[int, Dict[str, Optional[str]]]]):
+        errors: List[UserImportError] = []
+
+        def reject(row_number: int, email: Optional[str], error: str):
+            errors.append(UserImportError(import_id=job.id, row_number=row_number, email=email, error=error[:1000]))
+
+        valid: List[Tuple[int, UserCreate]] = []
+        seen_emails = set()
+        for row_number, row in batch:
+            try:
+                user = cls._validate(row)
+            except (ValidationError, ValueError) as e:
+                reject(row_number, row.get("email") if isinstance(row, dict) else None, cls._describe(e))
+                continue
+            if user.email in seen_emails:
+                reject(row_number, user.email, "email appears more than once in the file")
+                continue
+            seen_emails.add(user.email)
+            valid.append((row_number, user))
+
+        # Dormant archived users keep their email, as on signup; their next login restores them
+        archived_emails = await UserService.archived_emails(session, [user.email for _, user in valid])
+        for row_number, user in valid:
+            if user.email in archived_emails:
+                reject(row_number, user.email, "email belongs to an archived account")
+        valid = [(row_number, user) for row_number, user in valid if user.email not in archived_emails]
+
+        hashed_passwords = await import_password_hasher.hash_many([user.password for _, user in valid])
+        pending = [
+            (row_number, user, hashed_password, user.nickname is not None)
+            for (row_number, user), hashed_password in zip(valid, hashed_passwords)
+        ]
+
+        imported = 0
+        for _ in range(settings.nickname_max_attempts):
+            if not pending:
+                break
+            generated = iter(await UserService.allocate_nicknames(session, sum(1 for *_, own in pending if not own)))
+            rows = []
+            for row_number, user, hashed_password, own_nickname in pending:
+                nickname = user.nickname if own_nickname else next(generated, None)
+                if nickname is None:
+                    reject(row_number, user.email, "no free nickname available")
+                    continue
+                rows.append(dict(
+                    user.model_dump(exclude={"password", "nickname"}),
+                    id=uuid.uuid4(), nickname=nickname, hashed_password=hashed_password,
+                    verification_token=generate_verification_token(), email_verified=False,
+                    is_professional=False, failed_login_attempts=0, is_locked=False,
+                ))
+            if not rows:
+                break
+            # One bind parameter per value: split the INSERT to stay under the driver's limit
+            rows_per_insert = MAX_BIND_PARAMS // len(rows[0])
+            inserted = set()
+            for start in range(0, len(rows), rows_per_insert):
+                chunk = rows[start:start + rows_per_insert]
+                result = await session.execute(insert(User).values(chunk).on_conflict_do_nothing().returning(User.email))
+                inserted.update(result.scalars().all())
+            imported += len(inserted)
+
+            # Rows skipped by ON CONFLICT collided on email or nickname; only generated nicknames are retried
+            attempted = {row["email"] for row in rows}
+            skipped = [entry for entry in pending if entry[1].email in attempted and entry[1].email not in inserted]
+            registered = set()
+            if skipped:
+                existing = await session.execute(select(User.email).where(User.email.in_([user.email for _, user, _, _ in skipped])))
+                registered = set(existing.scalars().all())
+            pending = []
+            for row_number, user, hashed_password, own_nickname in skipped:
+                if user.email in registered:
+                    reject(row_number, user.email, "email is already registered")
+                elif own_nickname:
+                    reject(row_number, user.email, "nickname is already taken")
+                else:
+                    pending.append((row_number, user, hashed_password, own_nickname))
+        for row_number, user, _, _ in pending:
+            reject(row_number, user.email, "no free nickname available")
+
+        session.add_all(errors)
+        await UserService.adjust_cached_count(session, imported)
+        job.rows_processed = batch[-1][0]
+        job.imported_count += imported
+        job.failed_count += len(errors)
+        await session.commit()
+        logger.info(f"User import {job.id}: {job.rows_processed} rows processed, {job.imported_count} imported.")
@@ -1,8 +1,91 @@
 # app/services/jwt_service.py
-from builtins import dict, str
+from builtins import bool, dict, int, str
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
 import jwt
 from datetime import datetime, timedelta
 from settings.config import settings
+from app.utils.jwt_keys import KeyRing
+
+class TokenClaimsCache:
+    """
+    Bounded LRU cache of verified JWT claims, keyed by the SHA-256 digest of the token.
+
+    Clients reuse the same bearer token for every request until it expires, so verifying the
+    signature and parsing the payload again each time is wasted work. An entry is dropped as
+    soon as the token's `exp` passes, so the cache never extends a token's lifetime.
+    """
+
+    def __init__(self, max_size: int, enabled: bool = True):
+        self.max_size = max_size
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: dict):
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+key_ring = KeyRing(
+    algorithm=settings.jwt_algorithm,
+    secret=settings.jwt_secret_key,
+    keys_dir=settings.jwt_keys_dir,
+    active_kid=settings.jwt_active_kid,
+    reload_interval=settings.jwt_key_reload_interval_seconds,
+)
+token_cache = TokenClaimsCache(max_size=settings.jwt_cache_size, enabled=settings.jwt_cache_enabled)
 
 def create_access_token(*, data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -11,12 +94,31 @@ def create_access_token(*, data: dict, expires_delta: timedelta = None):
         to_encode['role'] = to_encode['role'].upper()
     expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=settings.access_token_expire_minutes))
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    kid, signing_key = key_ring.signing_key()
+    headers = {"kid": kid} if kid else None
+    encoded_jwt = jwt.encode(to_encode, signing_key, algorithm=key_ring.algorithm, headers=headers)
     return encoded_jwt
 
-def decode_token(token: str):
+def decode_token(token: str, use_cache: bool = True):
+    """
+    Verify a token and return its claims, or None if it is invalid or expired.
+
+    Verified claims are served from `token_cache` when it is enabled. Callers that must see
+    the token's current state, such as revocation checks, pass `use_cache=False`.
+    """
+    cache_enabled = use_cache and token_cache.enabled
+    if cache_enabled:
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
     try:
-        decoded = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return decoded
+        verification_key = key_ring.verification_key(jwt.get_unverified_header(token).get("kid"))
+        if verification_key is None:
+            return None
+        decoded = jwt.decode(token, verification_key, algorithms=[key_ring.algorithm])
     except jwt.PyJWTError:
         return None
+    if cache_enabled:
+        token_cache.put(token, decoded)
+    return decoded
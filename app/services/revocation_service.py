@@ -0,0 +1,111 @@
+from builtins import Exception, bool, dict, int, len, max, str
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.token_model import RevokedToken
+from app.utils.bloom_filter import BloomFilter
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+class RevocationList:
+    """
+    In-process mirror of the `revoked_tokens` table.
+
+    Lookups first consult a Bloom filter, which answers "not revoked" for almost every token
+    without touching the exact set; only filter hits are confirmed against the set. Nothing on
+    the request path queries the database. Revocations made by other worker processes become
+    visible after the next `sync`.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, sync_overlap_seconds: int = 60):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_overlap = timedelta(seconds=sync_overlap_seconds)
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._exact: dict = {}  # jti -> expiry of the revoked token
+        self._last_sync: Optional[datetime] = None
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or jti not in self._bloom:
+            return False
+        return jti in self._exact
+
+    def add(self, jti: str, expires_at: datetime):
+        if jti in self._exact:
+            return
+        if self._bloom.is_full:
+            self._rebuild({**self._exact, jti: expires_at})
+        else:
+            self._bloom.add(jti)
+            self._exact[jti] = expires_at
+
+    def _rebuild(self, entries: dict):
+        # Bloom filters cannot forget items, so shrinking or growing means starting over
+        bloom = BloomFilter(max(self.capacity, len(entries) * 2), self.error_rate)
+        for jti in entries:
+            bloom.add(jti)
+        self._bloom, self._exact = bloom, dict(entries)
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Forget revocations of tokens that have expired anyway; returns how many were dropped."""
+        now = now or datetime.now(timezone.utc)
+        live = {jti: expires_at for jti, expires_at in self._exact.items() if expires_at > now}
+        pruned = len(self._exact) - len(live)
+        if pruned:
+            self._rebuild(live)
+        return pruned
+
+    async def revoke(self, session: AsyncSession, jti: str, expires_at: datetime):
+        """Persist a revocation and apply it to this process immediately; revoking twice is a no-op."""
+        await session.execute(insert(RevokedToken).values(jti=jti, expires_at=expires_at).on_conflict_do_nothing())
+        await session.commit()
+        self.add(jti, expires_at)
+
+    async def sync(self, session: AsyncSession):
+        """
+        Load revocations recorded since the last sync, or all live ones on the first call.
+
+        `revoked_at` is the inserting transaction's start time, so a revocation can commit after a
+        sync that already looked past its timestamp. Each sync therefore re-reads an overlap window
+        before the previous watermark, which is taken from the database clock rather than ours.
+        """
+        synced_at = (await session.execute(select(func.now()))).scalar_one()
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > synced_at)
+        if self._last_sync is not None:
+            query = query.where(RevokedToken.revoked_at >= self._last_sync - self.sync_overlap)
+        for jti, expires_at in (await session.execute(query)).all():
+            self.add(jti, expires_at)
+        self._last_sync = synced_at
+
+    async def purge_expired(self, session: AsyncSession) -> int:
+        """Delete revocations of tokens that have expired anyway, and forget every expired one held in memory."""
+        now = datetime.now(timezone.utc)
+        result = await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await session.commit()
+        # Other workers may have deleted rows this process still holds, so prune by expiry rather than by what was deleted
+        self.prune(now)
+        return result.rowcount
+
+    async def run_maintenance(self, session_factory, interval: int):
+        """Background loop that keeps the mirror in sync and purges expired entries."""
+        while True:
+            try:
+                async with session_factory() as session:
+                    await self.sync(session)
+                    purged = await self.purge_expired(session)
+                    if purged:
+                        logger.info(f"Purged {purged} expired token revocations.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Token revocation maintenance failed: {e}")
+            await asyncio.sleep(interval)
+
+revocation_list = RevocationList(
+    settings.revocation_bloom_capacity, settings.revocation_bloom_error_rate, settings.revocation_sync_overlap_seconds
+)
@@ -0,0 +1,105 @@
+from builtins import classmethod, str
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import secrets
+import uuid
+from typing import Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_settings
+from app.models.token_model import RefreshToken
+from app.models.user_model import User
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class TokenService:
+    """Issues and rotates refresh tokens so clients can renew access tokens without a password."""
+
+    @staticmethod
+    def _hash(raw_token: str) -> str:
+        return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
+
+    @classmethod
+    async def issue_refresh_token(cls, session: AsyncSession, user_id: UUID, family_id: Optional[UUID] = None) -> str:
+        """
+        Create a refresh token for the user and return its raw value.
+
+        The token is added to the session but not committed, so it lands in the caller's transaction.
+        """
+        raw_token = secrets.token_urlsafe(32)
+        session.add(RefreshToken(
+            user_id=user_id,
+            family_id=family_id or uuid.uuid4(),
+            token_hash=cls._hash(raw_token),
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=settings.refresh_token_expire_minutes),
+        ))
+        return raw_token
+
+    @classmethod
+    async def rotate_refresh_token(cls, session: AsyncSession, raw_token: str) -> Optional[Tuple[User, str]]:
+        """
+        Exchange a refresh token for a new one.
+
+        The presented token is consumed with one conditional UPDATE on the unique `token_hash`
+        index, so two concurrent exchanges of the same token cannot both succeed. If the token
+        was already used, its whole family is revoked.
+
+        :return: The token's owner and the raw successor token, or None if the token is not usable.
+        """
+        now = datetime.now(timezone.utc)
+        token_hash = cls._hash(raw_token)
+        query = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+            .execution_options(synchronize_session=False)
+        )
+        consumed = (await session.execute(query)).first()
+        if consumed is None:
+            await cls._revoke_family_on_reuse(session, token_hash, now)
+            return None
+
+        user = await session.get(User, consumed.user_id)
+        if user is None or user.is_locked or user.deleted_at is not None:
+            await session.rollback()
+            return None
+        new_token = await cls.issue_refresh_token(session, user.id, consumed.family_id)
+        await session.commit()
+        return user, new_token
+
+    @classmethod
+    async def _revoke_family_on_reuse(cls, session: AsyncSession, token_hash: str, now: datetime):
+        result = await session.execute(
+            select(RefreshToken.family_id).where(RefreshToken.token_hash == token_hash, RefreshToken.used_at.is_not(None))
+        )
+        family_id = result.scalar()
+        if family_id is None:
+            await session.rollback()
+            return
+        logger.warning(f"Refresh token reuse detected, revoking token family {family_id}.")
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+    @classmethod
+    async def revoke_user_tokens(cls, session: AsyncSession, user_id: UUID):
+        """Revoke every outstanding refresh token of the user. The caller commits."""
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
@@ -1,25 +1,86 @@
-from builtins import Exception, bool, classmethod, int, str
+from builtins import Exception, bool, classmethod, int, list, set, str
 from datetime import datetime, timezone
+from enum import Enum
+from functools import lru_cache
 import secrets
-from typing import Optional, Dict, List
+from typing import Any, AsyncIterator, NamedTuple, Optional, Dict, List, Sequence, Tuple
 from pydantic import ValidationError
-from sqlalchemy import func, null, update, select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Integer, and_, any_, bindparam, case, delete, exists, func, literal, null, or_, text, tuple_, update, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as UUID_TYPE, insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_email_service, get_settings
-from app.models.user_model import User
+from app.models.system_model import AppBootstrap, TableRowCount
+from app.models.token_model import RefreshToken
+from app.models.user_model import USER_LIST_SORTS, ArchivedUser, User
 from app.schemas.user_schemas import UserCreate, UserUpdate
-from app.utils.nickname_gen import generate_nickname
-from app.utils.security import generate_verification_token, hash_password, verify_password
+from app.utils.cursor import NEXT, PREV, PageCursor
+from app.utils.etag import VersionMismatch
+from app.utils.nickname_gen import generate_nickname_candidates
+from app.utils.security import PasswordHashQueueFull, generate_verification_token, hash_password_async, verify_password_async
 from uuid import UUID
 from app.services.email_service import EmailService
+from app.services.token_service import TokenService
 from app.models.user_model import UserRole
 import logging
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+class LoginOutcome(Enum):
+    """Result of a single login attempt."""
+    SUCCESS = "SUCCESS"
+    INVALID_CREDENTIALS = "INVALID_CREDENTIALS"
+    LOCKED = "LOCKED"
+    ARCHIVED = "ARCHIVED"  # the account was archived for inactivity; restore it and try again
+
+class CountStrategy(str, Enum):
+    """How `UserService.count` obtains the number of users."""
+    EXACT = "exact"          # SELECT count(*): always right, costs a full scan
+    ESTIMATED = "estimated"  # planner statistics: free, as fresh as the last ANALYZE
+    CACHED = "cached"        # counter maintained by create and delete
+    NONE = "none"            # don't count at all
+
+class KeysetPage(NamedTuple):
+    """A page of users read with keyset pagination, with cursors to its neighbours (None at either end)."""
+    items: List[User]
+    next_cursor: Optional[PageCursor]
+    prev_cursor: Optional[PageCursor]
+
+# Columns that may leave the service in bulk; secrets such as password hashes never do
+EXPORT_COLUMNS = (
+    "id", "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url",
+    "linkedin_profile_url", "github_profile_url", "role", "is_professional", "professional_status_updated_at",
+    "last_login_at", "failed_login_attempts", "is_locked", "email_verified", "created_at", "updated_at",
+)
+
+SEARCH_COLUMNS = ("nickname", "email", "first_name", "last_name")
+BULK_UPDATE_FIELDS = ("is_locked", "role", "is_professional")
+# Soft-deleted users stay in `users` until archived; every lookup below is limited to live rows
+LIVE_USERS = User.deleted_at.is_(None)
+
+# The hot statements are built once with bound parameters and reused. A reused construct keeps
+# its memoized cache key, so each call skips rebuilding the SELECT and re-deriving the key, and
+# the unchanged SQL text lets asyncpg reuse its prepared statement on every connection.
+COUNT_LIVE_USERS = select(func.count()).select_from(User).where(LIVE_USERS)
+USERS_BY_IDS = select(User).where(User.id == any_(bindparam("ids", type_=ARRAY(UUID_TYPE(as_uuid=True)))), LIVE_USERS)
+
+@lru_cache(maxsize=None)
+def _lookup_statement(columns: Tuple[str, ...]):
+    """SELECT of the live user matching bound values for `columns`."""
+    return select(User).where(LIVE_USERS, *(getattr(User, column) == bindparam(column) for column in columns))
+
+class SearchMode(str, Enum):
+    """How `UserService.search_users` matches the search text."""
+    PREFIX = "prefix"  # a column starts with the text
+    FUZZY = "fuzzy"    # trigram similarity with pg_trgm, substring match without it
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 class UserService:
+    _trigram_search: Optional[bool] = None
     @classmethod
     async def _execute_query(cls, session: AsyncSession, query):
         try:
@@ -31,16 +92,36 @@ class UserService:
             await session.rollback()
             return None
 
+    @classmethod
+    async def _execute_read(cls, session: AsyncSession, query, params: Optional[Dict[str, Any]] = None):
+        """Run a read without committing, binding `params` to the query's bound parameters.
+
+        On a read-only session this runs in autocommit mode. Inside a write operation the read
+        joins the operation's transaction, which the operation commits once at the end.
+        """
+        try:
+            return await session.execute(query, params)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {e}")
+            await session.rollback()
+            return None
+
     @classmethod
     async def _fetch_user(cls, session: AsyncSession, **filters) -> Optional[User]:
-        query = select(User).filter_by(**filters)
-        result = await cls._execute_query(session, query)
+        query = _lookup_statement(tuple(sorted(filters)))
+        result = await cls._execute_read(session, query, filters)
         return result.scalars().first() if result else None
 
     @classmethod
     async def get_by_id(cls, session: AsyncSession, user_id: UUID) -> Optional[User]:
         return await cls._fetch_user(session, id=user_id)
 
+    @classmethod
+    async def get_many(cls, session: AsyncSession, user_ids: Sequence[UUID]) -> Dict[UUID, User]:
+        """Fetch the users with the given ids in one `WHERE id = ANY(:ids)` query, keyed by id; missing ids are absent."""
+        result = await cls._execute_read(session, USERS_BY_IDS, {"ids": list(dict.fromkeys(user_ids))})
+        return {user.id: user for user in result.scalars().all()} if result else {}
+
     @classmethod
     async def get_by_nickname(cls, session: AsyncSession, nickname: str) -> Optional[User]:
         return await cls._fetch_user(session, nickname=nickname)
@@ -57,93 +138,495 @@ class UserService:
             if existing_user:
                 logger.error("User with given email already exists.")
                 return None
-            validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
+            if await cls.is_archived_email(session, validated_data['email']):
+                logger.error("User with given email is archived; logging in restores it.")
+                return None
+            validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
             new_user = User(**validated_data)
-            new_nickname = generate_nickname()
-            while await cls.get_by_nickname(session, new_nickname):
-                new_nickname = generate_nickname()
-            new_user.nickname = new_nickname
-            logger.info(f"User Role: {new_user.role}")
-            user_count = await cls.count(session)
-            new_user.role = UserRole.ADMIN if user_count == 0 else UserRole.ANONYMOUS            
-            if new_user.role == UserRole.ADMIN:
-                new_user.email_verified = True
-
-            else:
-                new_user.verification_token = generate_verification_token()
-                await email_service.send_verification_email(new_user)
+            new_user.role = UserRole.ANONYMOUS
+            new_user.verification_token = generate_verification_token()
 
-            session.add(new_user)
+            if not await cls._insert_with_nickname(session, new_user):
+                return None
+            if await cls._claim_first_admin(session, new_user.id):
+                new_user.role = UserRole.ADMIN
+                new_user.email_verified = True
+                new_user.verification_token = None
+            logger.info(f"User Role: {new_user.role}")
+            await cls.adjust_cached_count(session, 1)
             await session.commit()
+            # Only after the commit: the transaction is not held open across the SMTP round trip
+            if new_user.verification_token:
+                try:
+                    await email_service.send_verification_email(new_user)
+                except Exception as e:
+                    logger.error(f"Failed to send the verification email to user {new_user.id}: {e}")
             return new_user
         except ValidationError as e:
             logger.error(f"Validation error during user creation: {e}")
             return None
 
     @classmethod
-    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str]) -> Optional[User]:
+    async def is_archived_email(cls, session: AsyncSession, email: str) -> bool:
+        """Whether `email` belongs to a dormant user, archived for inactivity rather than deleted."""
+        return bool(await cls.archived_emails(session, [email]))
+
+    @classmethod
+    async def archived_emails(cls, session: AsyncSession, emails: Sequence[str]) -> set:
+        """Those of `emails` that belong to dormant archived users; see `is_archived_email`."""
+        if not emails:
+            return set()
+        result = await session.execute(
+            select(ArchivedUser.email).where(ArchivedUser.email.in_(list(emails)), ArchivedUser.deleted_at.is_(None))
+        )
+        return set(result.scalars().all())
+
+    @classmethod
+    async def _claim_first_admin(cls, session: AsyncSession, user_id: UUID) -> bool:
+        """
+        Claim the singleton bootstrap row for `user_id`, in the caller's transaction.
+
+        Only the very first user can claim it. If other users already exist, the row is
+        claimed with no admin, which marks the database as bootstrapped. Once the row
+        exists, the INSERT conflicts on its primary key and does nothing. A concurrent
+        signup waits on that key until the first one commits, so there is never a second admin.
+        """
+        admin_id = case((exists().where(User.id != user_id), null()), else_=literal(user_id, UUID_TYPE))
+        claim = (
+            insert(AppBootstrap)
+            .from_select(["id", "admin_user_id"], select(literal(1), admin_id))
+            .on_conflict_do_nothing(index_elements=[AppBootstrap.id])
+            .returning(AppBootstrap.admin_user_id)
+        )
+        result = await session.execute(claim)
+        return result.scalar_one_or_none() == user_id
+
+    @classmethod
+    async def allocate_nickname(cls, session: AsyncSession) -> Optional[str]:
+        """Pick one free nickname; see `allocate_nicknames`."""
+        nicknames = await cls.allocate_nicknames(session, 1)
+        return nicknames[0] if nicknames else None
+
+    @classmethod
+    async def allocate_nicknames(cls, session: AsyncSession, count: int) -> List[str]:
+        """
+        Pick `count` distinct free nicknames, checking each round of random candidates with a single query.
+
+        Returns fewer than `count` if `nickname_max_attempts` rounds could not find enough, which only
+        happens when the nickname space is nearly full and the vocabulary should be extended.
+        """
+        chosen: List[str] = []
+        for _ in range(settings.nickname_max_attempts):
+            needed = count - len(chosen)
+            if needed <= 0:
+                break
+            candidates = generate_nickname_candidates(max(settings.nickname_candidate_batch, 2 * needed))
+            result = await cls._execute_read(session, select(User.nickname).where(User.nickname.in_(candidates)))
+            if result is None:
+                break
+            taken = set(result.scalars().all()).union(chosen)
+            chosen.extend([candidate for candidate in candidates if candidate not in taken][:needed])
+        if len(chosen) < count:
+            logger.error("Not enough free nicknames found; extend the nickname vocabulary.")
+        return chosen
+
+    @classmethod
+    async def _insert_with_nickname(cls, session: AsyncSession, new_user: User) -> bool:
+        """
+        Give `new_user` a free nickname and flush its INSERT inside a savepoint.
+
+        A concurrent registration can claim the same nickname between the availability check and
+        the insert; the unique index then rejects ours, the savepoint is rolled back, and we retry
+        with a fresh nickname. Other integrity errors (a duplicate email) are not retried.
+        """
+        for _ in range(settings.nickname_max_attempts):
+            new_user.nickname = await cls.allocate_nickname(session)
+            if new_user.nickname is None:
+                return False
+            try:
+                async with session.begin_nested():
+                    session.add(new_user)
+            except IntegrityError as e:
+                if "nickname" not in str(e.orig):
+                    logger.error(f"Could not insert user: {e.orig}")
+                    return False
+                logger.info(f"Nickname {new_user.nickname} was taken concurrently, retrying.")
+                continue
+            return True
+        return False
+
+    @classmethod
+    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str], expected_versions: Optional[Sequence[int]] = None) -> Optional[User]:
+        """
+        Update a user with one conditional UPDATE ... RETURNING; see `_conditional_update`.
+
+        Raises VersionMismatch when `expected_versions` (from If-Match) does not include the user's version.
+        """
         try:
             # validated_data = UserUpdate(**update_data).dict(exclude_unset=True)
             validated_data = UserUpdate(**update_data).model_dump(exclude_unset=True)
 
             if 'password' in validated_data:
-                validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
-            query = update(User).where(User.id == user_id).values(**validated_data).execution_options(synchronize_session="fetch")
-            await cls._execute_query(session, query)
-            updated_user = await cls.get_by_id(session, user_id)
+                validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
+            updated_user = await cls._conditional_update(session, user_id, validated_data, expected_versions)
             if updated_user:
-                session.refresh(updated_user)  # Explicitly refresh the updated user object
                 logger.info(f"User {user_id} updated successfully.")
                 return updated_user
             else:
                 logger.error(f"User {user_id} not found after update attempt.")
             return None
+        except (PasswordHashQueueFull, VersionMismatch):
+            raise
         except Exception as e:  # Broad exception handling for debugging
             logger.error(f"Error during user update: {e}")
             return None
 
+    @classmethod
+    async def _conditional_update(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        changes: Dict[str, Any],
+        expected_versions: Optional[Sequence[int]] = None,
+        **extra_values,
+    ) -> Optional[User]:
+        """
+        Apply `changes` (and `extra_values`, such as timestamps) to a live user and bump its version,
+        in one UPDATE ... RETURNING that refreshes the user in the identity map.
+
+        With `expected_versions` the UPDATE also requires `WHERE version = :v`, so of two concurrent
+        edits made against the same version only the first succeeds. A user already holding the values
+        of `changes` is not rewritten. Only when no row comes back is the user read, to tell a missing
+        user (None) from a version mismatch (VersionMismatch) and from an unchanged user (returned as is).
+        """
+        where = [User.id == user_id, LIVE_USERS]
+        if changes:
+            where.append(or_(*(getattr(User, column).is_distinct_from(value) for column, value in changes.items())))
+        if expected_versions is not None:
+            where.append(User.version == expected_versions[0] if len(expected_versions) == 1 else User.version.in_(expected_versions))
+        query = (
+            update(User).where(*where).values(**changes, **extra_values, version=User.version + 1)
+            .returning(User).execution_options(populate_existing=True)
+        )
+        result = await cls._execute_query(session, query)
+        if result is None:
+            return None
+        user = result.scalars().first()
+        if user is not None:
+            return user
+        user = await session.get(User, user_id, populate_existing=True)
+        if user is None or user.deleted_at is not None:
+            return None
+        if expected_versions is not None and user.version not in expected_versions:
+            raise VersionMismatch(user.version)
+        return user
+
     @classmethod
     async def delete(cls, session: AsyncSession, user_id: UUID) -> bool:
-        user = await cls.get_by_id(session, user_id)
-        if not user:
+        """
+        Soft-delete a user in a single statement: stamping `deleted_at`, revoking the user's refresh
+        tokens and adjusting the cached count run as data-modifying CTEs of one query, so nothing is
+        loaded first. The row stays restorable until the archival job moves it to `users_archive`;
+        until then its email and nickname remain taken.
+        """
+        deleted = (
+            update(User).where(User.id == user_id, LIVE_USERS)
+            .values(deleted_at=func.now(), version=User.version + 1)
+            .returning(User.id)
+            .cte("deleted")
+        )
+        deleted_count = select(func.count()).select_from(deleted).scalar_subquery()
+        counted = (
+            update(TableRowCount)
+            .where(TableRowCount.table_name == User.__tablename__)
+            .values(row_count=TableRowCount.row_count - deleted_count)
+            .cte("counted")
+        )
+        revoked = (
+            update(RefreshToken)
+            .where(RefreshToken.user_id.in_(select(deleted.c.id)), RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+            .cte("revoked")
+        )
+        result = await cls._execute_query(session, select(deleted_count).add_cte(counted, revoked))
+        if not result or not result.scalar():
             logger.info(f"User with ID {user_id} not found.")
             return False
-        await session.delete(user)
-        await session.commit()
         return True
 
     @classmethod
-    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> List[User]:
-        query = select(User).offset(skip).limit(limit)
+    async def bulk_update(
+        cls,
+        session: AsyncSession,
+        changes: Dict[str, Any],
+        user_ids: Optional[Sequence[UUID]] = None,
+        conditions: Sequence[Any] = (),
+        actor_id: Optional[UUID] = None,
+    ) -> Optional[List[Any]]:
+        """
+        Apply `changes` (columns from `BULK_UPDATE_FIELDS`) to the users with `user_ids`, or to
+        those matching `conditions`, in one set-based UPDATE ... RETURNING.
+
+        The acting user (`actor_id`) is never among the targets, and a bulk lock skips admins.
+        Rows that already hold the new values are left alone, so the result lists only the users
+        actually changed, as (id, email, first_name) rows. Returns None on a database error.
+        """
+        unknown = set(changes) - set(BULK_UPDATE_FIELDS)
+        if not changes or unknown:
+            raise ValueError(f"Cannot bulk update {', '.join(sorted(unknown)) or 'nothing'}")
+        if user_ids is None and not conditions:
+            raise ValueError("A bulk update needs user ids or filter conditions")
+
+        where = [LIVE_USERS, *conditions]
+        if actor_id is not None:
+            where.append(User.id != actor_id)
+        if changes.get("is_locked"):
+            where.append(User.role != UserRole.ADMIN)
+        if user_ids is not None:
+            ids = bindparam("ids", list(dict.fromkeys(user_ids)), type_=ARRAY(UUID_TYPE(as_uuid=True)))
+            where.append(User.id == any_(ids))
+        where.append(or_(*(getattr(User, field).is_distinct_from(value) for field, value in changes.items())))
+
+        values = dict(changes, version=User.version + 1)
+        if changes.get("is_locked") is False:
+            values["failed_login_attempts"] = 0
+        if "is_professional" in changes:
+            values["professional_status_updated_at"] = func.now()
+        query = (
+            update(User).where(*where).values(**values)
+            .returning(User.id, User.email, User.first_name)
+        )
         result = await cls._execute_query(session, query)
+        return result.all() if result else None
+
+    @classmethod
+    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10, sort: str = "created_at", conditions: Sequence[Any] = ()) -> List[User]:
+        """
+        Read a page of users ordered by `sort` (a `USER_LIST_SORTS` column, prefixed with "-" for
+        descending), with `id` as tie-breaker so pages are deterministic.
+        """
+        if conditions:
+            query, params = cls.list_users_query(sort, conditions).offset(skip).limit(limit), None
+        else:
+            query, params = cls._page_statement(sort), {"skip": skip, "limit": limit}
+        result = await cls._execute_read(session, query, params)
         return result.scalars().all() if result else []
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _page_statement(cls, sort: str):
+        """The unfiltered page query for `sort`, built once with bound offset and limit."""
+        return cls.list_users_query(sort).offset(bindparam("skip", type_=Integer)).limit(bindparam("limit", type_=Integer))
+
+    @classmethod
+    def list_users_query(cls, sort: str = "created_at", conditions: Sequence[Any] = ()):
+        """The unpaginated SELECT behind `list_users`."""
+        return select(User).where(LIVE_USERS, *conditions).order_by(*cls.sort_order(sort))
+
+    @staticmethod
+    def sort_order(sort: str) -> List[Any]:
+        """ORDER BY clauses for a whitelisted sort key such as "nickname" or "-created_at"."""
+        descending = sort.startswith("-")
+        column = sort.lstrip("-")
+        if column not in USER_LIST_SORTS:
+            raise ValueError(f"Cannot sort users by {column}")
+        keys = [getattr(User, column)]
+        if not User.__table__.c[column].unique:
+            keys.append(User.id)  # tie-breaker for a deterministic order
+        return [key.desc() for key in keys] if descending else keys
+
+    @staticmethod
+    def filter_conditions(
+        role: Optional[UserRole] = None,
+        email_verified: Optional[bool] = None,
+        is_locked: Optional[bool] = None,
+        is_professional: Optional[bool] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> List[Any]:
+        """Translate the user list filters into WHERE conditions; filters left as None are not applied."""
+        conditions = []
+        if role is not None:
+            conditions.append(User.role == role)
+        if email_verified is not None:
+            conditions.append(User.email_verified == email_verified)
+        if is_locked is not None:
+            conditions.append(User.is_locked == is_locked)
+        if is_professional is not None:
+            conditions.append(User.is_professional == is_professional)
+        if created_after is not None:
+            conditions.append(User.created_at >= created_after)
+        if created_before is not None:
+            conditions.append(User.created_at < created_before)
+        return conditions
+
+    @classmethod
+    async def trigram_search_available(cls, session: AsyncSession) -> bool:
+        """Whether the database has pg_trgm; checked once per process."""
+        if cls._trigram_search is None:
+            result = await cls._execute_read(session, text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"))
+            if result is None:
+                return False
+            cls._trigram_search = bool(result.scalar())
+        return cls._trigram_search
+
+    @classmethod
+    async def search_users(
+        cls,
+        session: AsyncSession,
+        text_query: str,
+        mode: SearchMode = SearchMode.PREFIX,
+        conditions: Sequence[Any] = (),
+        skip: int = 0,
+        limit: int = 10,
+    ) -> List[User]:
+        """
+        Find users whose nickname, email, first or last name matches `text_query`.
+
+        Prefix matching uses ILIKE 'text%', which the pg_trgm GIN indexes serve. Fuzzy matching
+        uses the trigram similarity operator and ranks by best similarity. Without pg_trgm it
+        falls back to a case-insensitive substring match, which is correct but unindexed.
+        """
+        columns = [getattr(User, column) for column in SEARCH_COLUMNS]
+        escaped = _like_escape(text_query)
+        query = select(User).where(LIVE_USERS, *conditions)
+        if mode == SearchMode.FUZZY and await cls.trigram_search_available(session):
+            query = query.where(or_(*(column.op("%")(text_query) for column in columns)))
+            query = query.order_by(func.greatest(*(func.similarity(column, text_query) for column in columns)).desc(), User.id)
+        else:
+            pattern = f"{escaped}%" if mode == SearchMode.PREFIX else f"%{escaped}%"
+            query = query.where(or_(*(column.ilike(pattern, escape="\\") for column in columns)))
+            query = query.order_by(User.nickname)
+        result = await cls._execute_read(session, query.offset(skip).limit(limit))
+        return result.scalars().all() if result else []
+
+    @classmethod
+    async def export_rows(cls, session: AsyncSession, columns: Sequence[str], conditions: Sequence[Any] = (), chunk_size: int = 1000) -> AsyncIterator[List[Tuple]]:
+        """
+        Stream the selected `columns` of matching users in chunks of up to `chunk_size` rows.
+
+        Rows come from a server-side cursor as plain tuples, so memory stays constant however
+        large the table is. The session must be able to open a transaction, which asyncpg
+        cursors require; autocommit read sessions cannot be used.
+        """
+        query = (
+            select(*(getattr(User, column) for column in columns))
+            .where(LIVE_USERS, *conditions)
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async with session.begin():
+            result = await session.stream(query)
+            async for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+
+    @classmethod
+    async def list_users_keyset(cls, session: AsyncSession, limit: int = 10, cursor: Optional[PageCursor] = None, conditions: Sequence[Any] = ()) -> KeysetPage:
+        """
+        Read a page of users ordered by (created_at, id), starting after or before `cursor`.
+
+        The page is located with a row comparison on the `ix_users_created_at_id` index rather than
+        OFFSET, so reading page 10,000 costs the same as reading page 1. One extra row is fetched
+        to learn whether another page exists in the reading direction.
+        """
+        key = tuple_(User.created_at, User.id)
+        query = select(User).where(LIVE_USERS, *conditions)
+        if cursor is not None and cursor.direction == PREV:
+            query = query.where(key < tuple_(cursor.created_at, cursor.id)).order_by(User.created_at.desc(), User.id.desc())
+        else:
+            if cursor is not None:
+                query = query.where(key > tuple_(cursor.created_at, cursor.id))
+            query = query.order_by(User.created_at, User.id)
+        result = await cls._execute_read(session, query.limit(limit + 1))
+        users = list(result.scalars().all()) if result else []
+        has_more = len(users) > limit
+        users = users[:limit]
+
+        if cursor is not None and cursor.direction == PREV:
+            users.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = cursor is not None, has_more
+        if not users:
+            return KeysetPage(users, None, None)
+        first, last = users[0], users[-1]
+        return KeysetPage(
+            items=users,
+            next_cursor=PageCursor(last.created_at, last.id, NEXT) if has_next else None,
+            prev_cursor=PageCursor(first.created_at, first.id, PREV) if has_prev else None,
+        )
+
     @classmethod
     async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service) -> Optional[User]:
         return await cls.create(session, user_data, get_email_service)
     
 
+    @classmethod
+    async def attempt_login(cls, session: AsyncSession, email: str, password: str) -> Tuple[LoginOutcome, Optional[User]]:
+        """
+        Check a login attempt and record its outcome.
+
+        The credential row is read once, and the outcome is written back with a single atomic
+        UPDATE ... RETURNING that either resets the failure counter and stamps `last_login_at`
+        or increments the counter and locks the account once `max_login_attempts` is reached.
+        Doing the increment in SQL keeps concurrent failed attempts from overwriting each other.
+
+        An unknown email that belongs to a dormant archived user yields `LoginOutcome.ARCHIVED`
+        once the password matches the archived hash; the caller restores the user and tries again.
+        A wrong password leaves the archive untouched.
+
+        :return: The outcome and, on success, the refreshed user.
+        """
+        result = await session.execute(select(User).where(User.email == email, LIVE_USERS))
+        user = result.scalars().first()
+        if user is None:
+            archived = await session.execute(
+                select(ArchivedUser.hashed_password).where(ArchivedUser.email == email, ArchivedUser.deleted_at.is_(None))
+                .order_by(ArchivedUser.archived_at.desc()).limit(1)
+            )
+            hashed_password = archived.scalar()
+            if hashed_password is not None and await verify_password_async(password, hashed_password):
+                return LoginOutcome.ARCHIVED, None
+            return LoginOutcome.INVALID_CREDENTIALS, None
+        if user.is_locked:
+            return LoginOutcome.LOCKED, None
+        if user.email_verified is False:
+            return LoginOutcome.INVALID_CREDENTIALS, None
+
+        if await verify_password_async(password, user.hashed_password):
+            outcome = LoginOutcome.SUCCESS
+            values = {"failed_login_attempts": 0, "last_login_at": datetime.now(timezone.utc)}
+        else:
+            outcome = LoginOutcome.INVALID_CREDENTIALS
+            attempts = func.coalesce(User.failed_login_attempts, 0) + 1
+            locks = and_(attempts >= settings.max_login_attempts, User.is_locked.is_not(True))
+            values = {
+                "failed_login_attempts": attempts,
+                "is_locked": case((attempts >= settings.max_login_attempts, True), else_=User.is_locked),
+                # Login bookkeeping leaves the version alone; locking the account is a real change
+                "version": case((locks, User.version + 1), else_=User.version),
+            }
+        query = (
+            update(User)
+            .where(User.id == user.id)
+            .values(**values)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await session.execute(query)
+            user = result.scalars().first()
+            await session.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error while recording login attempt: {e}")
+            await session.rollback()
+            return LoginOutcome.INVALID_CREDENTIALS, None
+        return outcome, (user if outcome is LoginOutcome.SUCCESS else None)
+
     @classmethod
     async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[User]:
-        user = await cls.get_by_email(session, email)
-        if user:
-            if user.email_verified is False:
-                return None
-            if user.is_locked:
-                return None
-            if verify_password(password, user.hashed_password):
-                user.failed_login_attempts = 0
-                user.last_login_at = datetime.now(timezone.utc)
-                session.add(user)
-                await session.commit()
-                return user
-            else:
-                user.failed_login_attempts += 1
-                if user.failed_login_attempts >= settings.max_login_attempts:
-                    user.is_locked = True
-                session.add(user)
-                await session.commit()
-        return None
+        _, user = await cls.attempt_login(session, email, password)
+        return user
 
     @classmethod
     async def is_account_locked(cls, session: AsyncSession, email: str) -> bool:
@@ -153,13 +636,14 @@ class UserService:
 
     @classmethod
     async def reset_password(cls, session: AsyncSession, user_id: UUID, new_password: str) -> bool:
-        hashed_password = hash_password(new_password)
+        hashed_password = await hash_password_async(new_password)
         user = await cls.get_by_id(session, user_id)
         if user:
             user.hashed_password = hashed_password
             user.failed_login_attempts = 0  # Resetting failed login attempts
             user.is_locked = False  # Unlocking the user account, if locked
             session.add(user)
+            await TokenService.revoke_user_tokens(session, user_id)
             await session.commit()
             return True
         return False
@@ -177,17 +661,89 @@ class UserService:
         return False
 
     @classmethod
-    async def count(cls, session: AsyncSession) -> int:
+    async def count(cls, session: AsyncSession, strategy: CountStrategy = CountStrategy.EXACT, conditions: Sequence[Any] = ()) -> Optional[int]:
         """
         Count the number of users in the database.
 
         :param session: The AsyncSession instance for database access.
-        :return: The count of users.
+        :param strategy: How to obtain the count; see `CountStrategy`.
+        :param conditions: Filters to count under. The estimated and cached counts only know the
+            table size, so filtered counts are always exact.
+        :return: The count of users, or None for `CountStrategy.NONE`.
+        """
+        if strategy == CountStrategy.NONE:
+            return None
+        if strategy == CountStrategy.ESTIMATED and not conditions:
+            estimate = await cls._estimated_count(session)
+            if estimate is not None:
+                return estimate
+        elif strategy == CountStrategy.CACHED and not conditions:
+            return await cls._cached_count(session)
+        query = COUNT_LIVE_USERS.where(*conditions) if conditions else COUNT_LIVE_USERS
+        result = await cls._execute_read(session, query)
+        return result.scalar() if result else 0
+
+    @classmethod
+    async def _estimated_count(cls, session: AsyncSession) -> Optional[int]:
+        """Row estimate from pg_class, or None while the table has never been vacuumed or analyzed.
+
+        The estimate includes soft-deleted users not yet archived.
+        """
+        query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)").bindparams(table=User.__tablename__)
+        result = await cls._execute_read(session, query)
+        estimate = result.scalar() if result else None
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    @classmethod
+    async def _cached_count(cls, session: AsyncSession) -> int:
+        """Read the maintained count of live users, or an exact count if the counter was never seeded."""
+        result = await cls._execute_read(session, select(TableRowCount.row_count).where(TableRowCount.table_name == User.__tablename__))
+        cached = result.scalar() if result else None
+        if cached is not None:
+            return cached
+        # The migration seeds the counter; reseeding locks `users`, so it is left to `seed_cached_count`
+        logger.warning("The cached user count is not seeded; run `python -m app.cli seed-user-count`.")
+        result = await cls._execute_read(session, COUNT_LIVE_USERS)
+        return result.scalar() if result else 0
+
+    @classmethod
+    async def seed_cached_count(cls, session: AsyncSession) -> int:
+        """
+        (Re)seed the maintained count of live users from an exact count and commit; returns it.
+
+        `users` is locked against writes while it is counted, so no insert or delete can land
+        between the count and the seed and leave the counter off for good. That blocks signups,
+        logins and deletes for the length of a full count, so this is an operator task, never
+        run on the request path.
+        """
+        seed = insert(TableRowCount).from_select(
+            ["table_name", "row_count"], select(literal(User.__tablename__), COUNT_LIVE_USERS.scalar_subquery())
+        )
+        seed = seed.on_conflict_do_update(
+            index_elements=[TableRowCount.table_name],
+            set_={"row_count": seed.excluded.row_count, "updated_at": func.now()},
+        ).returning(TableRowCount.row_count)
+        try:
+            await session.execute(text(f"LOCK TABLE {User.__tablename__} IN SHARE MODE"))
+            seeded = (await session.execute(seed)).scalar_one()
+            await session.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Could not seed the cached user count: {e}")
+            await session.rollback()
+            raise
+        return seeded
+
+    @classmethod
+    async def adjust_cached_count(cls, session: AsyncSession, delta: int):
+        """Move the cached user count by `delta` within the caller's transaction.
+
+        Does nothing until the counter has been seeded, so it never starts from a wrong base.
         """
-        query = select(func.count()).select_from(User)
-        result = await session.execute(query)
-        count = result.scalar()
-        return count
+        await session.execute(
+            update(TableRowCount)
+            .where(TableRowCount.table_name == User.__tablename__)
+            .values(row_count=TableRowCount.row_count + delta)
+        )
     
     @classmethod
     async def unlock_user_account(cls, session: AsyncSession, user_id: UUID) -> bool:
@@ -219,19 +775,27 @@ class UserService:
         return True
 
     @classmethod
-    async def update_profile(cls, session: AsyncSession, user_id: UUID, profile_data: dict) -> Optional[User]:
-        """Update user profile information with statistics"""
+    async def update_profile(cls, session: AsyncSession, user_id: UUID, profile_data: dict, user: Optional[User] = None, expected_versions: Optional[Sequence[int]] = None) -> Optional[User]:
+        """Update user profile information with statistics.
+
+        Pass `user` when the caller already holds the row (e.g. the request's own user) to skip the lookup.
+        Raises VersionMismatch when the user is not at one of `expected_versions`, or when it changes
+        between loading and flushing, which the mapper's version check detects.
+        """
         try:
             # Validate URLs first
             cls.validate_profile_urls(profile_data)
             
             # Continue with existing update logic
-            user = await cls.get_by_id(session, user_id)
+            if user is None or user.id != user_id:
+                user = await cls.get_by_id(session, user_id)
             if not user:
                 return None
+            if expected_versions is not None and user.version not in expected_versions:
+                raise VersionMismatch(user.version)
             
             # Update statistics
-            user.profile_updates_count = (user.profile_updates_count or 0) + 1
+            user.profile_updates_count += 1
             user.last_profile_update = func.now()
             
             # Only update allowed fields
@@ -245,26 +809,21 @@ class UserService:
             session.add(user)
             await session.commit()
             return user
+        except StaleDataError:
+            await session.rollback()
+            current = await session.get(User, user_id, populate_existing=True)
+            raise VersionMismatch(current.version if current else 0)
         except Exception as e:
             await session.rollback()
             raise e
 
     @classmethod
-    async def update_professional_status(cls, session: AsyncSession, user_id: UUID, status: bool) -> Optional[User]:
-        """Update user's professional status"""
-        try:
-            user = await cls.get_by_id(session, user_id)
-            if not user:
-                return None
-            
-            user.is_professional = status
-            user.professional_status_updated_at = func.now()
-            session.add(user)
-            await session.commit()
-            return user
-        except Exception as e:
-            await session.rollback()
-            raise e
+    async def update_professional_status(cls, session: AsyncSession, user_id: UUID, status: bool, expected_versions: Optional[Sequence[int]] = None) -> Optional[User]:
+        """Update user's professional status with one conditional UPDATE; see `_conditional_update`."""
+        return await cls._conditional_update(
+            session, user_id, {"is_professional": status}, expected_versions,
+            professional_status_updated_at=func.now(),
+        )
 
     @classmethod
     async def get_user_statistics(cls, session: AsyncSession, user_id: UUID) -> dict:
@@ -274,7 +833,7 @@ class UserService:
             return None
             
         return {
-            "profile_updates_count": user.profile_updates_count or 0,
+            "profile_updates_count": user.profile_updates_count,
             "last_profile_update": user.last_profile_update,
             "professional_status": user.is_professional,
             "professional_status_updated_at": user.professional_status_updated_at
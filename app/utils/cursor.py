@@ -0,0 +1,35 @@
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple
+from uuid import UUID
+
+NEXT = "next"
+PREV = "prev"
+
+class PageCursor(NamedTuple):
+    """Position in a keyset-paginated list: the `(created_at, id)` key of a row and which way to read from it."""
+    created_at: datetime
+    id: UUID
+    direction: str = NEXT
+
+def encode_cursor(cursor: PageCursor) -> str:
+    """Encode a cursor as an opaque URL-safe string."""
+    payload = json.dumps([cursor.created_at.isoformat(), str(cursor.id), cursor.direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str) -> PageCursor:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, user_id, direction = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return PageCursor(datetime.fromisoformat(created_at), UUID(user_id), direction)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
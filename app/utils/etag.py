@@ -0,0 +1,40 @@
+from builtins import Exception, any, int, str
+from typing import List, Optional
+
+class VersionMismatch(Exception):
+    """A conditional update found the user at a different version than the client's If-Match."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"User is at version {current_version}")
+        self.current_version = current_version
+
+def make_etag(version: int) -> str:
+    """The strong ETag of a user at `version`."""
+    return f'"{version}"'
+
+def _entity_tags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+def if_match_versions(header: Optional[str]) -> Optional[List[int]]:
+    """
+    The versions an If-Match header accepts, or None when it sets no version condition (absent or `*`).
+
+    If-Match uses strong comparison, so weak and malformed tags match nothing; a header made only
+    of those yields an empty list, which no version satisfies.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    versions = []
+    for tag in _entity_tags(header):
+        if tag.startswith('"') and tag.endswith('"') and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
+
+def if_none_match_hit(header: Optional[str], version: int) -> bool:
+    """Whether an If-None-Match header matches the current version, using weak comparison."""
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    etag = make_etag(version)
+    return any(tag.removeprefix("W/") == etag for tag in _entity_tags(header))
@@ -0,0 +1,37 @@
+from builtins import str
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Sequence
+from uuid import UUID
+
+
+def plain_value(value: Any) -> Any:
+    """Convert a column value to what JSON and CSV can carry."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_ndjson(rows: Sequence[Sequence[Any]], columns: Sequence[str]) -> str:
+    """Encode rows as newline-delimited JSON objects keyed by `columns`."""
+    return "".join(
+        json.dumps({column: plain_value(value) for column, value in zip(columns, row)}, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Sequence[Any]], columns: Sequence[str], header: bool = False) -> str:
+    """Encode rows as CSV lines, preceded by a header line of `columns` if `header` is set."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([plain_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
@@ -0,0 +1,119 @@
+from builtins import OSError, ValueError, bool, dict, float, isinstance, len, list, object, sorted, str
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512", "EdDSA"}
+
+class KeyRing:
+    """
+    Signing and verification keys for access tokens, selected by the `kid` header.
+
+    With an HMAC algorithm the ring holds just the shared secret. With an asymmetric
+    algorithm it loads every `<kid>.pem` private key from `keys_dir` once and keeps the
+    parsed key objects. New tokens are signed with `active_kid`, or the newest key file if
+    it is not set. Older keys stay valid for verification until their files are removed,
+    which lets keys rotate without invalidating tokens already issued.
+
+    A token with an unknown `kid` makes the ring read `keys_dir` again, so a key added by
+    another instance is picked up without a restart. This happens at most once every
+    `reload_interval` seconds, so forged `kid`s cannot make every request hit the disk.
+
+    Args:
+        algorithm (str): JWT algorithm, e.g. "HS256", "RS256" or "EdDSA".
+        secret (str): Shared secret used with HMAC algorithms.
+        keys_dir (str): Directory holding PEM-encoded private keys for asymmetric algorithms.
+        active_kid (str): Key id used for signing; defaults to the most recently modified key.
+        reload_interval (float): Minimum seconds between reloads triggered by unknown key ids.
+    """
+
+    def __init__(self, algorithm: str, secret: str, keys_dir: str, active_kid: Optional[str] = None, reload_interval: float = 60):
+        self.algorithm = algorithm
+        self.secret = secret
+        self.keys_dir = Path(keys_dir)
+        self.active_kid = active_kid
+        self.reload_interval = reload_interval
+        self._configured_kid = active_kid
+        self._private_keys: Optional[Dict[str, object]] = None
+        self._public_keys: Dict[str, object] = {}
+        self._loaded_at = 0.0
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    def _ensure_loaded(self):
+        if self._private_keys is None:
+            self._load(self.active_kid)
+
+    def _load(self, active_kid: Optional[str]):
+        """Read every key file, replacing the current keys only if all of them parse."""
+        private_keys = {}
+        for path in sorted(self.keys_dir.glob("*.pem"), key=lambda p: p.stat().st_mtime):
+            private_keys[path.stem] = serialization.load_pem_private_key(path.read_bytes(), password=None)
+        if not private_keys:
+            raise ValueError(f"No signing keys found in {self.keys_dir}")
+        active_kid = active_kid or list(private_keys)[-1]
+        if active_kid not in private_keys:
+            raise ValueError(f"Active signing key {active_kid} not found in {self.keys_dir}")
+        self.active_kid = active_kid
+        self._private_keys = private_keys
+        self._public_keys = {kid: key.public_key() for kid, key in private_keys.items()}
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(private_keys)} JWT signing keys, active key {self.active_kid}.")
+
+    def reload(self):
+        """Drop the parsed keys so the key directory is read again on next use."""
+        self.active_kid = self._configured_kid
+        self._private_keys = None
+        self._public_keys = {}
+
+    def signing_key(self) -> Tuple[Optional[str], object]:
+        """Return the `kid` and key used to sign new tokens. The `kid` is None for HMAC."""
+        if not self.is_asymmetric:
+            return None, self.secret
+        self._ensure_loaded()
+        return self.active_kid, self._private_keys[self.active_kid]
+
+    def verification_key(self, kid: Optional[str]) -> Optional[object]:
+        """Return the key that verifies tokens signed with `kid`, or None if it is unknown."""
+        if not self.is_asymmetric:
+            return self.secret
+        self._ensure_loaded()
+        key = self._public_keys.get(kid)
+        if key is None and time.monotonic() - self._loaded_at >= self.reload_interval:
+            logger.info(f"Unknown JWT key id {kid}, reloading keys from {self.keys_dir}.")
+            try:
+                self._load(self._configured_kid)
+            except (OSError, ValueError) as e:  # keep serving the keys already loaded
+                self._loaded_at = time.monotonic()
+                logger.error(f"Reloading JWT keys failed: {e}")
+            key = self._public_keys.get(kid)
+        return key
+
+    def jwks(self) -> dict:
+        """Return the public keys as a JSON Web Key Set. Empty for HMAC algorithms."""
+        if not self.is_asymmetric:
+            return {"keys": []}
+        self._ensure_loaded()
+        return {"keys": [self._to_jwk(kid, key) for kid, key in self._public_keys.items()]}
+
+    def _to_jwk(self, kid: str, public_key) -> dict:
+        if isinstance(public_key, rsa.RSAPublicKey):
+            jwk = jwt.algorithms.RSAAlgorithm.to_jwk(public_key)
+        elif isinstance(public_key, ec.EllipticCurvePublicKey):
+            jwk = jwt.algorithms.ECAlgorithm.to_jwk(public_key)
+        elif isinstance(public_key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)):
+            jwk = jwt.algorithms.OKPAlgorithm.to_jwk(public_key)
+        else:
+            raise ValueError(f"Unsupported key type for {kid}")
+        jwk = json.loads(jwk)
+        jwk.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+        return jwk
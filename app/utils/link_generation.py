@@ -1,11 +1,12 @@
 from builtins import dict, int, max, str
-from typing import List, Callable
-from urllib.parse import urlencode
+from typing import List, Callable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
 from uuid import UUID
 
 from fastapi import Request
 from app.schemas.link_schema import Link
 from app.schemas.pagination_schema import PaginationLink
+from app.utils.cursor import PageCursor, encode_cursor
 
 # Utility function to create a link
 def create_link(rel: str, href: str, method: str = "GET", action: str = None) -> Link:
@@ -14,8 +15,16 @@ def create_link(rel: str, href: str, method: str = "GET", action: str = None) ->
 def create_pagination_link(rel: str, base_url: str, params: dict) -> PaginationLink:
     # Ensure parameters are added in a specific order
     query_string = f"skip={params['skip']}&limit={params['limit']}"
+    extra = {key: value for key, value in params.items() if key not in ("skip", "limit")}
+    if extra:
+        query_string += f"&{urlencode(extra)}"
     return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
 
+def _split_url(request: Request, *drop: str) -> Tuple[str, dict]:
+    """Split the request URL into its base and the query parameters to carry over to page links."""
+    base_url, _, query = str(request.url).partition("?")
+    return base_url, {key: value for key, value in parse_qsl(query) if key not in drop}
+
 def create_user_links(user_id: UUID, request: Request) -> List[Link]:
     """
     Generate navigation links for user actions.
@@ -30,19 +39,42 @@ def create_user_links(user_id: UUID, request: Request) -> List[Link]:
         for rel, action, method, action_desc in actions
     ]
 
-def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
-    base_url = str(request.url)
-    total_pages = (total_items + limit - 1) // limit
+def generate_pagination_links(request: Request, skip: int, limit: int, total_items: Optional[int], page_size: Optional[int] = None) -> List[PaginationLink]:
+    """
+    Build offset pagination links, keeping the request's other query parameters (sort, filters).
+    When the total is unknown there is no "last" link, and "next" is offered whenever the
+    current page (`page_size` items) came back full.
+    """
+    base_url, carried = _split_url(request, "skip", "limit")
     links = [
-        create_pagination_link("self", base_url, {'skip': skip, 'limit': limit}),
-        create_pagination_link("first", base_url, {'skip': 0, 'limit': limit}),
-        create_pagination_link("last", base_url, {'skip': max(0, (total_pages - 1) * limit), 'limit': limit})
+        create_pagination_link("self", base_url, {'skip': skip, 'limit': limit, **carried}),
+        create_pagination_link("first", base_url, {'skip': 0, 'limit': limit, **carried}),
     ]
+    if total_items is not None:
+        total_pages = (total_items + limit - 1) // limit
+        links.append(create_pagination_link("last", base_url, {'skip': max(0, (total_pages - 1) * limit), 'limit': limit, **carried}))
+        has_next = skip + limit < total_items
+    else:
+        has_next = page_size == limit
 
-    if skip + limit < total_items:
-        links.append(create_pagination_link("next", base_url, {'skip': skip + limit, 'limit': limit}))
+    if has_next:
+        links.append(create_pagination_link("next", base_url, {'skip': skip + limit, 'limit': limit, **carried}))
 
     if skip > 0:
-        links.append(create_pagination_link("prev", base_url, {'skip': max(skip - limit, 0), 'limit': limit}))
+        links.append(create_pagination_link("prev", base_url, {'skip': max(skip - limit, 0), 'limit': limit, **carried}))
+
+    return links
+
 
+def generate_cursor_pagination_links(request: Request, limit: int, next_cursor: Optional[PageCursor], prev_cursor: Optional[PageCursor]) -> List[PaginationLink]:
+    """Build self/first/next/prev links for keyset pagination; next and prev carry opaque cursors."""
+    base_url, carried = _split_url(request, "limit", "cursor", "pagination")
+    links = [
+        PaginationLink(rel="self", href=str(request.url)),
+        PaginationLink(rel="first", href=f"{base_url}?{urlencode({'pagination': 'cursor', 'limit': limit, **carried})}"),
+    ]
+    if next_cursor is not None:
+        links.append(PaginationLink(rel="next", href=f"{base_url}?{urlencode({'limit': limit, 'cursor': encode_cursor(next_cursor), **carried})}"))
+    if prev_cursor is not None:
+        links.append(PaginationLink(rel="prev", href=f"{base_url}?{urlencode({'limit': limit, 'cursor': encode_cursor(prev_cursor), **carried})}"))
     return links
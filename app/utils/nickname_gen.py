@@ -1,10 +1,47 @@
-from builtins import str
+from builtins import int, len, range, set, str
 import random
+from typing import List
+from settings.config import settings
+
+ADJECTIVES = (
+    "agile", "amber", "ancient", "azure", "bold", "brave", "breezy", "bright", "brisk", "calm",
+    "candid", "cheerful", "chilly", "clever", "cosmic", "crimson", "curious", "dapper", "daring", "dashing",
+    "dusty", "eager", "electric", "emerald", "fearless", "fluffy", "frosty", "gentle", "gilded", "golden",
+    "graceful", "happy", "hidden", "humble", "icy", "jolly", "keen", "kind", "lively", "lucky",
+    "lunar", "mellow", "merry", "mighty", "misty", "nimble", "noble", "polar", "proud", "quick",
+    "quiet", "rapid", "rustic", "scarlet", "shiny", "silent", "silver", "sly", "snowy", "solar",
+    "spry", "stellar", "sunny", "swift", "tidy", "vivid", "wandering", "wild", "witty", "zesty",
+)
+ANIMALS = (
+    "alpaca", "badger", "beaver", "bison", "bobcat", "camel", "caribou", "cheetah", "cobra", "condor",
+    "coyote", "crane", "dingo", "dolphin", "eagle", "egret", "falcon", "ferret", "finch", "fox",
+    "gazelle", "gecko", "gibbon", "heron", "hippo", "ibex", "iguana", "jackal", "jaguar", "kestrel",
+    "koala", "lemur", "leopard", "lion", "llama", "lynx", "magpie", "marmot", "meerkat", "mink",
+    "moose", "narwhal", "ocelot", "orca", "osprey", "otter", "owl", "panda", "panther", "pelican",
+    "penguin", "puffin", "puma", "quokka", "raccoon", "raven", "seal", "sparrow", "stork", "tapir",
+    "tiger", "toucan", "turtle", "walrus", "weasel", "wolf", "wombat", "yak", "zebra", "zorilla",
+)
+
+
+def _adjectives() -> List[str]:
+    return list(ADJECTIVES) + list(settings.nickname_extra_adjectives)
+
+
+def _animals() -> List[str]:
+    return list(ANIMALS) + list(settings.nickname_extra_animals)
+
+
+def nickname_space_size() -> int:
+    """Number of distinct nicknames `generate_nickname` can produce with the current settings."""
+    return len(set(_adjectives())) * len(set(_animals())) * 10 ** settings.nickname_number_digits
 
 
 def generate_nickname() -> str:
     """Generate a URL-safe nickname using adjectives and animal names."""
-    adjectives = ["clever", "jolly", "brave", "sly", "gentle"]
-    animals = ["panda", "fox", "raccoon", "koala", "lion"]
-    number = random.randint(0, 999)
-    return f"{random.choice(adjectives)}_{random.choice(animals)}_{number}"
+    number = random.randrange(10 ** settings.nickname_number_digits)
+    return f"{random.choice(_adjectives())}_{random.choice(_animals())}_{number}"
+
+
+def generate_nickname_candidates(count: int) -> List[str]:
+    """Generate up to `count` distinct nicknames, to be checked for availability in one query."""
+    return list(dict.fromkeys(generate_nickname() for _ in range(count)))
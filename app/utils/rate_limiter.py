@@ -0,0 +1,77 @@
+from builtins import dict, float, int, len, list, max, str
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from settings.config import settings
+
+
+class SlidingWindowLimiter:
+    """
+    Per-key request limiter using the sliding-window-counter approximation.
+
+    Each key keeps only the counts of the current and previous fixed windows; the rate over
+    the trailing window is estimated by weighting the previous count by how much of it still
+    overlaps. Every check is O(1), and at most `max_keys` keys are tracked, with the least
+    recently seen key evicted first, so memory stays bounded under a flood of distinct keys.
+
+    Args:
+        limit (int): Maximum number of hits allowed per window.
+        window_seconds (int): Length of the window in seconds.
+        max_keys (int): Maximum number of keys tracked at once.
+    """
+
+    def __init__(self, limit: int, window_seconds: int, max_keys: int):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, now: Optional[float] = None) -> Optional[int]:
+        """
+        Record a hit for `key` unless it is over the limit.
+
+        :return: None if the hit is allowed, otherwise the number of seconds to wait before retrying.
+        """
+        now = time.time() if now is None else now
+        window_start = now - (now % self.window_seconds)
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None:
+                entry = [window_start, 0, 0]
+                self._windows[key] = entry
+                if len(self._windows) > self.max_keys:
+                    self._windows.popitem(last=False)
+            else:
+                self._windows.move_to_end(key)
+                if entry[0] != window_start:
+                    # Roll over: the old current window becomes the previous one if adjacent
+                    adjacent = window_start - entry[0] == self.window_seconds
+                    entry[:] = [window_start, 0, entry[1] if adjacent else 0]
+            elapsed = now - window_start
+            estimated = entry[2] * (1 - elapsed / self.window_seconds) + entry[1]
+            if estimated >= self.limit:
+                return max(1, math.ceil(self.window_seconds - elapsed))
+            entry[1] += 1
+            return None
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "window_seconds": self.window_seconds, "tracked_keys": len(self._windows)}
+
+
+login_ip_limiter = SlidingWindowLimiter(
+    limit=settings.login_rate_limit_per_ip,
+    window_seconds=settings.login_rate_window_seconds,
+    max_keys=settings.login_rate_max_keys,
+)
+login_email_limiter = SlidingWindowLimiter(
+    limit=settings.login_rate_limit_per_email,
+    window_seconds=settings.login_rate_window_seconds,
+    max_keys=settings.login_rate_max_keys,
+)
@@ -0,0 +1,54 @@
+from builtins import float, int, str
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from settings.config import settings
+
+
+class RecentWriters:
+    """
+    Remembers which clients wrote recently, so their reads can be pinned to the primary.
+
+    Replicas lag behind the primary; a client that just wrote and immediately reads from a
+    replica may not see its own change. Each write opens a window of `window_seconds` during
+    which `wrote_recently` is true for that client. At most `max_keys` clients are tracked,
+    least recently written first out.
+
+    Args:
+        window_seconds (float): How long reads stay on the primary after a write.
+        max_keys (int): Maximum number of clients tracked at once.
+    """
+
+    def __init__(self, window_seconds: float, max_keys: int):
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._until: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, key: str, now: Optional[float] = None):
+        """Record that `key` just wrote."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._until[key] = now + self.window_seconds
+            self._until.move_to_end(key)
+            while len(self._until) > self.max_keys:
+                self._until.popitem(last=False)
+
+    def wrote_recently(self, key: str, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            until = self._until.get(key)
+            if until is None:
+                return False
+            if until <= now:
+                del self._until[key]
+                return False
+            return True
+
+    def reset(self):
+        with self._lock:
+            self._until.clear()
+
+
+recent_writers = RecentWriters(settings.read_your_writes_window_seconds, settings.read_your_writes_max_keys)
@@ -1,8 +1,14 @@
 # app/security.py
-from builtins import Exception, ValueError, bool, int, str
+from builtins import Exception, RuntimeError, ValueError, bool, dict, int, len, max, range, str
+import asyncio
+import multiprocessing
 import secrets
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
 import bcrypt
 from logging import getLogger
+from settings.config import settings
 
 # Set up logging
 logger = getLogger(__name__)
@@ -49,5 +55,124 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         logger.error("Error verifying password: %s", e)
         raise ValueError("Authentication process encountered an unexpected error") from e
 
+def hash_passwords(passwords: List[str], rounds: int = 12) -> List[str]:
+    """Hash several passwords in one call, so a worker process handles a whole chunk per job."""
+    return [hash_password(password, rounds) for password in passwords]
+
+class PasswordHashQueueFull(RuntimeError):
+    """Raised when too many hashing jobs are already waiting for a worker."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification in a bounded pool of worker processes.
+
+    bcrypt is deliberately slow (hundreds of milliseconds at 12 rounds), so calling it
+    directly from a coroutine stalls the whole event loop. The hasher hands the work to
+    a process pool and rejects new jobs once `max_queue` jobs are in flight, so a login
+    burst degrades into fast 503s instead of an ever-growing backlog.
+
+    Args:
+        max_workers (int): Number of worker processes. 0 runs jobs in a thread pool instead.
+        max_queue (int): Maximum number of jobs in flight (running or waiting).
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.max_workers > 0:
+                # spawn avoids forking a process that is running an event loop and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="password-hasher")
+        return self._executor
+
+    async def _submit(self, func, *args):
+        if self._in_flight >= self.max_queue:
+            self._rejected += 1
+            raise PasswordHashQueueFull("Password hashing queue is full")
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+            self._completed += 1
+            return result
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._total_seconds += time.perf_counter() - started
+
+    async def hash(self, password: str, rounds: int = 12) -> str:
+        """Hash a password without blocking the event loop. See `hash_password`."""
+        return await self._submit(hash_password, password, rounds)
+
+    async def hash_many(self, passwords: List[str], rounds: int = 12) -> List[str]:
+        """Hash a batch of passwords, split into one job per worker so they hash in parallel."""
+        if not passwords:
+            return []
+        chunk_size = -(-len(passwords) // max(1, self.max_workers))
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        results = await asyncio.gather(*(self._submit(hash_passwords, chunk, rounds) for chunk in chunks))
+        return [hashed for chunk in results for hashed in chunk]
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop. See `verify_password`."""
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def metrics(self) -> dict:
+        """Return a snapshot of the hasher's counters."""
+        finished = self._completed + self._failed
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_seconds": self._total_seconds / finished if finished else 0.0,
+        }
+
+    def shutdown(self):
+        """Stop the worker pool. A new one is started lazily on the next job."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+)
+
+# Bulk imports hash on their own pool, so a large import never queues ahead of login verification
+import_password_hasher = PasswordHasher(
+    max_workers=settings.import_password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+)
+
+async def hash_password_async(password: str, rounds: int = 12) -> str:
+    """Async counterpart of `hash_password`, executed on the shared password hasher pool."""
+    return await password_hasher.hash(password, rounds)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Async counterpart of `verify_password`, executed on the shared password hasher pool."""
+    return await password_hasher.verify(plain_password, hashed_password)
+
 def generate_verification_token():
     return secrets.token_urlsafe(16)  # Generates a secure 16-byte URL-safe token
\ No newline at end of file
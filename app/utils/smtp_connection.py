@@ -1,5 +1,6 @@
 # smtp_client.py
-from builtins import Exception, int, str
+from builtins import Exception, int, len, str
+from typing import Sequence, Tuple
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -13,13 +14,17 @@ class SMTPClient:
         self.username = username
         self.password = password
 
+    def _build_message(self, subject: str, html_content: str, recipient: str) -> MIMEMultipart:
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = self.username
+        message['To'] = recipient
+        message.attach(MIMEText(html_content, 'html'))
+        return message
+
     def send_email(self, subject: str, html_content: str, recipient: str):
         try:
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = self.username
-            message['To'] = recipient
-            message.attach(MIMEText(html_content, 'html'))
+            message = self._build_message(subject, html_content, recipient)
 
             with smtplib.SMTP(self.server, self.port) as server:
                 server.starttls()  # Use TLS
@@ -29,3 +34,26 @@ class SMTPClient:
         except Exception as e:
             logging.error(f"Failed to send email: {str(e)}")
             raise
+
+    def send_emails(self, emails: Sequence[Tuple[str, str, str]]) -> int:
+        """Send several (subject, html_content, recipient) emails over a single SMTP connection.
+
+        A rejected recipient is logged and skipped; returns how many emails were sent.
+        """
+        sent = 0
+        try:
+            with smtplib.SMTP(self.server, self.port) as server:
+                server.starttls()  # Use TLS
+                server.login(self.username, self.password)
+                for subject, html_content, recipient in emails:
+                    message = self._build_message(subject, html_content, recipient)
+                    try:
+                        server.sendmail(self.username, recipient, message.as_string())
+                        sent += 1
+                    except smtplib.SMTPRecipientsRefused as e:
+                        logging.error(f"Failed to send email to {recipient}: {str(e)}")
+            logging.info(f"Sent {sent} of {len(emails)} emails")
+        except Exception as e:
+            logging.error(f"Failed to send emails: {str(e)}")
+            raise
+        return sent
@@ -0,0 +1,101 @@
+"""
+Microbenchmark of the per-call overhead of the hot UserService queries.
+
+Compares building each statement on every call, as UserService used to, with reusing the
+prebuilt statements and binding parameters:
+
+    python -m scripts.benchmark_user_queries                 # Python overhead only
+    python -m scripts.benchmark_user_queries --database      # also round trips against DATABASE_URL
+
+The Python figures time what happens before SQLAlchemy's compiled cache lookup: constructing the
+statement and deriving its cache key. The database figures time whole `session.execute` calls.
+"""
+
+from builtins import int, min, print, range, zip
+import asyncio
+import time
+import uuid
+import click
+from sqlalchemy import func, select
+from app.database import Database
+from app.dependencies import get_settings
+from app.models.user_model import User
+from app.services.user_service import COUNT_LIVE_USERS, LIVE_USERS, UserService, _lookup_statement
+
+
+def rebuilt_queries(user_id):
+    """(name, statement factory, params) for the queries as built on every call before caching."""
+    return [
+        ("lookup by id", lambda: select(User).where(LIVE_USERS).filter_by(id=user_id), None),
+        ("lookup by email", lambda: select(User).where(LIVE_USERS).filter_by(email="someone@example.com"), None),
+        ("page", lambda: UserService.list_users_query("created_at").offset(0).limit(10), None),
+        ("count", lambda: select(func.count()).select_from(User).where(LIVE_USERS), None),
+    ]
+
+
+def cached_queries(user_id):
+    """The same queries as prebuilt statements with bound parameters."""
+    return [
+        ("lookup by id", lambda: _lookup_statement(("id",)), {"id": user_id}),
+        ("lookup by email", lambda: _lookup_statement(("email",)), {"email": "someone@example.com"}),
+        ("page", lambda: UserService._page_statement("created_at"), {"skip": 0, "limit": 10}),
+        ("count", lambda: COUNT_LIVE_USERS, None),
+    ]
+
+
+def best_of(repeat: int, iterations: int, call) -> float:
+    """Fastest of `repeat` runs, in microseconds per call."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        timings.append((time.perf_counter() - started) / iterations * 1e6)
+    return min(timings)
+
+
+def python_overhead(iterations: int, repeat: int):
+    user_id = uuid.uuid4()
+    for (name, rebuild, _), (_, cached, _) in zip(rebuilt_queries(user_id), cached_queries(user_id)):
+        before = best_of(repeat, iterations, lambda: rebuild()._generate_cache_key())
+        after = best_of(repeat, iterations, lambda: cached()._generate_cache_key())
+        print(f"{name:<16} {before:9.1f} us {after:9.1f} us {before / after:7.1f}x")
+
+
+async def database_round_trips(iterations: int, repeat: int):
+    settings = get_settings()
+    Database.initialize(settings.database_url, statement_cache_size=settings.db_statement_cache_size,
+                        prepared_statement_cache_size=settings.db_prepared_statement_cache_size)
+    user_id = uuid.uuid4()
+    try:
+        async with Database.get_read_session_factory(use_primary=True)() as session:
+            for (name, rebuild, _), (_, cached, params) in zip(rebuilt_queries(user_id), cached_queries(user_id)):
+                timings = {}
+                for label, factory, bound in (("before", rebuild, None), ("after", cached, params)):
+                    await session.execute(factory(), bound)  # warm the compiled and prepared statement caches
+                    runs = []
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        for _ in range(iterations):
+                            await session.execute(factory(), bound)
+                        runs.append((time.perf_counter() - started) / iterations * 1e6)
+                    timings[label] = min(runs)
+                print(f"{name:<16} {timings['before']:9.1f} us {timings['after']:9.1f} us {timings['before'] / timings['after']:7.2f}x")
+    finally:
+        await Database.dispose()
+
+
+@click.command()
+@click.option("--iterations", type=int, default=2000, show_default=True, help="Calls per timed run.")
+@click.option("--repeat", type=int, default=5, show_default=True, help="Timed runs per query; the fastest is reported.")
+@click.option("--database", is_flag=True, help="Also time full round trips against the configured database.")
+def main(iterations: int, repeat: int, database: bool):
+    print(f"{'python overhead':<16} {'before':>12} {'after':>12} {'speedup':>8}")
+    python_overhead(iterations, repeat)
+    if database:
+        print(f"\n{'round trip':<16} {'before':>12} {'after':>12} {'speedup':>8}")
+        asyncio.run(database_round_trips(iterations // 10 or 1, repeat))
+
+
+if __name__ == "__main__":
+    main()
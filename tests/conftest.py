@@ -31,8 +31,9 @@ from faker import Faker
 from app.main import app
 from app.database import Base, Database
 from app.models.user_model import User, UserRole
-from app.dependencies import get_db, get_settings
+from app.dependencies import get_db, get_read_db, get_settings
 from app.utils.security import hash_password
+from app.utils.rate_limiter import login_email_limiter, login_ip_limiter
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
 from app.services.jwt_service import create_access_token
@@ -59,11 +60,17 @@ def email_service():
 async def async_client(db_session):
     async with AsyncClient(app=app, base_url="http://testserver") as client:
         app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_read_db] = lambda: db_session
         try:
             yield client
         finally:
             app.dependency_overrides.clear()
 
+@pytest.fixture(autouse=True)
+def reset_login_throttle():
+    login_ip_limiter.reset()
+    login_email_limiter.reset()
+
 @pytest.fixture(scope="session", autouse=True)
 def initialize_database():
     try:
@@ -77,6 +84,8 @@ async def setup_database():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
+    # Pooled connections belong to this test's event loop; don't hand them to the next test
+    await Database.dispose()
     async with engine.begin() as conn:
         # you can comment out this line during development if you are debugging a single test
          await conn.run_sync(Base.metadata.drop_all)
@@ -165,10 +174,10 @@ async def users_with_same_role_50_users(db_session):
     users = []
     for _ in range(50):
         user_data = {
-            "nickname": fake.user_name(),
+            "nickname": fake.unique.user_name(),
             "first_name": fake.first_name(),
             "last_name": fake.last_name(),
-            "email": fake.email(),
+            "email": fake.unique.email(),
             "hashed_password": fake.password(),
             "role": UserRole.AUTHENTICATED,
             "email_verified": False,
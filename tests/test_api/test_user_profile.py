@@ -1,6 +1,7 @@
 import pytest
 from httpx import AsyncClient
 from uuid import UUID
+from app.services.jwt_service import decode_token
 
 @pytest.mark.asyncio
 async def test_update_own_profile(async_client, verified_user, user_token):
@@ -56,3 +57,26 @@ async def test_user_cannot_update_professional_status(async_client, verified_use
         headers=headers
     )
     assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_login_token_carries_user_id(async_client, verified_user):
+    """Test that access tokens identify the user by id rather than email"""
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    response = await async_client.post("/login/", data=form_data)
+    assert response.status_code == 200
+    claims = decode_token(response.json()["access_token"])
+    assert claims["sub"] == str(verified_user.id)
+    assert claims["email"] == verified_user.email
+
+@pytest.mark.asyncio
+async def test_update_own_profile_with_login_token(async_client, verified_user):
+    """Test that the id claim lets users update their own profile"""
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    token = (await async_client.post("/login/", data=form_data)).json()["access_token"]
+    response = await async_client.put(
+        f"/users/{verified_user.id}/profile",
+        json={"bio": "Updated through my own token"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["bio"] == "Updated through my own token"
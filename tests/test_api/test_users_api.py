@@ -1,11 +1,21 @@
-from builtins import str
+from builtins import next, range, sorted, str
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import json
+from unittest.mock import AsyncMock
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
 from app.main import app
-from app.models.user_model import User, UserRole
+from app.models.user_model import ArchivedUser, User, UserRole
 from app.utils.nickname_gen import generate_nickname
 from app.utils.security import hash_password
-from app.services.jwt_service import decode_token  # Import your FastAPI app
+from app.services.jwt_service import create_access_token, decode_token  # Import your FastAPI app
+from app.dependencies import get_email_service, get_settings
+from app.services.email_service import EmailService
+from app.services.archive_service import UserArchiveService
+from app.services.import_service import UserImportService
+from app.services.user_service import UserService
 
 # Example of a test function using the async_client fixture
 @pytest.mark.asyncio
@@ -115,6 +125,31 @@ async def test_login_user_not_found(async_client):
     assert response.status_code == 401
     assert "Incorrect email or password." in response.json().get("detail", "")
 
+@pytest.mark.asyncio
+async def test_login_restores_dormant_archived_user(async_client, db_session, verified_user):
+    email = verified_user.email
+    await db_session.execute(update(User).where(User.id == verified_user.id).values(last_login_at=datetime.now(timezone.utc) - timedelta(days=800)))
+    await db_session.commit()
+    assert await UserArchiveService.run(db_session, *UserArchiveService.cutoffs(30, 730)) == 1
+
+    form_data = {"username": email, "password": "MySuperPassword$1234"}
+    response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 200
+    assert (await UserService.get_by_email(db_session, email)) is not None
+
+@pytest.mark.asyncio
+async def test_login_with_wrong_password_leaves_archived_user_archived(async_client, db_session, verified_user):
+    email, user_id = verified_user.email, verified_user.id
+    await db_session.execute(update(User).where(User.id == user_id).values(last_login_at=datetime.now(timezone.utc) - timedelta(days=800)))
+    await db_session.commit()
+    assert await UserArchiveService.run(db_session, *UserArchiveService.cutoffs(30, 730)) == 1
+
+    form_data = {"username": email, "password": "WrongPassword$1234"}
+    response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 401
+    assert await db_session.get(ArchivedUser, user_id) is not None
+    assert await UserService.get_by_email(db_session, email) is None
+
 @pytest.mark.asyncio
 async def test_login_incorrect_password(async_client, verified_user):
     form_data = {
@@ -190,3 +225,290 @@ async def test_list_users_unauthorized(async_client, user_token):
         headers={"Authorization": f"Bearer {user_token}"}
     )
     assert response.status_code == 403  # Forbidden, as expected for regular user
+
+@pytest.mark.asyncio
+async def test_refresh_token_flow(async_client, verified_user):
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 200
+    refresh_token = response.json()["refresh_token"]
+
+    response = await async_client.post("/token/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    data = response.json()
+    assert decode_token(data["access_token"]) is not None
+    assert data["refresh_token"] != refresh_token
+
+    # The consumed token cannot be exchanged again
+    response = await async_client.post("/token/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/", headers=headers)
+    assert response.status_code == 200
+
+    response = await async_client.post("/logout/", headers=headers)
+    assert response.status_code == 204
+
+    response = await async_client.get("/users/", headers=headers)
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_login_throttled_per_account(async_client, verified_user, monkeypatch):
+    # Freeze the limiter's clock so the attempts cannot straddle a window boundary
+    monkeypatch.setattr("app.utils.rate_limiter.time.time", lambda: 1_000_020.0)
+    form_data = {"username": verified_user.email, "password": "IncorrectPassword123!"}
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    statuses = [
+        (await async_client.post("/login/", data=urlencode(form_data), headers=headers)).status_code
+        for _ in range(get_settings().login_rate_limit_per_email + 1)
+    ]
+    assert statuses[-1] == 429
+    assert 429 not in statuses[:-1]
+
+@pytest.mark.asyncio
+async def test_list_users_cursor_pagination(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/", params={"pagination": "cursor", "limit": 30}, headers=headers)
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["items"]) == 30
+    assert first_page["next_cursor"] is not None
+
+    response = await async_client.get("/users/", params={"cursor": first_page["next_cursor"], "limit": 30}, headers=headers)
+    second_page = response.json()
+    assert len(second_page["items"]) == 21  # 50 users plus the admin
+    assert second_page["next_cursor"] is None
+    assert {item["id"] for item in first_page["items"]}.isdisjoint(item["id"] for item in second_page["items"])
+
+@pytest.mark.asyncio
+async def test_list_users_invalid_cursor(async_client, admin_token):
+    response = await async_client.get("/users/", params={"cursor": "garbage"}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_users_without_total(async_client, admin_token, users_with_same_role_50_users):
+    response = await async_client.get("/users/", params={"count": "none", "limit": 10}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] is None
+    rels = {link["rel"] for link in body["links"]}
+    assert "next" in rels and "last" not in rels
+
+@pytest.mark.asyncio
+async def test_admin_imports_users_from_csv(async_client, admin_token):
+    csv_file = "email,password,first_name\nimported@example.com,Secure*1234,Imported\nbroken,Secure*1234,Broken\n"
+    response = await async_client.post(
+        "/admin/users/import",
+        files={"file": ("users.csv", csv_file, "text/csv")},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 202
+    started = response.json()
+    assert started["status"] == "RUNNING"
+
+    # The import runs as a background task, which has finished by the time the test client returns
+    response = await async_client.get(f"/admin/users/import/{started['id']}", headers={"Authorization": f"Bearer {admin_token}"})
+    report = response.json()
+    assert report["status"] == "COMPLETED"
+    assert report["imported_count"] == 1
+    assert report["failed_count"] == 1
+    assert [error["row_number"] for error in report["errors"]] == [2]
+
+@pytest.mark.asyncio
+async def test_import_cannot_resume_a_running_import(async_client, admin_token, db_session):
+    job = await UserImportService.start(db_session, "users.csv")
+    response = await async_client.post(
+        "/admin/users/import",
+        params={"import_id": str(job.id)},
+        files={"file": ("users.csv", "email,password\n", "text/csv")},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 409
+
+@pytest.mark.asyncio
+async def test_import_requires_admin(async_client, manager_token):
+    response = await async_client.post(
+        "/admin/users/import",
+        files={"file": ("users.csv", "email,password\n", "text/csv")},
+        headers={"Authorization": f"Bearer {manager_token}"},
+    )
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_export_users_ndjson(async_client, admin_token, users_with_same_role_50_users):
+    response = await async_client.get("/users/export", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 51
+    assert "hashed_password" not in rows[0]
+
+@pytest.mark.asyncio
+async def test_export_users_csv_with_filter_and_columns(async_client, admin_token, users_with_same_role_50_users):
+    response = await async_client.get(
+        "/users/export",
+        params={"format": "csv", "columns": "email,role", "role": "AUTHENTICATED"},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "email,role"
+    assert len(lines) == 51
+    assert all(line.endswith(",AUTHENTICATED") for line in lines[1:])
+
+@pytest.mark.asyncio
+async def test_export_users_rejects_secret_columns(async_client, admin_token):
+    response = await async_client.get("/users/export", params={"columns": "email,hashed_password"}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_batch_get_users_keeps_request_order(async_client, admin_token, admin_user, user):
+    missing = str(uuid4())
+    ids = [str(user.id), missing, str(admin_user.id), str(user.id)]
+    response = await async_client.post("/users/batch-get", json={"ids": ids}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == ids
+    assert [item["found"] for item in items] == [True, False, True, True]
+    assert items[1]["user"] is None
+    assert items[2]["user"]["email"] == admin_user.email
+
+@pytest.mark.asyncio
+async def test_batch_get_users_limits_ids(async_client, admin_token):
+    ids = [str(uuid4()) for _ in range(get_settings().batch_get_max_ids + 1)]
+    response = await async_client.post("/users/batch-get", json={"ids": ids}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_search_users(async_client, admin_token, admin_user, users_with_same_role_50_users):
+    response = await async_client.get("/users/search", params={"q": admin_user.nickname[:5], "role": "ADMIN"}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [str(admin_user.id)]
+
+@pytest.mark.asyncio
+async def test_list_users_sort_and_filter(async_client, admin_token, admin_user, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/", params={"sort": "-nickname", "role": "AUTHENTICATED", "limit": 20}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    nicknames = [item["nickname"] for item in body["items"]]
+    assert nicknames == sorted(nicknames, reverse=True)
+    assert body["total"] == 50
+    next_link = next(link["href"] for link in body["links"] if link["rel"] == "next")
+    assert "sort=-nickname" in next_link and "role=AUTHENTICATED" in next_link
+
+@pytest.mark.asyncio
+async def test_list_users_rejects_unknown_sort(async_client, admin_token):
+    response = await async_client.get("/users/", params={"sort": "hashed_password"}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 422
+
+@pytest.fixture
+def bulk_email_service():
+    email_service = AsyncMock(spec=EmailService)
+    app.dependency_overrides[get_email_service] = lambda: email_service
+    yield email_service
+    app.dependency_overrides.pop(get_email_service, None)
+
+@pytest.mark.asyncio
+async def test_bulk_update_users_by_ids(async_client, admin_token, locked_user, user, bulk_email_service):
+    body = {"ids": [str(locked_user.id), str(user.id)], "changes": {"is_locked": False}}
+    response = await async_client.patch("/users/bulk", json=body, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert response.json() == {"affected": 1}
+    recipients, email_type, batch_size = bulk_email_service.send_user_emails.await_args.args
+    assert [recipient["email"] for recipient in recipients] == [locked_user.email]
+    assert email_type == "account_unlocked"
+    assert batch_size == get_settings().bulk_email_batch_size
+
+@pytest.mark.asyncio
+async def test_bulk_update_users_by_filter(async_client, admin_token, users_with_same_role_50_users, bulk_email_service):
+    body = {"filter": {"role": "AUTHENTICATED"}, "changes": {"is_professional": True}}
+    response = await async_client.patch("/users/bulk", json=body, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert response.json() == {"affected": 50}
+    recipients, email_type, _ = bulk_email_service.send_user_emails.await_args.args
+    assert len(recipients) == 50 and email_type == "professional_status"
+    assert all(recipient["status"] == "upgraded" for recipient in recipients)
+
+@pytest.mark.asyncio
+async def test_bulk_update_skips_caller_with_email_subject_token(async_client, admin_user, user, bulk_email_service):
+    # Tokens issued before `sub` carried the user id hold the email instead
+    token = create_access_token(data={"sub": admin_user.email, "role": admin_user.role.name})
+    body = {"ids": [str(admin_user.id), str(user.id)], "changes": {"is_professional": True}}
+    response = await async_client.patch("/users/bulk", json=body, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json() == {"affected": 1}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [
+    {"changes": {"is_locked": True}},
+    {"ids": [str(uuid4())], "filter": {"is_locked": True}, "changes": {"is_locked": False}},
+    {"filter": {}, "changes": {"is_locked": False}},
+    {"ids": [str(uuid4())], "changes": {"is_locked": True, "role": "ADMIN"}},
+])
+async def test_bulk_update_users_validation(async_client, admin_token, body, bulk_email_service):
+    response = await async_client.patch("/users/bulk", json=body, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 422
+    bulk_email_service.send_user_emails.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_bulk_role_changes_are_admin_only(async_client, manager_token, admin_token, user, bulk_email_service):
+    body = {"ids": [str(user.id)], "changes": {"role": "MANAGER"}}
+    response = await async_client.patch("/users/bulk", json=body, headers={"Authorization": f"Bearer {manager_token}"})
+    assert response.status_code == 403
+    body = {"ids": [str(user.id)], "changes": {"role": "ADMIN"}}
+    response = await async_client.patch("/users/bulk", json=body, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+    bulk_email_service.send_user_emails.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_bulk_lock_skips_the_caller_and_admins(async_client, admin_user, manager_user, manager_token, user, bulk_email_service):
+    body = {"ids": [str(admin_user.id), str(manager_user.id), str(user.id)], "changes": {"is_locked": True}}
+    response = await async_client.patch("/users/bulk", json=body, headers={"Authorization": f"Bearer {manager_token}"})
+    assert response.status_code == 200
+    assert response.json() == {"affected": 1}
+    recipients, _, _ = bulk_email_service.send_user_emails.await_args.args
+    assert [recipient["email"] for recipient in recipients] == [user.email]
+
+@pytest.mark.asyncio
+async def test_bulk_update_users_access_denied(async_client, user_token, bulk_email_service):
+    body = {"ids": [str(uuid4())], "changes": {"is_locked": True}}
+    response = await async_client.patch("/users/bulk", json=body, headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_restore_deleted_user(async_client, admin_token, user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    assert (await async_client.delete(f"/users/{user.id}", headers=headers)).status_code == 204
+    assert (await async_client.get(f"/users/{user.id}", headers=headers)).status_code == 404
+    response = await async_client.post(f"/users/{user.id}/restore", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == user.email
+    assert (await async_client.post(f"/users/{user.id}/restore", headers=headers)).status_code == 404
+
+@pytest.mark.asyncio
+async def test_get_user_etag_and_conditional_get(async_client, admin_token, user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{user.id}", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag == f'"{response.json()["version"]}"'
+    not_modified = await async_client.get(f"/users/{user.id}", headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+@pytest.mark.asyncio
+async def test_update_user_if_match(async_client, admin_token, user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    etag = (await async_client.get(f"/users/{user.id}", headers=headers)).headers["ETag"]
+    first = await async_client.put(f"/users/{user.id}", json={"first_name": "First"}, headers={**headers, "If-Match": etag})
+    assert first.status_code == 200
+    assert first.headers["ETag"] != etag
+    # A second editor still holding the old ETag fails fast instead of overwriting
+    second = await async_client.put(f"/users/{user.id}", json={"first_name": "Second"}, headers={**headers, "If-Match": etag})
+    assert second.status_code == 412
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert (await async_client.get(f"/users/{user.id}", headers=headers)).json()["first_name"] == "First"
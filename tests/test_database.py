@@ -0,0 +1,67 @@
+# test_database.py
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.database import Database, PoolMetrics, Replica
+from app.dependencies import get_settings
+
+def test_pool_metrics_wait_histogram_is_cumulative():
+    metrics = PoolMetrics()
+    metrics.observe_wait(0.0005)
+    metrics.observe_wait(0.02)
+    metrics.observe_wait(30.0, timed_out=True)
+    snapshot = metrics.snapshot()
+    buckets = snapshot["wait_seconds"]["buckets"]
+    assert buckets["0.001"] == 1
+    assert buckets["0.025"] == 2
+    assert buckets["10.0"] == 2
+    assert buckets["+Inf"] == 3
+    assert snapshot["checkouts"] == 2
+    assert snapshot["checkout_timeouts"] == 1
+
+def test_pool_metrics_tracks_open_connections():
+    metrics = PoolMetrics()
+    connection = object()
+    metrics.connection_opened(connection)
+    assert metrics.snapshot()["connection_age_seconds"]["open"] == 1
+    metrics.connection_closed(connection)
+    assert metrics.snapshot()["connection_age_seconds"]["open"] == 0
+
+@pytest.mark.asyncio
+async def test_pool_status_reports_checkouts():
+    async with Database.get_session_factory()() as session:
+        await session.execute(text("SELECT 1"))
+        status = Database.pool_status()
+        assert status["checked_out"] >= 1
+    status = Database.pool_status()
+    assert status["checkouts"] >= 1
+    assert status["connections_opened"] >= 1
+
+@pytest.mark.asyncio
+async def test_reads_route_to_healthy_replicas(monkeypatch):
+    settings = get_settings()
+    replica = Replica(create_async_engine(settings.database_url))
+    down = Replica(create_async_engine(settings.database_url.replace("@127.0.0.1/", "@127.0.0.1:1/").replace("@postgres/", "@127.0.0.1:1/")))
+    monkeypatch.setattr(Database, "_replicas", [replica, down])
+    try:
+        health = await Database.check_replicas(timeout=2)
+        assert health == {replica.name: True, down.name: False}
+        assert down.last_error is not None
+        for _ in range(3):
+            assert Database.get_read_session_factory() is replica.session_factory
+        assert Database.get_read_session_factory(use_primary=True) is not replica.session_factory
+        async with Database.get_read_session_factory()() as session:
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+
+        assert Database.get_stream_session_factory() is replica.stream_session_factory
+        async with Database.get_stream_session_factory()() as session:
+            result = await session.stream(text("SELECT generate_series(1, 3)"))
+            assert [row[0] async for row in result] == [1, 2, 3]
+
+        replica.healthy = False  # every replica down: fail over to the primary
+        assert Database.get_read_session_factory() is Database.get_read_session_factory(use_primary=True)
+        assert Database.get_stream_session_factory() is Database.get_session_factory()
+        assert [entry["healthy"] for entry in Database.pool_status()["replicas"]] == [False, False]
+    finally:
+        await replica.engine.dispose()
+        await down.engine.dispose()
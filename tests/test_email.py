@@ -12,3 +12,14 @@ async def test_send_markdown_email(email_service):
     }
     await email_service.send_user_email(user_data, 'email_verification')
     # Manual verification in Mailtrap
+
+@pytest.mark.asyncio
+async def test_send_user_emails_in_batches(monkeypatch):
+    email_service = EmailService(template_manager=TemplateManager())
+    batches = []
+    monkeypatch.setattr(email_service.smtp_client, "send_emails", lambda emails: batches.append(emails) or len(emails))
+    users_data = [{"email": f"user{i}@example.com", "name": f"User {i}", "role": "MANAGER"} for i in range(5)]
+    assert await email_service.send_user_emails(users_data, 'role_changed', batch_size=2) == 5
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    subject, html, recipient = batches[2][0]
+    assert subject == "Your Role Has Changed" and "MANAGER" in html and recipient == "user4@example.com"
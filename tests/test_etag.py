@@ -0,0 +1,18 @@
+from app.utils.etag import if_match_versions, if_none_match_hit, make_etag
+
+def test_make_etag_is_strong():
+    assert make_etag(3) == '"3"'
+
+def test_if_match_versions():
+    assert if_match_versions(None) is None
+    assert if_match_versions("*") is None
+    assert if_match_versions('"3"') == [3]
+    assert if_match_versions('"3", "5"') == [3, 5]
+    # If-Match compares strongly: weak or malformed tags can never match
+    assert if_match_versions('W/"3", "x"') == []
+
+def test_if_none_match_hit():
+    assert not if_none_match_hit(None, 3)
+    assert if_none_match_hit("*", 3)
+    assert if_none_match_hit('"2", W/"3"', 3)
+    assert not if_none_match_hit('"2"', 3)
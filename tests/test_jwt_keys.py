@@ -0,0 +1,85 @@
+# test_jwt_keys.py
+import os
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from app.services import jwt_service
+from app.utils.jwt_keys import KeyRing
+
+def _write_key(directory, kid, private_key, mtime):
+    path = directory / f"{kid}.pem"
+    path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    os.utime(path, (mtime, mtime))
+
+@pytest.fixture
+def rsa_key_ring(tmp_path, monkeypatch):
+    _write_key(tmp_path, "old", rsa.generate_private_key(public_exponent=65537, key_size=2048), 1000)
+    _write_key(tmp_path, "new", rsa.generate_private_key(public_exponent=65537, key_size=2048), 2000)
+    key_ring = KeyRing(algorithm="RS256", secret="unused", keys_dir=str(tmp_path))
+    monkeypatch.setattr(jwt_service, "key_ring", key_ring)
+    jwt_service.token_cache.clear()
+    return key_ring
+
+def test_newest_key_signs(rsa_key_ring):
+    token = jwt_service.create_access_token(data={"sub": "user@example.com", "role": "ADMIN"})
+    assert jwt.get_unverified_header(token)["kid"] == "new"
+    assert jwt_service.decode_token(token)["sub"] == "user@example.com"
+
+def test_retired_key_still_verifies(rsa_key_ring, tmp_path):
+    rsa_key_ring.active_kid = "old"
+    token = jwt_service.create_access_token(data={"sub": "user@example.com", "role": "ADMIN"})
+    rsa_key_ring.active_kid = "new"
+    assert jwt.get_unverified_header(token)["kid"] == "old"
+    assert jwt_service.decode_token(token, use_cache=False) is not None
+
+def test_unknown_kid_rejected(rsa_key_ring):
+    foreign_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    token = jwt.encode({"sub": "user@example.com"}, foreign_key, algorithm="RS256", headers={"kid": "unknown"})
+    assert jwt_service.decode_token(token) is None
+
+def test_unknown_kid_reloads_key_directory(rsa_key_ring, tmp_path):
+    rsa_key_ring.reload_interval = 0
+    assert rsa_key_ring.verification_key("new") is not None
+    added = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    _write_key(tmp_path, "added", added, 3000)
+    token = jwt.encode({"sub": "user@example.com"}, added, algorithm="RS256", headers={"kid": "added"})
+    assert jwt_service.decode_token(token)["sub"] == "user@example.com"
+    assert rsa_key_ring.active_kid == "added"  # the newest key now signs
+
+def test_unknown_kid_reload_is_rate_limited(rsa_key_ring, tmp_path):
+    rsa_key_ring.reload_interval = 3600
+    assert rsa_key_ring.verification_key("new") is not None
+    added = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    _write_key(tmp_path, "added", added, 3000)
+    token = jwt.encode({"sub": "user@example.com"}, added, algorithm="RS256", headers={"kid": "added"})
+    assert jwt_service.decode_token(token) is None
+    rsa_key_ring.reload()
+    assert jwt_service.decode_token(token) is not None
+
+def test_failed_reload_keeps_loaded_keys(rsa_key_ring, tmp_path):
+    rsa_key_ring.reload_interval = 0
+    assert rsa_key_ring.verification_key("new") is not None
+    (tmp_path / "broken.pem").write_text("not a key")
+    assert rsa_key_ring.verification_key("broken") is None
+    assert rsa_key_ring.verification_key("new") is not None
+
+def test_jwks_publishes_public_keys(rsa_key_ring):
+    keys = rsa_key_ring.jwks()["keys"]
+    assert {key["kid"] for key in keys} == {"old", "new"}
+    assert all(key["kty"] == "RSA" and "d" not in key for key in keys)
+
+def test_eddsa_key_ring(tmp_path):
+    _write_key(tmp_path, "ed", ed25519.Ed25519PrivateKey.generate(), 1000)
+    key_ring = KeyRing(algorithm="EdDSA", secret="unused", keys_dir=str(tmp_path))
+    kid, signing_key = key_ring.signing_key()
+    token = jwt.encode({"sub": "user@example.com"}, signing_key, algorithm="EdDSA", headers={"kid": kid})
+    assert jwt.decode(token, key_ring.verification_key(kid), algorithms=["EdDSA"])["sub"] == "user@example.com"
+    assert key_ring.jwks()["keys"][0]["kty"] == "OKP"
+
+def test_hmac_key_ring_has_no_public_keys():
+    key_ring = KeyRing(algorithm="HS256", secret="secret", keys_dir="does-not-exist")
+    assert key_ring.signing_key() == (None, "secret")
+    assert key_ring.jwks() == {"keys": []}
@@ -0,0 +1,56 @@
+# test_jwt_service.py
+from builtins import range, str
+from datetime import timedelta
+import time
+import pytest
+from app.services.jwt_service import TokenClaimsCache, create_access_token, decode_token, token_cache
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+def test_decode_token_is_cached():
+    """Test that a second decode of the same token is served from the cache."""
+    token = create_access_token(data={"sub": "user@example.com", "role": "authenticated"})
+    first = decode_token(token)
+    second = decode_token(token)
+    assert first == second
+    assert first["role"] == "AUTHENTICATED"
+    assert token_cache.stats()["hits"] == 1
+    assert token_cache.stats()["misses"] == 1
+
+def test_decode_token_bypasses_cache():
+    """Test that use_cache=False always verifies the token."""
+    token = create_access_token(data={"sub": "user@example.com", "role": "ADMIN"})
+    decode_token(token)
+    assert decode_token(token, use_cache=False) is not None
+    assert token_cache.stats()["hits"] == 0
+
+def test_invalid_token_is_not_cached():
+    """Test that tokens failing verification are rejected and never cached."""
+    assert decode_token("not-a-token") is None
+    assert token_cache.stats()["size"] == 0
+
+def test_cache_entry_expires_with_token():
+    """Test that an entry is evicted once the token's exp has passed."""
+    cache = TokenClaimsCache(max_size=10)
+    cache.put("token", {"sub": "user", "exp": time.time() - 1})
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+def test_cache_is_bounded():
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache = TokenClaimsCache(max_size=2)
+    exp = time.time() + 60
+    for i in range(3):
+        cache.put(f"token-{i}", {"sub": str(i), "exp": exp})
+    assert cache.get("token-0") is None
+    assert cache.get("token-2")["sub"] == "2"
+    assert cache.stats()["size"] == 2
+
+def test_expired_token_rejected():
+    """Test that an expired token does not decode."""
+    token = create_access_token(data={"sub": "user@example.com", "role": "ADMIN"}, expires_delta=timedelta(seconds=-1))
+    assert decode_token(token) is None
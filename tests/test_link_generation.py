@@ -1,12 +1,14 @@
 from builtins import len, max, sorted, str
 from unittest.mock import MagicMock
 from urllib.parse import parse_qs, urlparse, parse_qsl, urlunparse, urlencode
+from datetime import datetime, timezone
 from uuid import uuid4
 
 import pytest
 from fastapi import Request
 
-from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_pagination_links
+from app.utils.cursor import PREV, PageCursor, decode_cursor, encode_cursor
+from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_cursor_pagination_links, generate_pagination_links
 
 from urllib.parse import urlparse, parse_qs, urlunparse, urlencode
 
@@ -49,3 +51,18 @@ def test_generate_pagination_links(mock_request):
     assert len(links) >= 4
     expected_self_url = "http://testserver/users?limit=5&skip=10"
     assert normalize_url(str(links[0].href)) == normalize_url(expected_self_url), "Self link should match expected URL"
+
+def test_cursor_round_trip():
+    cursor = PageCursor(datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc), uuid4(), PREV)
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+
+def test_decode_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_generate_cursor_pagination_links(mock_request):
+    next_cursor = PageCursor(datetime(2024, 5, 1, tzinfo=timezone.utc), uuid4())
+    links = generate_cursor_pagination_links(mock_request, 10, next_cursor, None)
+    rels = {link.rel: str(link.href) for link in links}
+    assert "prev" not in rels
+    assert parse_qs(urlparse(rels["next"]).query)["cursor"] == [encode_cursor(next_cursor)]
@@ -0,0 +1,34 @@
+from builtins import len, range
+from itertools import combinations
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from app.models.user_model import USER_LIST_FILTERS, USER_LIST_SORTS, UserRole
+from app.services.user_service import UserService
+
+FILTER_VALUES = {"role": UserRole.AUTHENTICATED, "email_verified": True, "is_locked": False, "is_professional": True}
+
+def explain_sql(query) -> str:
+    compiled = query.limit(10).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return f"EXPLAIN {compiled}"
+
+@pytest.mark.asyncio
+async def test_every_allowed_sort_and_filter_uses_an_index(db_session, users_with_same_role_50_users):
+    # Rule out the alternatives so the plan shows whether an index can serve the query at all
+    for setting in ("enable_seqscan", "enable_bitmapscan", "enable_sort", "enable_incremental_sort"):
+        await db_session.execute(text(f"SET LOCAL {setting} = off"))
+    failures = []
+    sorts = [direction + sort for sort in USER_LIST_SORTS for direction in ("", "-")]
+    for size in range(len(USER_LIST_FILTERS) + 1):
+        for filters in combinations(USER_LIST_FILTERS, size):
+            conditions = UserService.filter_conditions(**{name: FILTER_VALUES[name] for name in filters})
+            for sort in sorts:
+                plan = "\n".join((await db_session.execute(text(explain_sql(UserService.list_users_query(sort, conditions))))).scalars())
+                index_conds = [line for line in plan.splitlines() if "Index Cond:" in line]
+                # Every index leads with a single filter column, so only one filter can bound the scan
+                # (Index Cond); any further filters are checked on the rows it returns.
+                bounded = [name for name in filters if any(f"{name} =" in line for line in index_conds)]
+                if "Index" not in plan or "Seq Scan" in plan or "Sort" in plan or (filters and not bounded):
+                    failures.append(f"sort={sort} filters={filters}: expected an ordered index scan bounded by one of the filters\n{plan}")
+    await db_session.rollback()
+    assert not failures, "\n\n".join(failures)
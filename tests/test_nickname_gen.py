@@ -0,0 +1,13 @@
+# test_nickname_gen.py
+import re
+from app.utils.nickname_gen import generate_nickname, generate_nickname_candidates, nickname_space_size
+
+def test_generated_nickname_is_url_safe():
+    assert re.fullmatch(r"[a-z]+_[a-z]+_\d+", generate_nickname())
+
+def test_candidates_are_distinct():
+    candidates = generate_nickname_candidates(16)
+    assert len(candidates) == len(set(candidates))
+
+def test_vocabulary_supports_millions_of_users():
+    assert nickname_space_size() > 1_000_000_000
@@ -0,0 +1,50 @@
+# test_rate_limiter.py
+from builtins import range
+from unittest.mock import MagicMock
+from app.dependencies import get_client_ip
+from app.utils.rate_limiter import SlidingWindowLimiter
+
+def test_limiter_allows_up_to_limit():
+    limiter = SlidingWindowLimiter(limit=3, window_seconds=60, max_keys=10)
+    assert all(limiter.hit("key", now=1000.0) is None for _ in range(3))
+    assert limiter.hit("key", now=1000.0) is not None
+
+def test_limiter_keys_are_independent():
+    limiter = SlidingWindowLimiter(limit=1, window_seconds=60, max_keys=10)
+    assert limiter.hit("a", now=1000.0) is None
+    assert limiter.hit("b", now=1000.0) is None
+    assert limiter.hit("a", now=1000.0) is not None
+
+def test_limiter_weights_previous_window():
+    limiter = SlidingWindowLimiter(limit=4, window_seconds=60, max_keys=10)
+    for _ in range(4):
+        limiter.hit("key", now=1200.0)
+    # A quarter into the next window, 3 of the previous 4 hits still count
+    assert limiter.hit("key", now=1275.0) is None
+    assert limiter.hit("key", now=1275.0) is not None
+    # Two windows later nothing from the burst remains
+    assert limiter.hit("key", now=1400.0) is None
+
+def test_limiter_retry_after_is_remaining_window():
+    limiter = SlidingWindowLimiter(limit=1, window_seconds=60, max_keys=10)
+    limiter.hit("key", now=1210.0)
+    assert limiter.hit("key", now=1210.0) == 50
+
+def test_limiter_is_memory_bounded():
+    limiter = SlidingWindowLimiter(limit=1, window_seconds=60, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.hit(key, now=1000.0)
+    assert limiter.stats()["tracked_keys"] == 2
+    # "a" was evicted, so it starts from a clean slate
+    assert limiter.hit("a", now=1000.0) is None
+
+def test_client_ip_uses_last_forwarded_hop():
+    request = MagicMock()
+    request.headers = {"x-forwarded-for": "6.6.6.6, 203.0.113.7"}
+    assert get_client_ip(request) == "203.0.113.7"
+
+def test_client_ip_without_proxy_header():
+    request = MagicMock()
+    request.headers = {}
+    request.client.host = "198.51.100.2"
+    assert get_client_ip(request) == "198.51.100.2"
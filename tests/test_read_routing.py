@@ -0,0 +1,45 @@
+# test_read_routing.py
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+from app.database import Database, Replica
+from app.dependencies import get_db, get_read_db, get_settings
+from app.utils.read_routing import RecentWriters, recent_writers
+
+def test_write_pins_reads_for_the_window():
+    writers = RecentWriters(window_seconds=5, max_keys=10)
+    assert not writers.wrote_recently("client", now=100.0)
+    writers.mark("client", now=100.0)
+    assert writers.wrote_recently("client", now=104.9)
+    assert not writers.wrote_recently("client", now=105.0)
+    assert not writers.wrote_recently("other", now=101.0)
+
+def test_oldest_writer_is_evicted():
+    writers = RecentWriters(window_seconds=5, max_keys=2)
+    for key in ("a", "b", "c"):
+        writers.mark(key, now=100.0)
+    assert not writers.wrote_recently("a", now=101.0)
+    assert writers.wrote_recently("c", now=101.0)
+
+def make_request(method: str, token: str) -> Request:
+    return Request({"type": "http", "method": method, "headers": [(b"authorization", f"Bearer {token}".encode())], "client": ("10.0.0.1", 1234)})
+
+async def next_session(dependency):
+    generator = dependency
+    session = await generator.__anext__()
+    await generator.aclose()
+    return session
+
+@pytest.mark.asyncio
+async def test_client_reads_primary_after_writing(monkeypatch):
+    recent_writers.reset()
+    replica = Replica(create_async_engine(get_settings().database_url))
+    monkeypatch.setattr(Database, "_replicas", [replica])
+    try:
+        assert (await next_session(get_read_db(make_request("GET", "writer")))).bind.sync_engine.pool is replica.engine.sync_engine.pool
+        await next_session(get_db(make_request("POST", "writer")))
+        assert (await next_session(get_read_db(make_request("GET", "writer")))).bind.sync_engine.pool is Database._engine.sync_engine.pool
+        assert (await next_session(get_read_db(make_request("GET", "someone-else")))).bind.sync_engine.pool is replica.engine.sync_engine.pool
+    finally:
+        recent_writers.reset()
+        await replica.engine.dispose()
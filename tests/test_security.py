@@ -1,7 +1,7 @@
 # test_security.py
-from builtins import RuntimeError, ValueError, isinstance, str
+from builtins import RuntimeError, ValueError, isinstance, range, str, zip
 import pytest
-from app.utils.security import hash_password, verify_password
+from app.utils.security import PasswordHasher, PasswordHashQueueFull, hash_password, verify_password
 
 def test_hash_password():
     """Test that hashing password returns a bcrypt hashed string."""
@@ -65,3 +65,49 @@ def test_hash_password_internal_error(monkeypatch):
     with pytest.raises(ValueError):
         hash_password("test")
 
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_async():
+    """Test that the async API hashes off the event loop and verifies the result."""
+    hasher = PasswordHasher(max_workers=0, max_queue=4)
+    try:
+        hashed = await hasher.hash("secure_password", rounds=4)
+        assert hashed.startswith('$2b$')
+        assert await hasher.verify("secure_password", hashed) is True
+        assert await hasher.verify("wrong_password", hashed) is False
+        metrics = hasher.metrics()
+        assert metrics["completed"] == 3
+        assert metrics["in_flight"] == 0
+    finally:
+        hasher.shutdown()
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_full():
+    """Test that jobs are rejected instead of queued once the limit is reached."""
+    hasher = PasswordHasher(max_workers=0, max_queue=0)
+    with pytest.raises(PasswordHashQueueFull):
+        await hasher.hash("secure_password")
+    assert hasher.metrics()["rejected"] == 1
+
+@pytest.mark.asyncio
+async def test_verify_password_async_invalid_hash():
+    """Test that errors from the worker propagate and are counted."""
+    hasher = PasswordHasher(max_workers=0, max_queue=4)
+    try:
+        with pytest.raises(ValueError):
+            await hasher.verify("secure_password", "invalid_hash_format")
+        assert hasher.metrics()["failed"] == 1
+    finally:
+        hasher.shutdown()
+
+@pytest.mark.asyncio
+async def test_hash_many_splits_batch_across_workers():
+    """Test that a batch is hashed in one job per worker and keeps its order."""
+    hasher = PasswordHasher(max_workers=2, max_queue=4)
+    try:
+        passwords = [f"password_{i}" for i in range(5)]
+        hashed = await hasher.hash_many(passwords, rounds=4)
+        assert [verify_password(p, h) for p, h in zip(passwords, hashed)] == [True] * 5
+        assert hasher.metrics()["completed"] == 2
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select, update
+from app.models.user_model import ArchivedUser, User, UserRole
+from app.services.archive_service import RestoreOutcome, UserArchiveService
+from app.services.user_service import CountStrategy, LoginOutcome, UserService
+
+pytestmark = pytest.mark.asyncio
+
+def days_ago(days):
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+async def backdate(session, user, **values):
+    await session.execute(update(User).where(User.id == user.id).values(**values))
+    await session.commit()
+
+# Test that a soft-deleted user disappears from lookups, listings and counts, and can be restored
+async def test_soft_deleted_user_is_hidden_and_restorable(db_session, user, verified_user):
+    assert await UserService.delete(db_session, user.id) is True
+    assert await UserService.get_by_id(db_session, user.id) is None
+    assert await UserService.get_by_email(db_session, user.email) is None
+    assert user.id not in {u.id for u in await UserService.list_users(db_session)}
+    assert await UserService.count(db_session) == 1
+
+    assert await UserArchiveService.restore(db_session, user.id) == RestoreOutcome.RESTORED
+    assert (await UserService.get_by_id(db_session, user.id)).email == user.email
+    assert await UserArchiveService.restore(db_session, user.id) == RestoreOutcome.NOT_FOUND
+
+# Test that the job archives old deletions and inactive non-admins in batches, and keeps the rest
+async def test_archive_moves_dormant_users(db_session, users_with_same_role_50_users, admin_user, user):
+    old, recent = users_with_same_role_50_users[:5], users_with_same_role_50_users[5]
+    for dormant in old:
+        await backdate(db_session, dormant, last_login_at=days_ago(800))
+    await backdate(db_session, admin_user, last_login_at=days_ago(800))
+    await backdate(db_session, recent, deleted_at=days_ago(40))
+    await UserService.delete(db_session, user.id)  # deleted just now: stays restorable in place
+    assert await UserService.seed_cached_count(db_session) == 50
+
+    deleted_before, inactive_before = UserArchiveService.cutoffs(30, 730)
+    assert await UserArchiveService.run(db_session, deleted_before, inactive_before, batch_size=2) == 6
+
+    archived = set((await db_session.execute(select(ArchivedUser.id))).scalars())
+    assert archived == {dormant.id for dormant in old} | {recent.id}
+    assert await UserService.count(db_session) == 45
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 45
+    assert await UserService.get_by_id(db_session, admin_user.id) is not None
+
+# Test that inactive users are only archived when an inactivity cutoff is configured
+async def test_inactive_archival_is_opt_in(db_session, verified_user):
+    await backdate(db_session, verified_user, last_login_at=days_ago(3000))
+    assert UserArchiveService.cutoffs()[1] is None
+    assert await UserArchiveService.run(db_session, *UserArchiveService.cutoffs()) == 0
+
+# Test that a dormant archived user keeps its email reserved and is restored by logging in
+async def test_dormant_user_is_restored_by_login(db_session, verified_user, email_service):
+    email, user_id = verified_user.email, verified_user.id
+    await backdate(db_session, verified_user, last_login_at=days_ago(800))
+    assert await UserArchiveService.run(db_session, days_ago(30), days_ago(730)) == 1
+
+    signup = {"nickname": "new_owner", "email": email, "password": "ValidPassword123!", "role": UserRole.AUTHENTICATED.name}
+    assert await UserService.create(db_session, signup, email_service) is None
+
+    assert await UserService.attempt_login(db_session, email, "WrongPassword$1234") == (LoginOutcome.INVALID_CREDENTIALS, None)
+    assert await UserService.attempt_login(db_session, email, "MySuperPassword$1234") == (LoginOutcome.ARCHIVED, None)
+    assert await UserArchiveService.restore_dormant(db_session, email) == RestoreOutcome.RESTORED
+    outcome, user = await UserService.attempt_login(db_session, email, "MySuperPassword$1234")
+    assert outcome == LoginOutcome.SUCCESS and user.id == user_id
+
+# Test restoring an archived user, and the conflict when its email was taken meanwhile
+async def test_restore_from_archive(db_session, user, verified_user):
+    await UserService.delete(db_session, user.id)
+    await UserService.delete(db_session, verified_user.id)
+    assert await UserArchiveService.run(db_session, days_ago(-1)) == 2
+
+    assert await UserArchiveService.restore(db_session, user.id) == RestoreOutcome.RESTORED
+    restored = await UserService.get_by_id(db_session, user.id)
+    assert restored.nickname == user.nickname and restored.deleted_at is None
+    assert await db_session.get(ArchivedUser, user.id) is None
+
+    db_session.add(User(nickname="taken_meanwhile", email=verified_user.email, hashed_password="x", role=UserRole.AUTHENTICATED))
+    await db_session.commit()
+    archived_id = verified_user.id  # the rollback on conflict expires loaded objects
+    assert await UserArchiveService.restore(db_session, archived_id) == RestoreOutcome.CONFLICT
+    assert await db_session.get(ArchivedUser, archived_id) is not None
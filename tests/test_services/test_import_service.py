@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+import io
+import json
+import pytest
+from sqlalchemy import update
+from app.models.import_model import ImportStatus
+from app.models.user_model import User, UserRole
+from app.services.archive_service import UserArchiveService
+from app.services.import_service import UserImportService
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+CSV_HEADER = "email,password,first_name,nickname,role\n"
+
+def csv_lines(*rows):
+    return io.StringIO(CSV_HEADER + "".join(f"{row}\n" for row in rows))
+
+# Test that valid rows are imported and bad rows reported, without failing the import
+async def test_import_reports_rejected_rows(db_session, user):
+    lines = csv_lines(
+        "alice@example.com,Secure*1234,Alice,,",
+        "not-an-email,Secure*1234,Bob,,",
+        f"{user.email},Secure*1234,Taken,,",
+        "carol@example.com,Secure*1234,Carol,,",
+        "carol@example.com,Secure*1234,Carol again,,",
+        f"dave@example.com,Secure*1234,Dave,{user.nickname},",
+        "eve@example.com,Secure*1234,Eve,,ADMIN",
+    )
+    job = await UserImportService.start(db_session, "users.csv")
+    job = await UserImportService.run(db_session, job, lines, batch_size=3)
+
+    assert job.status == ImportStatus.COMPLETED
+    assert job.rows_processed == 7
+    assert job.imported_count == 2
+    assert job.failed_count == 5
+    errors = {error.row_number: error.error for error in await UserImportService.errors(db_session, job.id)}
+    assert errors[2].startswith("email")
+    assert errors[3] == "email is already registered"
+    assert errors[5] == "email appears more than once in the file"
+    assert errors[6] == "nickname is already taken"
+    assert "ADMIN" in errors[7]
+
+    alice = await UserService.get_by_email(db_session, "alice@example.com")
+    assert alice.role == UserRole.ANONYMOUS
+    assert alice.nickname and not alice.email_verified
+    assert await UserService.login_user(db_session, "alice@example.com", "Secure*1234") is None  # unverified
+
+# Test that resuming skips rows committed by the interrupted run
+async def test_import_resumes_after_processed_rows(db_session):
+    lines = "alice@example.com,Secure*1234,Alice,,", "bob@example.com,Secure*1234,Bob,,"
+    job = await UserImportService.start(db_session, "users.csv")
+    job.rows_processed = 1
+    job = await UserImportService.run(db_session, job, csv_lines(*lines))
+    assert job.imported_count == 1
+    assert await UserService.get_by_email(db_session, "alice@example.com") is None
+    assert await UserService.get_by_email(db_session, "bob@example.com") is not None
+
+# Test that a dormant archived user's email cannot be taken by an import
+async def test_import_rejects_archived_emails(db_session, verified_user):
+    await db_session.execute(update(User).where(User.id == verified_user.id).values(last_login_at=datetime.now(timezone.utc) - timedelta(days=800)))
+    await db_session.commit()
+    email = verified_user.email
+    assert await UserArchiveService.run(db_session, *UserArchiveService.cutoffs(30, 730)) == 1
+
+    job = await UserImportService.start(db_session, "users.csv")
+    job = await UserImportService.run(db_session, job, csv_lines(f"{email},Secure*1234,Back,,", "fresh@example.com,Secure*1234,Fresh,,"))
+    assert job.imported_count == 1
+    errors = await UserImportService.errors(db_session, job.id)
+    assert [(error.row_number, error.error) for error in errors] == [(1, "email belongs to an archived account")]
+
+# Test that NDJSON rows are imported and unparseable lines reported
+async def test_import_reads_ndjson(db_session):
+    lines = io.StringIO("\n".join([
+        json.dumps({"email": "alice@example.com", "password": "Secure*1234", "first_name": "Alice"}),
+        "{not json",
+        "",
+        json.dumps(["bob@example.com"]),
+        json.dumps({"email": "carol@example.com", "password": "Secure*1234", "role": "AUTHENTICATED"}),
+    ]) + "\n")
+    job = await UserImportService.start(db_session, "users.ndjson")
+    job = await UserImportService.run(db_session, job, lines, format="ndjson")
+
+    assert job.imported_count == 2
+    assert job.failed_count == 2
+    assert await UserService.get_by_email(db_session, "alice@example.com") is not None
+    assert (await UserService.get_by_email(db_session, "carol@example.com")).role == UserRole.AUTHENTICATED
+
+# Test that a batch larger than asyncpg's bind-parameter limit is split across INSERTs
+async def test_import_splits_insert_at_bind_parameter_limit(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.import_service.MAX_BIND_PARAMS", 40)
+    lines = csv_lines(*(f"user{i}@example.com,Secure*1234,User,," for i in range(10)))
+    job = await UserImportService.start(db_session, "users.csv")
+    job = await UserImportService.run(db_session, job, lines, batch_size=10)
+    assert job.imported_count == 10
@@ -0,0 +1,79 @@
+from builtins import range
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.models.token_model import RevokedToken
+from app.services.revocation_service import RevocationList
+from app.utils.bloom_filter import BloomFilter
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+def test_revocation_list_membership():
+    revocations = RevocationList(capacity=10, error_rate=0.01)
+    revocations.add("revoked-jti", datetime.now(timezone.utc) + timedelta(minutes=5))
+    assert revocations.is_revoked("revoked-jti")
+    assert not revocations.is_revoked("other-jti")
+    assert not revocations.is_revoked(None)
+
+def test_revocation_list_grows_past_capacity():
+    revocations = RevocationList(capacity=2, error_rate=0.01)
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    for i in range(10):
+        revocations.add(f"jti-{i}", expires_at)
+    assert all(revocations.is_revoked(f"jti-{i}") for i in range(10))
+
+@pytest.mark.asyncio
+async def test_sync_and_purge(db_session):
+    now = datetime.now(timezone.utc)
+    db_session.add(RevokedToken(jti="live-jti", expires_at=now + timedelta(minutes=5)))
+    db_session.add(RevokedToken(jti="expired-jti", expires_at=now - timedelta(minutes=5)))
+    await db_session.commit()
+
+    revocations = RevocationList(capacity=10, error_rate=0.01)
+    await revocations.sync(db_session)
+    assert revocations.is_revoked("live-jti")
+    assert not revocations.is_revoked("expired-jti")
+
+    revocations.add("expired-jti", now - timedelta(minutes=5))
+    assert await revocations.purge_expired(db_session) == 1
+    assert not revocations.is_revoked("expired-jti")
+    assert revocations.is_revoked("live-jti")
+
+@pytest.mark.asyncio
+async def test_revoke_twice_is_a_no_op(db_session):
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    revocations = RevocationList(capacity=10, error_rate=0.01)
+    await revocations.revoke(db_session, "twice-jti", expires_at)
+    await revocations.revoke(db_session, "twice-jti", expires_at)
+    assert revocations.is_revoked("twice-jti")
+    assert await db_session.get(RevokedToken, "twice-jti") is not None
+
+@pytest.mark.asyncio
+async def test_purge_forgets_rows_deleted_by_other_workers(db_session):
+    revocations = RevocationList(capacity=10, error_rate=0.01)
+    revocations.add("purged-elsewhere-jti", datetime.now(timezone.utc) - timedelta(minutes=5))
+    assert await revocations.purge_expired(db_session) == 0
+    assert not revocations.is_revoked("purged-elsewhere-jti")
+
+@pytest.mark.asyncio
+async def test_sync_catches_revocations_committed_late(db_session):
+    revocations = RevocationList(capacity=10, error_rate=0.01, sync_overlap_seconds=60)
+    await revocations.sync(db_session)
+    await db_session.commit()
+    # A transaction that started before the sync but committed after it
+    now = datetime.now(timezone.utc)
+    db_session.add(RevokedToken(jti="late-jti", expires_at=now + timedelta(minutes=5), revoked_at=now - timedelta(seconds=10)))
+    await db_session.commit()
+    await revocations.sync(db_session)
+    assert revocations.is_revoked("late-jti")
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import select
+from app.models.token_model import RefreshToken
+from app.services.token_service import TokenService
+
+pytestmark = pytest.mark.asyncio
+
+async def _issue(db_session, user):
+    raw_token = await TokenService.issue_refresh_token(db_session, user.id)
+    await db_session.commit()
+    return raw_token
+
+# Test that the raw token is never stored
+async def test_refresh_token_stored_hashed(db_session, verified_user):
+    raw_token = await _issue(db_session, verified_user)
+    result = await db_session.execute(select(RefreshToken.token_hash))
+    stored_hashes = result.scalars().all()
+    assert raw_token not in stored_hashes
+    assert TokenService._hash(raw_token) in stored_hashes
+
+# Test rotating a refresh token returns the owner and a new token
+async def test_rotate_refresh_token(db_session, verified_user):
+    raw_token = await _issue(db_session, verified_user)
+    rotated = await TokenService.rotate_refresh_token(db_session, raw_token)
+    assert rotated is not None
+    user, new_token = rotated
+    assert user.id == verified_user.id
+    assert new_token != raw_token
+
+# Test that a refresh token can only be used once
+async def test_refresh_token_single_use(db_session, verified_user):
+    raw_token = await _issue(db_session, verified_user)
+    assert await TokenService.rotate_refresh_token(db_session, raw_token) is not None
+    assert await TokenService.rotate_refresh_token(db_session, raw_token) is None
+
+# Test that reusing a consumed token revokes its successors
+async def test_refresh_token_reuse_revokes_family(db_session, verified_user):
+    raw_token = await _issue(db_session, verified_user)
+    _, successor = await TokenService.rotate_refresh_token(db_session, raw_token)
+    assert await TokenService.rotate_refresh_token(db_session, raw_token) is None
+    assert await TokenService.rotate_refresh_token(db_session, successor) is None
+
+# Test that an unknown token is rejected
+async def test_rotate_unknown_refresh_token(db_session):
+    assert await TokenService.rotate_refresh_token(db_session, "unknown-token") is None
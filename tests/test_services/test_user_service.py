@@ -1,9 +1,12 @@
 from builtins import range
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
+from app.database import Database
 from app.dependencies import get_settings
 from app.models.user_model import User, UserRole
-from app.services.user_service import UserService
+from app.services.archive_service import RestoreOutcome, UserArchiveService
+from app.services.user_service import CountStrategy, SearchMode, LoginOutcome, UserService
+from app.utils.etag import VersionMismatch
 from app.utils.nickname_gen import generate_nickname
 
 pytestmark = pytest.mark.asyncio
@@ -20,6 +23,22 @@ async def test_create_user_with_valid_data(db_session, email_service):
     assert user is not None
     assert user.email == user_data["email"]
 
+# Test that the verification email goes out only once the new user is committed
+async def test_create_user_sends_verification_after_commit(db_session, user, email_service):
+    seen_committed = []
+    async def user_is_committed(new_user):
+        async with Database.get_session_factory()() as other_session:
+            seen_committed.append(await other_session.get(User, new_user.id) is not None)
+    email_service.send_verification_email.side_effect = user_is_committed
+    created = await UserService.create(db_session, {
+        "nickname": generate_nickname(),
+        "email": "committed_first@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.AUTHENTICATED.name
+    }, email_service)
+    assert created is not None
+    assert seen_committed == [True]
+
 # Test creating a user with invalid data
 async def test_create_user_with_invalid_data(db_session, email_service):
     user_data = {
@@ -161,3 +180,242 @@ async def test_unlock_user_account(db_session, locked_user):
     assert unlocked, "The account should be unlocked"
     refreshed_user = await UserService.get_by_id(db_session, locked_user.id)
     assert not refreshed_user.is_locked, "The user should no longer be locked"
+
+# Test that a successful login resets the failure counter and records the login time
+async def test_attempt_login_success_resets_counter(db_session, verified_user):
+    verified_user.failed_login_attempts = 2
+    await db_session.commit()
+    outcome, user = await UserService.attempt_login(db_session, verified_user.email, "MySuperPassword$1234")
+    assert outcome is LoginOutcome.SUCCESS
+    assert user.failed_login_attempts == 0
+    assert user.last_login_at is not None
+
+# Test that a locked account is reported without checking the password
+async def test_attempt_login_locked_account(db_session, locked_user):
+    outcome, user = await UserService.attempt_login(db_session, locked_user.email, "MySuperPassword$1234")
+    assert outcome is LoginOutcome.LOCKED
+    assert user is None
+
+# Test that failed attempts are counted in the database
+async def test_attempt_login_failure_increments_counter(db_session, verified_user):
+    outcome, user = await UserService.attempt_login(db_session, verified_user.email, "wrongpassword")
+    assert outcome is LoginOutcome.INVALID_CREDENTIALS
+    assert user is None
+    refreshed_user = await UserService.get_by_email(db_session, verified_user.email)
+    assert refreshed_user.failed_login_attempts == 1
+
+# Test that lookups do not commit, so they join the caller's transaction
+async def test_reads_do_not_commit(db_session, user):
+    await UserService.get_by_id(db_session, user.id)
+    await UserService.list_users(db_session)
+    await UserService.count(db_session)
+    assert db_session.in_transaction()
+    await db_session.rollback()
+
+# Test the read-only session factory runs without a transaction
+async def test_read_session_runs_in_autocommit(user):
+    async with Database.get_read_session_factory()() as session:
+        retrieved_user = await UserService.get_by_id(session, user.id)
+        assert retrieved_user.id == user.id
+        raw_connection = await (await session.connection()).get_raw_connection()
+        assert raw_connection.dbapi_connection.autocommit is True
+
+# Test walking all users forwards and back with keyset pagination
+async def test_list_users_keyset_pagination(db_session, users_with_same_role_50_users):
+    seen = []
+    page = await UserService.list_users_keyset(db_session, limit=20)
+    assert page.prev_cursor is None
+    seen.extend(user.id for user in page.items)
+    while page.next_cursor is not None:
+        page = await UserService.list_users_keyset(db_session, limit=20, cursor=page.next_cursor)
+        seen.extend(user.id for user in page.items)
+    assert len(seen) == 50
+    assert len(set(seen)) == 50
+
+    previous_page = await UserService.list_users_keyset(db_session, limit=20, cursor=page.prev_cursor)
+    assert [user.id for user in previous_page.items] == seen[20:40]
+
+# Test the count strategies against the exact count
+async def test_count_strategies(db_session, users_with_same_role_50_users):
+    assert await UserService.count(db_session, CountStrategy.EXACT) == 50
+    assert await UserService.count(db_session, CountStrategy.NONE) is None
+    estimated = await UserService.count(db_session, CountStrategy.ESTIMATED)
+    assert isinstance(estimated, int) and estimated >= 0
+
+# Test that create and delete keep the cached count in step once seeded
+async def test_cached_count_tracks_create_and_delete(db_session, user, email_service):
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 1  # unseeded: an exact count
+    assert await UserService.seed_cached_count(db_session) == 1
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 1
+    created = await UserService.create(db_session, {
+        "nickname": generate_nickname(),
+        "email": "counted@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.AUTHENTICATED.name
+    }, email_service)
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 2
+    await UserService.delete(db_session, created.id)
+    await UserService.delete(db_session, user.id)
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 0
+
+# Test that the allocator skips candidates that are already taken
+async def test_allocate_nickname_skips_taken(db_session, user, monkeypatch):
+    monkeypatch.setattr("app.services.user_service.generate_nickname_candidates", lambda count: [user.nickname, "free_otter_1"])
+    assert await UserService.allocate_nickname(db_session) == "free_otter_1"
+
+# Test that a nickname claimed between the check and the insert is retried with a new one
+async def test_create_retries_nickname_conflict(db_session, user, email_service, monkeypatch):
+    nicknames = iter([user.nickname, "late_lynx_2"])
+    async def allocate(session):
+        return next(nicknames)
+    monkeypatch.setattr(UserService, "allocate_nickname", allocate)
+    created = await UserService.create(db_session, {
+        "email": "retry@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.AUTHENTICATED.name
+    }, email_service)
+    assert created is not None
+    assert created.nickname == "late_lynx_2"
+
+# Test that only the first registration on an empty database becomes ADMIN
+async def test_first_registration_claims_admin(db_session, email_service):
+    user_data = {"password": "ValidPassword123!", "role": UserRole.AUTHENTICATED.name}
+    first = await UserService.create(db_session, {**user_data, "email": "first@example.com"}, email_service)
+    second = await UserService.create(db_session, {**user_data, "email": "second@example.com"}, email_service)
+    assert first.role == UserRole.ADMIN and first.email_verified
+    assert second.role == UserRole.ANONYMOUS and second.verification_token is not None
+
+# Test that a database which already has users does not hand out ADMIN
+async def test_registration_with_existing_users_is_not_admin(db_session, user, email_service):
+    created = await UserService.create(db_session, {
+        "email": "late@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.AUTHENTICATED.name
+    }, email_service)
+    assert created.role == UserRole.ANONYMOUS
+
+# Test that the export stream applies filters and yields plain tuples in chunks
+async def test_export_rows_streams_in_chunks(db_session, users_with_same_role_50_users, admin_user):
+    conditions = UserService.filter_conditions(role=UserRole.AUTHENTICATED)
+    chunks = [chunk async for chunk in UserService.export_rows(db_session, ["email", "role"], conditions, chunk_size=20)]
+    assert [len(chunk) for chunk in chunks] == [20, 20, 10]
+    assert all(role == UserRole.AUTHENTICATED for chunk in chunks for _, role in chunk)
+
+# Test prefix and substring search with filters on the portable (no pg_trgm) path
+async def test_search_users(db_session, users_with_same_role_50_users, admin_user, monkeypatch):
+    monkeypatch.setattr(UserService, "_trigram_search", False)
+    assert [user.id for user in await UserService.search_users(db_session, admin_user.nickname[:4])] == [admin_user.id]
+    assert [user.id for user in await UserService.search_users(db_session, admin_user.email.split("@")[0][1:], SearchMode.FUZZY)] == [admin_user.id]
+    conditions = UserService.filter_conditions(role=UserRole.AUTHENTICATED)
+    assert await UserService.search_users(db_session, admin_user.nickname[:4], conditions=conditions) == []
+    assert await UserService.search_users(db_session, "%") == []  # wildcards are matched literally
+
+def record_statements(session):
+    """Collect the SQL statements the session's engine sends, excluding transaction control."""
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(session.bind.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements, lambda: event.remove(session.bind.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+# Test that an update is a single UPDATE ... RETURNING
+async def test_update_is_one_statement(db_session, user):
+    statements, stop = record_statements(db_session)
+    try:
+        updated = await UserService.update(db_session, user.id, {"first_name": "Single"})
+    finally:
+        stop()
+    assert updated.first_name == "Single"
+    assert len(statements) == 1 and statements[0].startswith("UPDATE users")
+
+# Test that a delete by id is a single statement, and reports missing users
+async def test_delete_is_one_statement(db_session, user):
+    statements, stop = record_statements(db_session)
+    try:
+        assert await UserService.delete(db_session, user.id) is True
+    finally:
+        stop()
+    assert len(statements) == 1
+    assert await UserService.delete(db_session, user.id) is False
+
+# Test that a bulk unlock by ids is one statement and only touches users that change
+async def test_bulk_update_by_ids(db_session, locked_user, user):
+    statements, stop = record_statements(db_session)
+    try:
+        updated = await UserService.bulk_update(db_session, {"is_locked": False}, user_ids=[locked_user.id, user.id])
+    finally:
+        stop()
+    assert [row.id for row in updated] == [locked_user.id]
+    assert len(statements) == 1 and statements[0].startswith("UPDATE users")
+    await db_session.refresh(locked_user)
+    assert locked_user.is_locked is False and locked_user.failed_login_attempts == 0
+
+# Test a bulk role change selected by filter conditions
+async def test_bulk_update_by_filter(db_session, users_with_same_role_50_users, admin_user):
+    conditions = UserService.filter_conditions(role=UserRole.AUTHENTICATED)
+    updated = await UserService.bulk_update(db_session, {"role": UserRole.MANAGER}, conditions=conditions)
+    assert len(updated) == 50
+    assert await UserService.count(db_session, conditions=[User.role == UserRole.MANAGER]) == 50
+    assert await UserService.bulk_update(db_session, {"role": UserRole.MANAGER}, conditions=conditions) == []
+
+# Test that bulk updates refuse unknown columns and an unrestricted target
+async def test_bulk_update_rejects_bad_input(db_session):
+    with pytest.raises(ValueError):
+        await UserService.bulk_update(db_session, {"email": "x@example.com"}, user_ids=[])
+    with pytest.raises(ValueError):
+        await UserService.bulk_update(db_session, {"is_locked": True})
+
+# Test that the hot lookups reuse one prebuilt statement and send identical SQL each call
+async def test_hot_queries_reuse_statements(db_session, user, verified_user):
+    assert UserService._page_statement("-email") is UserService._page_statement("-email")
+    statements, stop = record_statements(db_session)
+    try:
+        assert (await UserService.get_by_id(db_session, user.id)).id == user.id
+        assert (await UserService.get_by_id(db_session, verified_user.id)).id == verified_user.id
+        first_page = await UserService.list_users(db_session, 0, 1)
+        second_page = await UserService.list_users(db_session, 1, 1)
+    finally:
+        stop()
+    assert {first_page[0].id, second_page[0].id} == {user.id, verified_user.id}
+    assert statements[0] == statements[1] and statements[2] == statements[3]
+
+# Test that updates bump the version and that a stale expected version is rejected
+async def test_update_checks_expected_version(db_session, user):
+    assert user.version == 1
+    updated = await UserService.update(db_session, user.id, {"first_name": "First"}, expected_versions=[1])
+    assert updated.version == 2
+    with pytest.raises(VersionMismatch) as mismatch:
+        await UserService.update(db_session, user.id, {"first_name": "Second"}, expected_versions=[1])
+    assert mismatch.value.current_version == 2
+    assert (await UserService.get_by_id(db_session, user.id)).first_name == "First"
+
+# Test that an update to the values the user already has rewrites nothing
+async def test_update_skips_unchanged_rows(db_session, user):
+    statements, stop = record_statements(db_session)
+    try:
+        unchanged = await UserService.update_professional_status(db_session, user.id, bool(user.is_professional), expected_versions=[1])
+    finally:
+        stop()
+    assert unchanged.version == 1
+    assert statements[0].startswith("UPDATE users") and len(statements) == 2  # the no-op UPDATE and one read
+
+# Test that ORM flushes are version-checked as well
+async def test_update_profile_checks_expected_version(db_session, user):
+    await UserService.update_profile(db_session, user.id, {"first_name": "Profile"}, expected_versions=[1])
+    assert user.version == 2
+    with pytest.raises(VersionMismatch):
+        await UserService.update_profile(db_session, user.id, {"first_name": "Stale"}, expected_versions=[1])
+
+# Test that logging in leaves the version alone, while deleting and restoring bump it
+async def test_version_ignores_logins_but_tracks_delete_and_restore(db_session, verified_user):
+    user_id = verified_user.id
+    outcome, user = await UserService.attempt_login(db_session, verified_user.email, "MySuperPassword$1234")
+    assert outcome == LoginOutcome.SUCCESS and user.version == 1
+    await UserService.attempt_login(db_session, verified_user.email, "WrongPassword$1234")
+    version = select(User.version).where(User.id == user_id)
+    assert await db_session.scalar(version) == 1
+
+    await UserService.delete(db_session, user_id)
+    assert await db_session.scalar(version) == 2
+    assert await UserArchiveService.restore(db_session, user_id) == RestoreOutcome.RESTORED
+    assert await db_session.scalar(version) == 3